@@ -0,0 +1,215 @@
+#!/usr/bin/env python3
+# cli.py - Headless Command-Line Interface (no tkinter/matplotlib)
+
+import argparse
+import os
+import sys
+import time
+import pandas as pd
+from config import CLI_CONFIG, CORPUS_CONFIG, MODEL_DATASETS, SQLITE_CONFIG
+from ml_models import CropMLModels
+from model_registry import ModelRegistry
+from prediction_engine import PredictionEngine
+
+TASKS = ('crop', 'fertilizer', 'yield')
+
+def load_models(registry_dir=None, version=None, engine=None):
+    """Load saved models from the registry without training"""
+    registry = ModelRegistry(registry_dir)
+    if registry.get_current_version() is None:
+        raise ValueError(f"No saved models in '{registry.root_dir}'. Train them in the GUI first.")
+
+    ml_models = CropMLModels()
+    ml_models.attach_registry(registry, version)
+    if engine:
+        for task in TASKS:
+            ml_models.set_inference_engine(task, engine)
+    return ml_models
+
+def score_csv(ml_models, task, input_path, output_path, chunksize=None, top_k=None, progress=None):
+    """Score a CSV file chunk by chunk and stream predictions to an output CSV"""
+    chunksize = chunksize or CLI_CONFIG['chunksize']
+    top_k = top_k or CLI_CONFIG['top_k']
+    engine = PredictionEngine(ml_models)
+
+    start = time.perf_counter()
+    rows = 0
+    with open(output_path, 'w', newline='') as output_file:
+        for chunk in pd.read_csv(input_path, chunksize=chunksize):
+            if task == 'crop':
+                result = engine.predict_crop_batch(chunk, top_k=top_k)
+            elif task == 'fertilizer':
+                result = engine.predict_fertilizer_batch(chunk, top_k=top_k)
+            else:
+                result = engine.predict_yield_batch(chunk)
+
+            if not result['success']:
+                raise ValueError(f"Scoring failed at row {rows}: {result['error']}")
+
+            scored = pd.concat([chunk.reset_index(drop=True), result['results']], axis=1)
+            scored.to_csv(output_file, header=(rows == 0), index=False)
+            rows += len(chunk)
+
+            if progress:
+                progress(rows, time.perf_counter() - start)
+
+    elapsed = time.perf_counter() - start
+    return {
+        'rows': rows,
+        'seconds': elapsed,
+        'rows_per_second': rows / elapsed if elapsed > 0 else 0.0
+    }
+
+def build_parser():
+    """Build the argument parser"""
+    parser = argparse.ArgumentParser(description="AgriSense headless tools")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    score = subparsers.add_parser('score', help="Score a CSV file with a saved model")
+    score.add_argument('--task', choices=TASKS, required=True)
+    score.add_argument('--input', required=True, help="Input CSV with the model's feature columns")
+    score.add_argument('--output', required=True, help="Output CSV (inputs plus predictions)")
+    score.add_argument('--chunksize', type=int, default=CLI_CONFIG['chunksize'])
+    score.add_argument('--top-k', type=int, default=CLI_CONFIG['top_k'])
+    score.add_argument('--registry', default=None, help="Model registry directory")
+    score.add_argument('--version', default=None, help="Model version (default: current)")
+    score.add_argument('--engine', choices=('sklearn', 'flat'), default=None)
+    score.add_argument('--quiet', action='store_true')
+
+    serve = subparsers.add_parser('serve', help="Serve predictions over localhost HTTP")
+    serve.add_argument('--host', default=None)
+    serve.add_argument('--port', type=int, default=None)
+    serve.add_argument('--max-batch-size', type=int, default=None)
+    serve.add_argument('--max-latency-ms', type=float, default=None)
+    serve.add_argument('--workers', type=int, default=None)
+    serve.add_argument('--registry', default=None, help="Model registry directory")
+    serve.add_argument('--version', default=None, help="Model version (default: current)")
+    serve.add_argument('--engine', choices=('sklearn', 'flat'), default=None)
+
+    corpus = subparsers.add_parser('build-corpus', help="Write sharded synthetic datasets for benchmarks")
+    corpus.add_argument('--output', default=CORPUS_CONFIG['output_dir'], help="Corpus directory")
+    corpus.add_argument('--rows', type=int, default=None, help="Rows for every dataset")
+    for task, dataset_name in MODEL_DATASETS.items():
+        corpus.add_argument(f'--{task}-rows', type=int, default=None,
+                            help=f"Rows for the {dataset_name} dataset (overrides --rows)")
+    corpus.add_argument('--shard-rows', type=int, default=CORPUS_CONFIG['shard_rows'])
+    corpus.add_argument('--seed', type=int, default=None)
+    corpus.add_argument('--workers', type=int, default=None)
+    corpus.add_argument('--format', choices=('auto', 'parquet', 'npz'), default=CORPUS_CONFIG['format'])
+    corpus.add_argument('--quiet', action='store_true')
+
+    log = subparsers.add_parser('export-predictions', help="Write or append the SQLite prediction log to a file")
+    log.add_argument('--db', default=SQLITE_CONFIG['path'], help="SQLite store holding the log")
+    log.add_argument('--output', required=True, help="CSV, .csv.gz, .csv.zst or .parquet file")
+    log.add_argument('--task', choices=TASKS, default=None, help="Only this task's predictions")
+    log.add_argument('--append', action='store_true', help="Append to an existing file")
+    log.add_argument('--chunk-rows', type=int, default=None)
+
+    tune = subparsers.add_parser('tune', help="Search forest hyperparameters on the sample data")
+    tune.add_argument('--task', choices=TASKS, action='append', default=None,
+                      help="Task to tune (repeatable, default: all)")
+    tune.add_argument('--budget', type=float, default=None, help="Total time budget in seconds")
+    tune.add_argument('--registry', default=None, help="Model registry directory")
+
+    return parser
+
+def run_score(args):
+    """Handle the score command"""
+    ml_models = load_models(args.registry, args.version, args.engine)
+
+    def report_progress(rows, elapsed):
+        print(f"\r{rows:,} rows scored ({rows / max(elapsed, 1e-9):,.0f} rows/sec)",
+              end='', file=sys.stderr, flush=True)
+
+    stats = score_csv(ml_models, args.task, args.input, args.output,
+                      chunksize=args.chunksize, top_k=args.top_k,
+                      progress=None if args.quiet else report_progress)
+
+    if not args.quiet:
+        print(file=sys.stderr)
+    print(f"Scored {stats['rows']:,} rows in {stats['seconds']:.2f}s "
+          f"({stats['rows_per_second']:,.0f} rows/sec) using model version {ml_models.registry_version}")
+
+def run_serve(args):
+    """Handle the serve command"""
+    from inference_server import run_server
+
+    ml_models = load_models(args.registry, args.version, args.engine)
+    run_server(ml_models, host=args.host, port=args.port, max_batch_size=args.max_batch_size,
+               max_latency_ms=args.max_latency_ms, workers=args.workers)
+
+def run_build_corpus(args):
+    """Handle the build-corpus command"""
+    from corpus_builder import build_corpus
+
+    rows = {}
+    for task, dataset_name in MODEL_DATASETS.items():
+        task_rows = getattr(args, f'{task}_rows')
+        if task_rows is not None:
+            rows[dataset_name] = task_rows
+        elif args.rows is not None:
+            rows[dataset_name] = args.rows
+
+    def report_progress(dataset, rows_written, total_rows):
+        print(f"\r{dataset}: {rows_written:,}/{total_rows:,} rows", end='', file=sys.stderr, flush=True)
+        if rows_written >= total_rows:
+            print(file=sys.stderr)
+
+    start = time.perf_counter()
+    manifest = build_corpus(args.output, rows=rows, shard_rows=args.shard_rows, seed=args.seed,
+                            workers=args.workers, fmt=args.format,
+                            progress=None if args.quiet else report_progress)
+
+    total_rows = sum(info['rows'] for info in manifest['datasets'].values())
+    total_shards = sum(len(info['shards']) for info in manifest['datasets'].values())
+    print(f"Wrote {total_rows:,} rows in {total_shards} {manifest['format']} shards to {args.output} "
+          f"in {time.perf_counter() - start:.2f}s")
+
+def run_export_predictions(args):
+    """Handle the export-predictions command"""
+    from data_export import prediction_log_job
+    from sqlite_store import SQLiteStore
+
+    if not os.path.exists(args.db):
+        raise ValueError(f"No prediction log at '{args.db}'")
+    store = SQLiteStore(args.db)
+    try:
+        job = prediction_log_job(store, args.output, args.task, append=args.append, chunk_rows=args.chunk_rows)
+        job.run()
+        rows = job.wait()
+    finally:
+        store.close()
+    print(f"{'Appended' if job.writer.append else 'Wrote'} {rows:,} predictions to {args.output}")
+
+def run_tune(args):
+    """Handle the tune command"""
+    from data_generator import DataGenerator
+
+    registry = ModelRegistry(args.registry)
+    results = CropMLModels().tune_models(DataGenerator().generate_all_data(), registry=registry,
+                                         tasks=args.task, time_budget=args.budget)
+    for task, result in results.items():
+        print(f"{task}: {result['best_params']} scored {result['best_score']:.3f} "
+              f"({result['evaluated']} fits over {result['rounds']} rounds in {result['elapsed']:.1f}s)")
+    print(f"Tuned parameters saved to '{registry.root_dir}'; the next training run uses them")
+
+def main(argv=None):
+    """Command-line entry point"""
+    args = build_parser().parse_args(argv)
+    commands = {
+        'score': run_score,
+        'serve': run_serve,
+        'build-corpus': run_build_corpus,
+        'export-predictions': run_export_predictions,
+        'tune': run_tune
+    }
+
+    try:
+        commands[args.command](args)
+    except Exception as e:
+        print(f"Error: {str(e)}", file=sys.stderr)
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
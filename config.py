@@ -13,7 +13,137 @@ APP_CONFIG = {
 MODEL_CONFIG = {
     'n_estimators': 100,
     'random_state': 42,
-    'test_size': 0.2
+    'test_size': 0.2,
+    'n_jobs': None,  # threads per forest while training; None splits the cores across concurrently trained models
+    'parallel_training': False,  # train the three models concurrently in a process pool
+    'incremental_min_rows': 20,  # fewer appended rows than this trigger a full rebuild
+    'incremental_min_trees': 10,  # trees added when extending a model with new rows
+    'incremental_max_growth': 3,  # rebuild once a forest reaches this multiple of n_estimators
+    'unseen_category_policy': 'fallback',  # 'error', 'fallback' (most frequent) or 'nearest' (closest name)
+    'inference_engine': 'sklearn'  # 'flat' (NumPy node arrays) is fastest for single-row requests
+}
+
+# Hyperparameter search (successive halving under a wall-clock budget)
+TUNING_CONFIG = {
+    'time_budget_seconds': 300,
+    'n_candidates': 27,
+    'halving_factor': 3,
+    'min_resources': 200,  # rows used in the first round
+    'cv_folds': 3,
+    'n_jobs': -1,  # cross-validation folds run in parallel
+    'accuracy_tolerance': 0.01,  # accept a smaller forest scoring within this of the best
+    'unbounded_depth_cost': 32,  # depth assumed for max_depth=None when comparing sizes
+    'search_space': {
+        'n_estimators': [25, 50, 100, 200],
+        'max_depth': [None, 8, 12, 16, 24],
+        'max_features': ['sqrt', 'log2', 0.5, 1.0],
+        'min_samples_leaf': [1, 2, 4, 8],
+        'min_samples_split': [2, 4, 8]
+    }
+}
+
+# Prediction result cache
+PREDICTION_CACHE_CONFIG = {
+    'enabled': True,
+    'max_entries': 10000,
+    'max_bytes': 32 * 1024 * 1024,
+    'quantize_decimals': None  # e.g. 1 to treat 45.04 and 45.0 as the same input
+}
+
+# Headless command-line tools
+CLI_CONFIG = {
+    'chunksize': 50000,  # rows read, scored and written at a time
+    'top_k': 3
+}
+
+# Background CSV loading
+INGEST_CONFIG = {
+    'chunksize': 200000,  # rows parsed per chunk by the pandas reader
+    'arrow_block_bytes': 16 * 1024 * 1024,  # bytes per batch for the Arrow reader
+    'sample_rows': 1000,  # rows read up front to infer column dtypes
+    'engine': 'auto',  # 'pyarrow', 'c', or 'auto' to use pyarrow when installed
+    'poll_ms': 100,  # how often the GUI checks on a running load
+    'directory_workers': 4,  # files read concurrently by directory ingestion
+    'file_pattern': '*.csv',
+    'ledger_file': '.ingest_ledger.json'  # checksums of ingested files, kept in the directory
+}
+
+# Background tasks in the GUI (task_executor.py)
+TASK_CONFIG = {
+    'poll_ms': 100  # how often the Tk thread collects task progress and results
+}
+
+# Cold start (startup_timing.py)
+STARTUP_CONFIG = {
+    'log_timings': True,  # print the startup phase breakdown once the system is initialized
+    'import_budget_ms': 500,  # startup_timing.py fails when importing main_gui takes longer
+    'deferred_modules': ['pandas', 'sklearn', 'matplotlib']  # must not be imported by main_gui itself
+}
+
+# Streaming data and prediction export (data_export.py)
+EXPORT_CONFIG = {
+    'chunk_rows': 100000,  # rows converted and written at a time
+    'schema_sample_rows': 10000,  # records sampled to pick Parquet column types for a list of dicts
+    'format': 'auto'  # 'csv', 'gzip', 'zstd', 'parquet', or 'auto' to pick from the file extension
+}
+
+# Cached per-column dataset statistics
+PROFILE_CONFIG = {
+    'max_tracked_distinct': 100000,  # beyond this, numeric cardinality is reported as a lower bound
+    'max_histogram_size': 1000  # text columns with more distinct values keep no histogram
+}
+
+# Columnar dataset store used for data backups
+STORE_CONFIG = {
+    'root_dir': 'data_store',
+    'format': 'auto'  # 'feather' (needs pyarrow), 'npy', or 'auto' to use feather when available
+}
+
+# Optional embedded SQLite store for indexed dataset queries and the prediction log
+SQLITE_CONFIG = {
+    'enabled': False,
+    'path': 'agri_data.db',
+    'batch_rows': 50000,  # rows per executemany call inside the load transaction
+    'indexed_columns': ['state', 'district', 'crop', 'season', 'label'],
+    # Multi-column indexes for common filter combinations, e.g. yield for Punjab Kharif Rice
+    'composite_indexes': {
+        'yield': [('state', 'season', 'crop'), ('state', 'district')]
+    }
+}
+
+# Sharded benchmark corpus (cli.py build-corpus)
+CORPUS_CONFIG = {
+    'output_dir': 'benchmark_corpus',
+    'shard_rows': 100000,  # rows per shard file
+    'format': 'auto',  # 'parquet' (needs pyarrow), 'npz', or 'auto' to pick parquet when available
+    'rows': {
+        'crop_recommendation': 1000000,
+        'fertilizer': 1000000,
+        'yield': 1000000
+    }
+}
+
+# Local HTTP inference service
+SERVER_CONFIG = {
+    'host': '127.0.0.1',
+    'port': 8765,
+    'max_batch_size': 64,  # requests scored together
+    'max_latency_ms': 5,  # how long the first request waits for others to join its batch
+    'workers': 2,  # threads running forest evaluation
+    'max_body_bytes': 1024 * 1024
+}
+
+# Dataset each model is trained on
+MODEL_DATASETS = {
+    'crop': 'crop_recommendation',
+    'fertilizer': 'fertilizer',
+    'yield': 'yield'
+}
+
+# Saved model versions
+REGISTRY_CONFIG = {
+    'root_dir': 'model_registry',
+    'keep_versions': 5
 }
 
 # UI Styles
@@ -42,7 +172,9 @@ COLORS = {
 # Data generation parameters
 DATA_GENERATION = {
     'n_samples': 1000,
-    'random_seed': 42
+    'random_seed': 42,
+    'chunk_size': 100000,   # Rows per chunk in chunked generation
+    'workers': 1            # Processes for chunked generation (output does not depend on this)
 }
 
 # Crop information
@@ -188,4 +320,42 @@ YIELD_DROPDOWN_FIELDS = [
 YIELD_NUMERIC_FIELDS = [
     ("Area (hectares)", "area"),
     ("Production (tons)", "production")
-]
\ No newline at end of file
+]
+# Compact in-memory dtypes (data_schema.py)
+DTYPE_CONFIG = {
+    'enabled': True,
+    'float_dtype': 'float32'  # measurements; text columns become pandas Categoricals
+}
+
+# Fixed category sets per text column, sorted so category codes match LabelEncoder codes
+CATEGORY_SETS = {
+    'label': sorted(CROP_INFO),
+    'fertilizer': sorted(FERTILIZER_INFO),
+    **{key: sorted(options) for _, key, options in FERTILIZER_DROPDOWN_FIELDS + YIELD_DROPDOWN_FIELDS}
+}
+
+# Row-level validation (data_validation.py); ranges are (min, max) with None for no bound
+VALIDATION_CONFIG = {
+    'chunk_rows': 500000,  # rows checked per vectorized pass
+    'max_examples': 5,  # offending values kept per rule for the report
+    # Flag target labels outside CATEGORY_SETS; off by default, since those sets only list the
+    # crops and fertilizers with display info and real files carry many more
+    'check_target_labels': False,
+    # Count feature categories outside CATEGORY_SETS and state/district pairs outside the mapping
+    # as invalid rows; by default they are only warnings, as the models handle unseen categories
+    'strict_categories': False
+}
+
+VALIDATION_RANGES = {
+    'crop_recommendation': {
+        'N': (0, 300), 'P': (0, 300), 'K': (0, 300), 'temperature': (-10, 60),
+        'humidity': (0, 100), 'ph': (0, 14), 'rainfall': (0, 5000)
+    },
+    'fertilizer': {
+        'temperature': (-10, 60), 'humidity': (0, 100), 'moisture': (0, 100),
+        'nitrogen': (0, 300), 'phosphorous': (0, 300), 'potassium': (0, 300)
+    },
+    'yield': {
+        'area': (0, None), 'production': (0, None), 'yield': (0, None)
+    }
+}
@@ -0,0 +1,189 @@
+# corpus_builder.py - Sharded Benchmark Corpus Writer
+
+import os
+import io
+import json
+import shutil
+import hashlib
+import zipfile
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from config import CORPUS_CONFIG, DATA_GENERATION
+from data_generator import DataGenerator, DATASETS
+from data_schema import compact_frame
+
+MANIFEST_FILE = 'manifest.json'
+CORPUS_FORMATS = ('auto', 'parquet', 'npz')
+
+# Fixed zip entry timestamp so identical shards produce identical checksums
+ZIP_TIMESTAMP = (1980, 1, 1, 0, 0, 0)
+
+def resolve_format(fmt=None):
+    """Pick the shard format, using parquet only when pyarrow is installed"""
+    fmt = fmt or CORPUS_CONFIG['format']
+    if fmt not in CORPUS_FORMATS:
+        raise ValueError(f"Unknown corpus format: {fmt}")
+
+    try:
+        import pyarrow  # noqa: F401
+        has_pyarrow = True
+    except ImportError:
+        has_pyarrow = False
+
+    if fmt == 'auto':
+        return 'parquet' if has_pyarrow else 'npz'
+    if fmt == 'parquet' and not has_pyarrow:
+        raise ValueError("Parquet shards need pyarrow (pip install pyarrow) - use --format npz instead")
+    return fmt
+
+def file_checksum(path):
+    """SHA-256 of a file's contents"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1024 * 1024), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+def write_shard(df, path, fmt):
+    """Write one DataFrame shard as compressed columns"""
+    if fmt == 'parquet':
+        df.to_parquet(path, compression='zstd', index=False)
+        return
+
+    # One compressed .npy member per column; text columns are stored as fixed-width
+    # unicode so shards load without pickle
+    with zipfile.ZipFile(path, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+        for column in df.columns:
+            values = df[column].to_numpy()
+            if values.dtype == object or not np.issubdtype(values.dtype, np.number):
+                values = values.astype(str)
+            buffer = io.BytesIO()
+            np.lib.format.write_array(buffer, np.ascontiguousarray(values), allow_pickle=False)
+            archive.writestr(zipfile.ZipInfo(f"{column}.npy", ZIP_TIMESTAMP), buffer.getvalue(),
+                             compress_type=zipfile.ZIP_DEFLATED)
+
+def read_shard(path, fmt, columns):
+    """Read one shard back into a DataFrame"""
+    if fmt == 'parquet':
+        return pd.read_parquet(path, columns=columns)
+
+    with np.load(path, allow_pickle=False) as archive:
+        data = {}
+        for column in columns:
+            values = archive[column]
+            data[column] = values.astype(object) if values.dtype.kind == 'U' else values
+    return pd.DataFrame(data, columns=columns)
+
+def build_corpus(output_dir=None, rows=None, shard_rows=None, seed=None, workers=None, fmt=None, progress=None):
+    """Generate every dataset as fixed-size shards and write a manifest"""
+    output_dir = output_dir or CORPUS_CONFIG['output_dir']
+    sizes = dict(CORPUS_CONFIG['rows'])
+    sizes.update(rows or {})
+    shard_rows = shard_rows or CORPUS_CONFIG['shard_rows']
+    seed = DATA_GENERATION['random_seed'] if seed is None else seed
+    fmt = resolve_format(fmt)
+
+    unknown = set(sizes) - set(DATASETS)
+    if unknown:
+        raise ValueError(f"Unknown datasets: {', '.join(sorted(unknown))}")
+    if shard_rows <= 0 or any(n_rows < 0 for n_rows in sizes.values()):
+        raise ValueError("Row counts must be positive")
+
+    # Remove the manifest first so a half-rebuilt corpus is never mistaken for a complete one
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, MANIFEST_FILE)
+    if os.path.exists(manifest_path):
+        os.remove(manifest_path)
+
+    generator = DataGenerator()
+    extension = 'parquet' if fmt == 'parquet' else 'npz'
+    manifest = {
+        'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+        'format': fmt,
+        'seed': seed,
+        'shard_rows': shard_rows,
+        'datasets': {}
+    }
+
+    for dataset in DATASETS:
+        n_rows = sizes[dataset]
+        dataset_dir = os.path.join(output_dir, dataset)
+        shutil.rmtree(dataset_dir, ignore_errors=True)
+        os.makedirs(dataset_dir)
+
+        shards = []
+        columns = None
+        for index, chunk in enumerate(generator.generate_chunks(dataset, n_rows, shard_rows, workers, seed)):
+            file_name = f"part-{index:05d}.{extension}"
+            shard_path = os.path.join(dataset_dir, file_name)
+            write_shard(chunk, shard_path, fmt)
+
+            if columns is None:
+                columns = {column: str(dtype) for column, dtype in chunk.dtypes.items()}
+            shards.append({
+                'file': f"{dataset}/{file_name}",
+                'rows': len(chunk),
+                'bytes': os.path.getsize(shard_path),
+                'sha256': file_checksum(shard_path)
+            })
+            if progress:
+                progress(dataset, sum(shard['rows'] for shard in shards), n_rows)
+
+        manifest['datasets'][dataset] = {
+            'rows': n_rows,
+            'seed': [seed, DATASETS.index(dataset)],
+            'columns': columns or {},
+            'shards': shards
+        }
+
+    tmp_path = f"{manifest_path}.tmp"
+    with open(tmp_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    os.replace(tmp_path, manifest_path)
+    return manifest
+
+def load_manifest(corpus_dir=None):
+    """Load a corpus manifest"""
+    corpus_dir = corpus_dir or CORPUS_CONFIG['output_dir']
+    manifest_path = os.path.join(corpus_dir, MANIFEST_FILE)
+    if not os.path.exists(manifest_path):
+        raise ValueError(f"No corpus manifest in '{corpus_dir}'")
+    with open(manifest_path) as f:
+        return json.load(f)
+
+def verify_corpus(corpus_dir=None):
+    """Check every shard against the manifest, returning a list of problems"""
+    corpus_dir = corpus_dir or CORPUS_CONFIG['output_dir']
+    manifest = load_manifest(corpus_dir)
+    problems = []
+    for dataset, info in manifest['datasets'].items():
+        for shard in info['shards']:
+            shard_path = os.path.join(corpus_dir, shard['file'])
+            if not os.path.exists(shard_path):
+                problems.append(f"{shard['file']}: missing")
+            elif file_checksum(shard_path) != shard['sha256']:
+                problems.append(f"{shard['file']}: checksum mismatch")
+    return problems
+
+def iter_corpus(dataset, corpus_dir=None, verify=False):
+    """Yield a dataset's shards as DataFrames, in order"""
+    corpus_dir = corpus_dir or CORPUS_CONFIG['output_dir']
+    manifest = load_manifest(corpus_dir)
+    if dataset not in manifest['datasets']:
+        raise ValueError(f"Dataset '{dataset}' not in corpus")
+
+    info = manifest['datasets'][dataset]
+    columns = list(info['columns'])
+    for shard in info['shards']:
+        shard_path = os.path.join(corpus_dir, shard['file'])
+        if verify and file_checksum(shard_path) != shard['sha256']:
+            raise ValueError(f"Checksum mismatch for {shard['file']}")
+        yield compact_frame(dataset, read_shard(shard_path, manifest['format'], columns))
+
+def load_corpus(dataset, corpus_dir=None, verify=False):
+    """Load a whole dataset from the corpus"""
+    shards = list(iter_corpus(dataset, corpus_dir, verify))
+    if not shards:
+        raise ValueError(f"Dataset '{dataset}' has no rows in the corpus")
+    return pd.concat(shards, ignore_index=True)
@@ -0,0 +1,140 @@
+# csv_ingest.py - Background Chunked CSV Ingestion
+
+import os
+import threading
+import pandas as pd
+from config import INGEST_CONFIG
+from data_schema import DATASET_SCHEMAS, compact_frame, concat_frames
+
+class IngestCancelled(Exception):
+    """Raised inside a worker when its ingestion job is cancelled"""
+
+def pyarrow_available():
+    """Whether the Arrow CSV reader can be used"""
+    try:
+        import pyarrow.csv  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+def infer_column_dtypes(file_path, dataset_name, sample_rows=None):
+    """Pick parse dtypes from the first rows, so every chunk is parsed straight into its final type"""
+    sample_rows = sample_rows or INGEST_CONFIG['sample_rows']
+    sample = pd.read_csv(file_path, nrows=sample_rows)
+    schema = DATASET_SCHEMAS.get(dataset_name, {})
+
+    dtypes = {}
+    for column in sample.columns:
+        kind = schema.get(column)
+        if kind == 'float' and pd.api.types.is_numeric_dtype(sample[column]):
+            dtypes[column] = 'float32'
+        elif kind == 'category':
+            dtypes[column] = 'category'
+        elif pd.api.types.is_float_dtype(sample[column]):
+            dtypes[column] = 'float64'
+    return dtypes
+
+class CsvIngestJob:
+    """Reads a CSV in chunks on a worker thread, reporting progress and honouring cancel"""
+
+    def __init__(self, file_path, dataset_name, chunksize=None, engine=None):
+        self.file_path = file_path
+        self.dataset_name = dataset_name
+        self.chunksize = chunksize or INGEST_CONFIG['chunksize']
+        engine = engine or INGEST_CONFIG['engine']
+        if engine == 'auto':
+            engine = 'pyarrow' if pyarrow_available() else 'c'
+        self.engine = engine
+
+        self.total_bytes = os.path.getsize(file_path)
+        self.bytes_read = 0
+        self.rows_read = 0
+        self.result = None
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.done_event = threading.Event()
+        self.thread = None
+
+    @property
+    def progress(self):
+        """Fraction of the file parsed so far"""
+        if not self.total_bytes:
+            return 1.0 if self.done else 0.0
+        return min(self.bytes_read / self.total_bytes, 1.0)
+
+    @property
+    def done(self):
+        return self.done_event.is_set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def start(self):
+        """Start reading on a daemon thread"""
+        self.thread = threading.Thread(target=self.run, name='csv-ingest', daemon=True)
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        """Ask the worker to stop after the current chunk"""
+        self.cancel_event.set()
+
+    def run(self):
+        """Read the whole file (worker thread entry point)"""
+        try:
+            dtypes = infer_column_dtypes(self.file_path, self.dataset_name)
+            with open(self.file_path, 'rb') as f:
+                if self.engine == 'pyarrow':
+                    chunks = self._read_arrow(f, dtypes)
+                else:
+                    chunks = self._read_pandas(f, dtypes)
+            self.result = concat_frames(chunks)
+            self.bytes_read = self.total_bytes
+        except IngestCancelled:
+            self.result = None
+        except Exception as e:
+            self.error = e
+        finally:
+            self.done_event.set()
+
+    def wait(self, timeout=None):
+        """Block until the job finishes (for headless callers)"""
+        self.done_event.wait(timeout)
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    def _add_chunk(self, chunks, chunk, f):
+        """Compact a parsed chunk and update progress"""
+        if self.cancelled:
+            raise IngestCancelled()
+        chunks.append(compact_frame(self.dataset_name, chunk))
+        self.rows_read += len(chunk)
+        self.bytes_read = f.tell()
+
+    def _read_pandas(self, f, dtypes):
+        """Chunked read with the pandas C parser"""
+        chunks = []
+        for chunk in pd.read_csv(f, dtype=dtypes, chunksize=self.chunksize):
+            self._add_chunk(chunks, chunk, f)
+        return chunks
+
+    def _read_arrow(self, f, dtypes):
+        """Streaming read with the multi-threaded Arrow CSV parser"""
+        import pyarrow as pa
+        import pyarrow.csv as pa_csv
+
+        arrow_types = {'float32': pa.float32(), 'float64': pa.float64(),
+                       'category': pa.dictionary(pa.int32(), pa.string())}
+        reader = pa_csv.open_csv(
+            f,
+            read_options=pa_csv.ReadOptions(block_size=INGEST_CONFIG['arrow_block_bytes']),
+            convert_options=pa_csv.ConvertOptions(
+                column_types={column: arrow_types[dtype] for column, dtype in dtypes.items()}
+            )
+        )
+        chunks = []
+        for batch in reader:
+            self._add_chunk(chunks, batch.to_pandas(), f)
+        return chunks
@@ -0,0 +1,242 @@
+# data_export.py - Streaming, Compressed Export of Data and Predictions
+
+import io
+import os
+import gzip
+import threading
+import pandas as pd
+from config import EXPORT_CONFIG
+
+EXPORT_FORMATS = ('auto', 'csv', 'gzip', 'zstd', 'parquet')
+FORMAT_EXTENSIONS = {'.gz': 'gzip', '.zst': 'zstd', '.parquet': 'parquet'}
+
+class ExportCancelled(Exception):
+    """Raised inside a worker when its export job is cancelled"""
+
+def resolve_export_format(file_path, fmt=None):
+    """Pick the output format, from the file extension when fmt is 'auto'"""
+    fmt = fmt or EXPORT_CONFIG['format']
+    if fmt not in EXPORT_FORMATS:
+        raise ValueError(f"Unknown export format: {fmt}")
+    if fmt == 'auto':
+        fmt = FORMAT_EXTENSIONS.get(os.path.splitext(file_path)[1].lower(), 'csv')
+
+    if fmt == 'zstd':
+        try:
+            import zstandard  # noqa: F401
+        except ImportError:
+            raise ValueError("zstd export needs zstandard (pip install zstandard)")
+    elif fmt == 'parquet':
+        try:
+            import pyarrow.parquet  # noqa: F401
+        except ImportError:
+            raise ValueError("Parquet export needs pyarrow (pip install pyarrow)")
+    return fmt
+
+def frame_chunks(df, chunk_rows=None):
+    """Row slices of a DataFrame (views, so nothing is copied up front)"""
+    chunk_rows = chunk_rows or EXPORT_CONFIG['chunk_rows']
+    for start in range(0, len(df), chunk_rows):
+        yield df.iloc[start:start + chunk_rows]
+
+def record_chunks(records, chunk_rows=None):
+    """DataFrames built from a list of dicts a slice at a time"""
+    chunk_rows = chunk_rows or EXPORT_CONFIG['chunk_rows']
+    for start in range(0, len(records), chunk_rows):
+        yield pd.DataFrame(records[start:start + chunk_rows])
+
+def records_template(records, sample_rows=None):
+    """Small DataFrame giving the column types of a list of dicts, from an evenly spread sample
+
+    Numbers get nullable dtypes, so a column that is never missing in the sample still
+    accepts missing values later.
+    """
+    sample_rows = sample_rows or EXPORT_CONFIG['schema_sample_rows']
+    step = max(1, -(-len(records) // sample_rows))
+    return pd.DataFrame(records[::step]).convert_dtypes()
+
+def read_export_csv(file_path, fmt, **kwargs):
+    """Read a CSV export back, across every zstd frame that appends added"""
+    if fmt != 'zstd':
+        return pd.read_csv(file_path, compression={'csv': None, 'gzip': 'gzip'}[fmt], **kwargs)
+    import zstandard
+    with open(file_path, 'rb') as f:
+        with zstandard.ZstdDecompressor().stream_reader(f, read_across_frames=True) as reader:
+            return pd.read_csv(io.TextIOWrapper(reader, encoding='utf-8', newline=''), **kwargs)
+
+def read_export_columns(file_path, fmt):
+    """Column names of an existing export file"""
+    if fmt == 'parquet':
+        import pyarrow.parquet as pq
+        return pq.read_schema(file_path).names
+    return list(read_export_csv(file_path, fmt, nrows=0).columns)
+
+def last_exported_id(file_path, fmt):
+    """Highest prediction id in an existing prediction log export (0 if it has no rows)"""
+    ids = read_export_csv(file_path, fmt, usecols=['id'])['id']
+    return int(ids.max()) if len(ids) else 0
+
+def prediction_log_job(store, file_path, task=None, fmt=None, append=False, chunk_rows=None):
+    """Export job streaming a SQLiteStore's prediction log page by page
+
+    Appending adds only the predictions logged since the newest one already in the file.
+    """
+    after_id = 0
+    if append and os.path.exists(file_path) and os.path.getsize(file_path) > 0:
+        after_id = last_exported_id(file_path, resolve_export_format(file_path, fmt))
+    pages = store.iter_predictions(task, chunk_rows or EXPORT_CONFIG['chunk_rows'], after_id)
+    return ExportJob(pages, file_path, store.count_predictions(task, after_id), fmt, append)
+
+class ExportWriter:
+    """Writes DataFrame chunks to one file; CSV outputs can be appended to
+
+    Parquet fixes its column types when the file is opened; pass the whole frame (or one with
+    the same columns and dtypes) as template, or they come from the first chunk. Columns that
+    are all missing there are written as text.
+    """
+
+    def __init__(self, file_path, fmt=None, append=False, template=None):
+        self.file_path = file_path
+        self.template = template
+        self.format = resolve_export_format(file_path, fmt)
+        self.append = append and os.path.exists(file_path) and os.path.getsize(file_path) > 0
+        if self.append and self.format == 'parquet':
+            raise ValueError("Parquet files cannot be appended to; export to a new file")
+
+        self.columns = read_export_columns(file_path, self.format) if self.append else None
+        self.original_size = os.path.getsize(file_path) if self.append else None
+        self.rows_written = 0
+        self._file = None
+        self._stream = None
+        self._parquet_writer = None
+        self._parquet_schema = None
+
+    def open(self):
+        if self.format == 'parquet':
+            return self
+        self._file = open(self.file_path, 'ab' if self.append else 'wb')
+        if self.format == 'zstd':
+            import zstandard
+            # Appending adds a new frame; read the file back with read_export_csv, which reads across frames
+            binary = zstandard.ZstdCompressor().stream_writer(self._file, closefd=False)
+        elif self.format == 'gzip':
+            # Appending gzip adds a new member, which readers treat as one continuous stream
+            binary = gzip.GzipFile(fileobj=self._file, mode='wb')
+        else:
+            binary = self._file
+        self._stream = io.TextIOWrapper(binary, encoding='utf-8', newline='')
+        return self
+
+    def write(self, chunk):
+        """Write one chunk of rows"""
+        if self.columns is None:
+            self.columns = [str(column) for column in chunk.columns]
+        elif [str(column) for column in chunk.columns] != self.columns:
+            raise ValueError(f"Columns {list(chunk.columns)} do not match the file's columns {self.columns}")
+
+        if self.format == 'parquet':
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+            if self._parquet_writer is None:
+                source = chunk if self.template is None else self.template
+                schema = pa.Schema.from_pandas(source, preserve_index=False)
+                # A column with no values yet has no type; store it as text
+                for index, field in enumerate(schema):
+                    if pa.types.is_null(field.type):
+                        schema = schema.set(index, field.with_type(pa.large_string()))
+                self._parquet_schema = schema
+                self._parquet_writer = pq.ParquetWriter(self.file_path, self._parquet_schema, compression='zstd')
+            # Converted to the file's schema, so a chunk whose own dtypes differ (all missing,
+            # or ints that picked up NaN) still matches it
+            table = pa.Table.from_pandas(chunk, schema=self._parquet_schema, preserve_index=False)
+            self._parquet_writer.write_table(table)
+        else:
+            chunk.to_csv(self._stream, header=not self.append and self.rows_written == 0, index=False)
+        self.rows_written += len(chunk)
+
+    def close(self):
+        if self._parquet_writer is not None:
+            self._parquet_writer.close()
+            self._parquet_writer = None
+        if self._stream is not None:
+            self._stream.close()
+            self._stream = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+    def discard(self):
+        """Undo a partial export: remove a new file, or cut an appended file back to its old size"""
+        self.close()
+        if self.append:
+            with open(self.file_path, 'r+b') as f:
+                f.truncate(self.original_size)
+        elif os.path.exists(self.file_path):
+            os.remove(self.file_path)
+
+class ExportJob:
+    """Writes chunks to a file on a worker thread, reporting progress and honouring cancel"""
+
+    def __init__(self, chunks, file_path, total_rows=None, fmt=None, append=False, template=None):
+        self.chunks = chunks
+        self.file_path = file_path
+        self.total_rows = total_rows
+        # Resolve the format and check the append target up front so errors reach the caller
+        self.writer = ExportWriter(file_path, fmt, append, template)
+        self.error = None
+        self.cancel_event = threading.Event()
+        self.done_event = threading.Event()
+        self.thread = None
+
+    @property
+    def rows_written(self):
+        return self.writer.rows_written
+
+    @property
+    def progress(self):
+        """Fraction of the rows written so far"""
+        if not self.total_rows:
+            return 1.0 if self.done else 0.0
+        return min(self.rows_written / self.total_rows, 1.0)
+
+    @property
+    def done(self):
+        return self.done_event.is_set()
+
+    @property
+    def cancelled(self):
+        return self.cancel_event.is_set()
+
+    def start(self):
+        """Start writing on a daemon thread"""
+        self.thread = threading.Thread(target=self.run, name='export', daemon=True)
+        self.thread.start()
+        return self
+
+    def cancel(self):
+        """Ask the worker to stop after the current chunk (the partial output is removed)"""
+        self.cancel_event.set()
+
+    def run(self):
+        """Write every chunk (worker thread entry point)"""
+        try:
+            self.writer.open()
+            for chunk in self.chunks:
+                if self.cancelled:
+                    raise ExportCancelled()
+                self.writer.write(chunk)
+            self.writer.close()
+        except ExportCancelled:
+            self.writer.discard()
+        except Exception as e:
+            self.error = e
+            self.writer.discard()
+        finally:
+            self.done_event.set()
+
+    def wait(self, timeout=None):
+        """Block until the job finishes (for headless callers)"""
+        self.done_event.wait(timeout)
+        if self.error is not None:
+            raise self.error
+        return self.rows_written
@@ -1,8 +1,13 @@
 # data_generator.py - Sample Data Generation
 
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
-from config import DATA_GENERATION
+from config import DATA_GENERATION, DTYPE_CONFIG, STATE_DISTRICT_MAPPING
+from data_schema import compact_frame
+
+# Dataset names, in the order used to derive per-dataset seeds
+DATASETS = ('crop_recommendation', 'fertilizer', 'yield')
 
 class DataGenerator:
     def __init__(self):
@@ -11,96 +16,180 @@ class DataGenerator:
     
     def generate_crop_data(self):
         """Generate sample crop recommendation data"""
+        return compact_frame('crop_recommendation', self._crop_frame(np.random, self.n_samples))
+    
+    def generate_fertilizer_data(self):
+        """Generate sample fertilizer recommendation data"""
+        return compact_frame('fertilizer', self._fertilizer_frame(np.random, self.n_samples))
+    
+    def generate_yield_data(self):
+        """Generate sample yield prediction data"""
+        return compact_frame('yield', self._yield_frame(np.random, self.n_samples))
+    
+    def generate_all_data(self):
+        """Generate all sample datasets"""
+        return {
+            'crop_recommendation': self.generate_crop_data(),
+            'fertilizer': self.generate_fertilizer_data(),
+            'yield': self.generate_yield_data()
+        }
+    
+    def generate_chunks(self, dataset, n_rows=None, chunk_size=None, workers=None, seed=None):
+        """Yield a dataset as DataFrame chunks, identical for any number of workers"""
+        if dataset not in DATASETS:
+            raise ValueError(f"Unknown dataset: {dataset}")
+        n_rows = self.n_samples if n_rows is None else n_rows
+        chunk_size = chunk_size or DATA_GENERATION['chunk_size']
+        workers = workers or DATA_GENERATION['workers']
+        seed = DATA_GENERATION['random_seed'] if seed is None else seed
+        if n_rows < 0 or chunk_size <= 0:
+            raise ValueError("Row and chunk counts must be positive")
+        
+        # Every chunk gets its own child seed, so chunks can be generated anywhere, in any order
+        starts = range(0, n_rows, chunk_size)
+        seeds = np.random.SeedSequence([seed, DATASETS.index(dataset)]).spawn(len(starts))
+        tasks = [(dataset, child_seed, start, min(chunk_size, n_rows - start))
+                 for child_seed, start in zip(seeds, starts)]
+        
+        if workers == 1 or len(tasks) <= 1:
+            for task in tasks:
+                yield _generate_chunk(*task)
+            return
+        
+        # Keep a bounded window of chunks in flight and yield them in order
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            pending = [executor.submit(_generate_chunk, *task) for task in tasks[:workers * 2]]
+            next_task = len(pending)
+            while pending:
+                chunk = pending.pop(0).result()
+                if next_task < len(tasks):
+                    pending.append(executor.submit(_generate_chunk, *tasks[next_task]))
+                    next_task += 1
+                yield chunk
+    
+    def generate_dataset(self, dataset, n_rows=None, chunk_size=None, workers=None, seed=None):
+        """Generate a whole dataset with the chunked generator"""
+        chunks = list(self.generate_chunks(dataset, n_rows, chunk_size, workers, seed))
+        if not chunks:
+            return _generate_chunk(dataset, 0, 0, 0)
+        return pd.concat(chunks)
+    
+    @staticmethod
+    def _crop_frame(rng, n):
+        """Build crop recommendation rows from a random source"""
         data = pd.DataFrame({
-            'N': np.random.uniform(0, 140, self.n_samples),
-            'P': np.random.uniform(5, 145, self.n_samples),
-            'K': np.random.uniform(5, 205, self.n_samples),
-            'temperature': np.random.uniform(8.8, 43.7, self.n_samples),
-            'humidity': np.random.uniform(14.3, 99.9, self.n_samples),
-            'ph': np.random.uniform(3.5, 9.9, self.n_samples),
-            'rainfall': np.random.uniform(20.2, 298.6, self.n_samples)
+            'N': rng.uniform(0, 140, n),
+            'P': rng.uniform(5, 145, n),
+            'K': rng.uniform(5, 205, n),
+            'temperature': rng.uniform(8.8, 43.7, n),
+            'humidity': rng.uniform(14.3, 99.9, n),
+            'ph': rng.uniform(3.5, 9.9, n),
+            'rainfall': rng.uniform(20.2, 298.6, n)
         })
         
-        # Create target labels based on conditions
-        crop_labels = []
-        for _, row in data.iterrows():
-            if row['rainfall'] > 200:
-                crop_labels.append('rice')
-            elif row['temperature'] > 30:
-                crop_labels.append('cotton')
-            elif row['ph'] < 6:
-                crop_labels.append('coffee')
-            elif row['N'] > 100:
-                crop_labels.append('maize')
-            else:
-                crop_labels.append('wheat')
-        
-        data['label'] = crop_labels
+        # Create target labels based on conditions (first matching rule wins)
+        data['label'] = _apply_rules(
+            [
+                data['rainfall'] > 200,
+                data['temperature'] > 30,
+                data['ph'] < 6,
+                data['N'] > 100
+            ],
+            ['rice', 'cotton', 'coffee', 'maize'],
+            default='wheat'
+        )
         return data
     
-    def generate_fertilizer_data(self):
-        """Generate sample fertilizer recommendation data"""
+    @staticmethod
+    def _fertilizer_frame(rng, n):
+        """Build fertilizer recommendation rows from a random source"""
         data = pd.DataFrame({
-            'temperature': np.random.uniform(15, 40, self.n_samples),
-            'humidity': np.random.uniform(20, 90, self.n_samples),
-            'moisture': np.random.uniform(10, 80, self.n_samples),
-            'soil_type': np.random.choice(['Sandy', 'Loamy', 'Black', 'Red', 'Clayey'], self.n_samples),
-            'crop_type': np.random.choice(['Maize', 'Sugarcane', 'Cotton', 'Tobacco', 'Paddy', 'Wheat'], self.n_samples),
-            'nitrogen': np.random.uniform(0, 100, self.n_samples),
-            'phosphorous': np.random.uniform(0, 100, self.n_samples),
-            'potassium': np.random.uniform(0, 100, self.n_samples)
+            'temperature': rng.uniform(15, 40, n),
+            'humidity': rng.uniform(20, 90, n),
+            'moisture': rng.uniform(10, 80, n),
+            'soil_type': _choose(rng, ['Sandy', 'Loamy', 'Black', 'Red', 'Clayey'], n),
+            'crop_type': _choose(rng, ['Maize', 'Sugarcane', 'Cotton', 'Tobacco', 'Paddy', 'Wheat'], n),
+            'nitrogen': rng.uniform(0, 100, n),
+            'phosphorous': rng.uniform(0, 100, n),
+            'potassium': rng.uniform(0, 100, n)
         })
         
-        # Create fertilizer labels
-        fertilizer_labels = []
-        for _, row in data.iterrows():
-            if row['nitrogen'] < 40:
-                fertilizer_labels.append('Urea')
-            elif row['phosphorous'] < 40:
-                fertilizer_labels.append('DAP')
-            elif row['potassium'] < 40:
-                fertilizer_labels.append('MOP')
-            else:
-                fertilizer_labels.append('NPK')
-        
-        data['fertilizer'] = fertilizer_labels
+        # Create fertilizer labels (first matching rule wins)
+        data['fertilizer'] = _apply_rules(
+            [
+                data['nitrogen'] < 40,
+                data['phosphorous'] < 40,
+                data['potassium'] < 40
+            ],
+            ['Urea', 'DAP', 'MOP'],
+            default='NPK'
+        )
         return data
     
-    def generate_yield_data(self):
-        """Generate sample yield prediction data"""
-        # State and district mapping
-        state_district_mapping = {
-            'Punjab': ['Amritsar', 'Ludhiana', 'Jalandhar', 'Patiala'],
-            'Haryana': ['Gurgaon', 'Faridabad', 'Hisar', 'Rohtak'],
-            'UP': ['Lucknow', 'Kanpur', 'Varanasi', 'Agra'],
-            'Bihar': ['Patna', 'Gaya', 'Bhagalpur', 'Muzaffarpur'],
-            'West Bengal': ['Kolkata', 'Howrah', 'Burdwan', 'Murshidabad']
-        }
-        
-        # Generate states first
-        states = np.random.choice(['Punjab', 'Haryana', 'UP', 'Bihar', 'West Bengal'], self.n_samples)
+    @staticmethod
+    def _yield_frame(rng, n):
+        """Build yield prediction rows from a random source"""
+        # Flatten the mapping so districts can be picked with array indexing
+        state_names = np.array(list(STATE_DISTRICT_MAPPING), dtype=object)
+        district_names = np.array(
+            [district for districts in STATE_DISTRICT_MAPPING.values() for district in districts],
+            dtype=object
+        )
+        district_counts = np.array([len(districts) for districts in STATE_DISTRICT_MAPPING.values()])
+        district_starts = np.concatenate(([0], np.cumsum(district_counts)[:-1]))
         
-        # Generate corresponding districts
-        districts = []
-        for state in states:
-            districts.append(np.random.choice(state_district_mapping[state]))
+        # Generate states first, then a district of the same state for every row
+        state_codes = _integers(rng, len(state_names), n)
+        district_offsets = (rng.random(n) * district_counts[state_codes]).astype(np.int64)
+        states = _categorical(state_names, state_codes)
+        districts = _categorical(district_names, district_starts[state_codes] + district_offsets)
         
         data = pd.DataFrame({
             'state': states,
             'district': districts,
-            'season': np.random.choice(['Kharif', 'Rabi', 'Whole Year'], self.n_samples),
-            'crop': np.random.choice(['Rice', 'Wheat', 'Cotton', 'Sugarcane'], self.n_samples),
-            'area': np.random.uniform(1000, 50000, self.n_samples),
-            'production': np.random.uniform(5000, 200000, self.n_samples)
+            'season': _choose(rng, ['Kharif', 'Rabi', 'Whole Year'], n),
+            'crop': _choose(rng, ['Rice', 'Wheat', 'Cotton', 'Sugarcane'], n),
+            'area': rng.uniform(1000, 50000, n),
+            'production': rng.uniform(5000, 200000, n)
         })
         
         data['yield'] = data['production'] / data['area']
         return data
+
+_FRAME_BUILDERS = {
+    'crop_recommendation': DataGenerator._crop_frame,
+    'fertilizer': DataGenerator._fertilizer_frame,
+    'yield': DataGenerator._yield_frame
+}
+
+def _generate_chunk(dataset, seed, start, n):
+    """Generate one chunk from its own seed (runs in a worker process)"""
+    data = compact_frame(dataset, _FRAME_BUILDERS[dataset](np.random.default_rng(seed), n))
+    data.index = pd.RangeIndex(start, start + n)
+    return data
+
+def _integers(rng, high, n):
+    """Random integers in [0, high) from either np.random or a Generator"""
+    if isinstance(rng, np.random.Generator):
+        return rng.integers(0, high, n)
+    return rng.randint(0, high, n)
+
+def _apply_rules(conditions, labels, default):
+    """Label each row with the first rule whose condition holds"""
+    codes = np.select(conditions, np.arange(len(labels)), default=len(labels))
+    return _categorical(labels + [default], codes)
+
+def _choose(rng, values, n):
+    """Pick a value per row by index (same draws as np.random.choice, no string array copies)"""
+    return _categorical(values, _integers(rng, len(values), n))
+
+def _categorical(values, codes):
+    """values[codes], as a sorted Categorical built from the codes when compact dtypes are on"""
+    values = np.asarray(values, dtype=object)
+    if not DTYPE_CONFIG['enabled']:
+        return values[codes]
     
-    def generate_all_data(self):
-        """Generate all sample datasets"""
-        return {
-            'crop_recommendation': self.generate_crop_data(),
-            'fertilizer': self.generate_fertilizer_data(),
-            'yield': self.generate_yield_data()
-        }
\ No newline at end of file
+    order = np.argsort(values)
+    ranks = np.empty(len(values), dtype=np.int64)
+    ranks[order] = np.arange(len(values))
+    return pd.Categorical.from_codes(ranks[codes], categories=values[order])
@@ -5,66 +5,207 @@ import tkinter as tk
 from tkinter import filedialog, messagebox
 from datetime import datetime
 import os
+from data_schema import compact_frame, concat_frames, memory_report, format_bytes
+from data_profile import DataProfiler
+from csv_ingest import CsvIngestJob
+from dataset_store import DatasetStore
+from directory_ingest import ingest_directory
+from sqlite_store import SQLiteStore
+from data_export import (ExportJob, frame_chunks, record_chunks, records_template, resolve_export_format,
+                         prediction_log_job)
+from config import SQLITE_CONFIG
+from data_validation import (validate_frame, split_invalid_rows, check_referential_integrity,
+                             describe_integrity, PAIR_RULES)
+
+EXPORT_FILE_TYPES = [
+    ("CSV files", "*.csv"),
+    ("Gzip CSV files", "*.csv.gz"),
+    ("Zstandard CSV files", "*.csv.zst"),
+    ("Parquet files", "*.parquet"),
+    ("All files", "*.*")
+]
 
 class DataManager:
     def __init__(self):
         self.data = {}
         self.data_info = {}
+        self.data_versions = {}
+        self.profiler = DataProfiler()
+        self.validation_reports = {}
+        self.integrity_reports = {}
+        self.quarantined = {}
+        self._next_version = 1
+        self.sql_store = None
+        self._sql_versions = {}
+        if SQLITE_CONFIG['enabled']:
+            self.enable_sql_store()
     
     def set_data(self, data_dict):
         """Set the data dictionary"""
-        self.data = data_dict
+        data = {name: compact_frame(name, df) for name, df in data_dict.items()}
+        for name, df in data.items():
+            if self.data.get(name) is not df:
+                self._bump_version(name)
+        for name in set(self.data) - set(data):
+            self._forget(name)
+        self.data = data
         self.update_data_info()
     
+    def append_data(self, name, new_rows):
+        """Append rows to a dataset, updating its profile from the new rows only"""
+        new_rows = compact_frame(name, new_rows)
+        if name not in self.data:
+            self.set_data({**self.data, name: new_rows})
+            return
+        
+        # Profile the current version before it is replaced, so the append can extend it
+        self.get_profile(name)
+        combined = concat_frames([self.data[name], new_rows])
+        version = self._bump_version(name)
+        self.profiler.append(name, new_rows, version)
+        data = dict(self.data)
+        data[name] = combined
+        self.data = data
+        self.update_data_info()
+    
+    def get_profile(self, name):
+        """Cached column statistics of the current version of a dataset"""
+        return self.profiler.get(name, self.data[name], self.data_versions[name])
+    
+    def validate_rows(self, name):
+        """Row-level validation report of the current version of a dataset (cached per version)"""
+        report = self.validation_reports.get(name)
+        if report is None or report.version != self.data_versions[name]:
+            report = validate_frame(name, self.data[name], version=self.data_versions[name])
+            self.validation_reports[name] = report
+        return report
+    
+    def check_referential_integrity(self, name):
+        """Mismatched column pairs (state/district) with row counts, cached per dataset version"""
+        version, results = self.integrity_reports.get(name, (None, None))
+        if version != self.data_versions[name]:
+            results = check_referential_integrity(name, self.data[name])
+            self.integrity_reports[name] = (self.data_versions[name], results)
+        return results
+    
+    def quarantine_invalid_rows(self, names=None, output_dir=None):
+        """Move rows that fail validation out of the datasets, optionally saving them as CSV
+        
+        Returns the number of rows quarantined per dataset.
+        """
+        data = dict(self.data)
+        moved = {}
+        for name in names or list(self.data):
+            report = self.validate_rows(name)
+            if not report.bad_row_count:
+                continue
+            clean, quarantined = split_invalid_rows(self.data[name], report)
+            data[name] = clean
+            self.quarantined[name] = quarantined
+            moved[name] = len(quarantined)
+            self._bump_version(name)
+            
+            if output_dir is not None:
+                os.makedirs(output_dir, exist_ok=True)
+                quarantined.to_csv(os.path.join(output_dir, f"{name}_quarantine.csv"))
+        
+        if moved:
+            self.data = data
+            self.update_data_info()
+        return moved
+    
     def update_data_info(self):
-        """Update data information"""
-        self.data_info = {}
+        """Update data information for datasets whose version changed"""
+        data_info = {}
         for name, df in self.data.items():
-            self.data_info[name] = {
-                'samples': len(df),
-                'features': len(df.columns),
+            info = self.data_info.get(name)
+            if info is not None and info['version'] == self.data_versions[name]:
+                data_info[name] = info
+                continue
+            
+            profile = self.get_profile(name)
+            memory = memory_report({name: df})[name]
+            data_info[name] = {
+                'version': self.data_versions[name],
+                'samples': profile.rows,
+                'features': len(profile.columns),
+                'missing_values': sum(profile.missing_values().values()),
+                'memory_bytes': memory['bytes'],
+                'memory_saved_bytes': memory['saved_bytes'],
                 'status': 'Ready',
                 'last_updated': datetime.now().strftime('%Y-%m-%d %H:%M')
             }
+        self.data_info = data_info
+        self.sync_sql_store()
+    
+    def enable_sql_store(self, path=None):
+        """Mirror the datasets into an indexed SQLite database (also used for the prediction log)"""
+        self.sql_store = SQLiteStore(path)
+        self._sql_versions = {}
+        self.sync_sql_store()
+        return self.sql_store
+    
+    def sync_sql_store(self):
+        """Write datasets whose version changed since the last sync to the SQLite store"""
+        if self.sql_store is None:
+            return None
+        changed = {name: df for name, df in self.data.items()
+                   if self._sql_versions.get(name) != self.data_versions[name]}
+        for name in set(self._sql_versions) - set(self.data):
+            self.sql_store.drop_dataset(name)
+            del self._sql_versions[name]
+        result = self.sql_store.save_all(changed)
+        self._sql_versions.update({name: self.data_versions[name] for name in changed})
+        return result
+    
+    def query_data(self, name, columns=None, **filters):
+        """Rows of a dataset where each column equals the given value, through the SQLite indexes if enabled"""
+        if self.sql_store is not None:
+            return self.sql_store.query(name, columns, **filters)
+        
+        df = self.data[name]
+        mask = pd.Series(True, index=df.index)
+        for column, value in filters.items():
+            mask &= df[column] == value
+        result = df[mask] if columns is None else df.loc[mask, list(columns)]
+        return result.reset_index(drop=True)
+    
+    def _bump_version(self, name):
+        """Give a dataset a new version number (invalidates its cached profile)"""
+        self.data_versions[name] = self._next_version
+        self._next_version += 1
+        return self.data_versions[name]
+    
+    def _forget(self, name):
+        self.data_versions.pop(name, None)
+        self.profiler.discard(name)
+        self.validation_reports.pop(name, None)
+        self.integrity_reports.pop(name, None)
+    
+    def get_memory_summary(self):
+        """One-line summary of dataset memory and the savings from compact dtypes"""
+        used = sum(info['memory_bytes'] for info in self.data_info.values())
+        saved = sum(info['memory_saved_bytes'] for info in self.data_info.values())
+        wide = used + saved
+        percent = saved / wide * 100 if wide else 0.0
+        return f"Data uses {format_bytes(used)} ({format_bytes(saved)} / {percent:.0f}% saved by compact dtypes)"
     
     def load_csv_data(self, parent_window=None):
         """Load data from CSV file"""
         try:
-            file_path = filedialog.askopenfilename(
-                title="Select CSV file",
-                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-                parent=parent_window
-            )
+            file_path = self.ask_csv_file(parent_window)
             
             if file_path:
                 # Load the data
-                new_data = pd.read_csv(file_path)
+                job = self.start_csv_load(file_path)
+                job.run()
+                if job.error is not None:
+                    raise job.error
                 
-                # Show data info dialog
-                info_text = f"Data loaded successfully!\n\n"
-                info_text += f"File: {os.path.basename(file_path)}\n"
-                info_text += f"Rows: {len(new_data):,}\n"
-                info_text += f"Columns: {len(new_data.columns)}\n"
-                info_text += f"Columns: {', '.join(new_data.columns[:5])}"
-                if len(new_data.columns) > 5:
-                    info_text += "..."
-                
-                messagebox.showinfo("Data Loaded", info_text, parent=parent_window)
+                self.finish_csv_load(job)
                 
-                # Determine data type and update accordingly
-                filename = os.path.basename(file_path).lower()
-                if 'crop' in filename and 'recommendation' in filename:
-                    self.data['crop_recommendation'] = new_data
-                elif 'fertilizer' in filename:
-                    self.data['fertilizer'] = new_data
-                elif 'yield' in filename:
-                    self.data['yield'] = new_data
-                else:
-                    # Generic data loading
-                    data_name = os.path.splitext(os.path.basename(file_path))[0]
-                    self.data[data_name] = new_data
-                
-                self.update_data_info()
+                # Show data info dialog
+                messagebox.showinfo("Data Loaded", self.describe_loaded_data(job), parent=parent_window)
                 return True, f"Data loaded from {os.path.basename(file_path)}"
                 
         except Exception as e:
@@ -75,39 +216,103 @@ class DataManager:
         
         return False, "No file selected"
     
-    def export_data(self, data_to_export=None, parent_window=None):
-        """Export data to CSV file"""
+    def load_directory(self, directory=None, parent_window=None):
+        """Load every new CSV in a directory, routed by columns and deduplicated against loaded rows"""
+        try:
+            if directory is None:
+                directory = filedialog.askdirectory(title="Select data directory", parent=parent_window)
+            
+            if directory:
+                result = ingest_directory(directory, existing=self.data)
+                for name, rows in result['data'].items():
+                    if len(rows):
+                        self.append_data(name, rows)
+                        if name in PAIR_RULES:
+                            self.check_referential_integrity(name)
+                result['ledger'].save()
+                return True, self.describe_directory_load(result)
+            
+        except Exception as e:
+            return False, f"Failed to load directory: {str(e)}"
+        
+        return False, "No directory selected"
+    
+    def describe_directory_load(self, result):
+        """One-line summary of a directory load"""
+        new_rows = sum(len(rows) for rows in result['data'].values())
+        message = (f"Loaded {len(result['files'])} file(s): {new_rows:,} new rows, "
+                   f"{sum(result['duplicates'].values()):,} duplicates dropped")
+        if result['skipped']:
+            message += f", {len(result['skipped'])} already loaded"
+        if result['unrecognized']:
+            message += f", unrecognized columns in {', '.join(result['unrecognized'])}"
+        if result['errors']:
+            message += f", failed: {', '.join(name for name, _ in result['errors'])}"
+        return message
+    
+    def ask_csv_file(self, parent_window=None):
+        """Ask the user for a CSV file to load"""
+        return filedialog.askopenfilename(
+            title="Select CSV file",
+            filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
+            parent=parent_window
+        )
+    
+    def get_dataset_name(self, file_path):
+        """Determine which dataset a CSV file holds from its name"""
+        filename = os.path.basename(file_path).lower()
+        if 'crop' in filename and 'recommendation' in filename:
+            return 'crop_recommendation'
+        elif 'fertilizer' in filename:
+            return 'fertilizer'
+        elif 'yield' in filename:
+            return 'yield'
+        # Generic data loading
+        return os.path.splitext(os.path.basename(file_path))[0]
+    
+    def start_csv_load(self, file_path, chunksize=None):
+        """Create a chunked ingestion job for a CSV file (call start() to run it in the background)"""
+        return CsvIngestJob(file_path, self.get_dataset_name(file_path), chunksize=chunksize)
+    
+    def finish_csv_load(self, job):
+        """Swap a finished job's dataset in as a single assignment"""
+        if job.result is None:
+            return False
+        self._bump_version(job.dataset_name)
+        data = dict(self.data)
+        data[job.dataset_name] = job.result
+        self.data = data
+        self.update_data_info()
+        if job.dataset_name in PAIR_RULES:
+            self.check_referential_integrity(job.dataset_name)
+        return True
+    
+    def describe_loaded_data(self, job):
+        """Summary text for a finished ingestion job"""
+        new_data = job.result
+        info_text = f"Data loaded successfully!\n\n"
+        info_text += f"File: {os.path.basename(job.file_path)}\n"
+        info_text += f"Rows: {len(new_data):,}\n"
+        info_text += f"Columns: {len(new_data.columns)}\n"
+        info_text += f"Columns: {', '.join(new_data.columns[:5])}"
+        if len(new_data.columns) > 5:
+            info_text += "..."
+        
+        _, integrity = self.integrity_reports.get(job.dataset_name, (None, {}))
+        problems = describe_integrity(integrity)
+        if problems:
+            info_text += f"\n\nWarning: {problems}"
+        return info_text
+    
+    def export_data(self, data_to_export=None, parent_window=None, append=False):
+        """Export data to a CSV, compressed CSV or Parquet file, written in chunks"""
         try:
-            file_path = filedialog.asksaveasfilename(
-                title="Save results",
-                defaultextension=".csv",
-                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-                parent=parent_window
-            )
+            file_path = self.ask_export_file("Save results", parent_window)
             
             if file_path:
-                if data_to_export is None:
-                    # Create a summary report
-                    report_data = {
-                        'Dataset': [],
-                        'Samples': [],
-                        'Features': [],
-                        'Status': [],
-                        'Last_Updated': []
-                    }
-                    
-                    for name, info in self.data_info.items():
-                        report_data['Dataset'].append(name.replace('_', ' ').title())
-                        report_data['Samples'].append(info['samples'])
-                        report_data['Features'].append(info['features'])
-                        report_data['Status'].append(info['status'])
-                        report_data['Last_Updated'].append(info['last_updated'])
-                    
-                    report_df = pd.DataFrame(report_data)
-                    report_df.to_csv(file_path, index=False)
-                else:
-                    # Export specific data
-                    data_to_export.to_csv(file_path, index=False)
+                job = self.start_data_export(file_path, data_to_export, append=append)
+                job.run()
+                job.wait()
                 
                 success_msg = f"Data exported to {os.path.basename(file_path)}"
                 if parent_window:
@@ -122,23 +327,17 @@ class DataManager:
         
         return False, "No file selected"
     
-    def export_predictions(self, predictions_data, parent_window=None):
-        """Export predictions to CSV file"""
+    def export_predictions(self, predictions_data, parent_window=None, append=False):
+        """Export predictions, optionally appending to an existing prediction file"""
         try:
-            file_path = filedialog.asksaveasfilename(
-                title="Save predictions",
-                defaultextension=".csv",
-                filetypes=[("CSV files", "*.csv"), ("All files", "*.*")],
-                parent=parent_window
-            )
+            file_path = self.ask_export_file("Save predictions", parent_window, confirm_overwrite=not append)
             
             if file_path:
-                # Convert predictions to DataFrame
-                predictions_df = pd.DataFrame(predictions_data)
-                predictions_df['timestamp'] = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
-                predictions_df.to_csv(file_path, index=False)
+                job = self.start_predictions_export(file_path, predictions_data, append=append)
+                job.run()
+                job.wait()
                 
-                success_msg = f"Predictions exported to {os.path.basename(file_path)}"
+                success_msg = f"Predictions {'appended' if append else 'exported'} to {os.path.basename(file_path)}"
                 if parent_window:
                     messagebox.showinfo("Export Successful", success_msg, parent=parent_window)
                 return True, success_msg
@@ -151,17 +350,77 @@ class DataManager:
         
         return False, "No file selected"
     
+    def ask_export_file(self, title, parent_window=None, confirm_overwrite=True):
+        """Ask the user where to export; the extension picks the format"""
+        return filedialog.asksaveasfilename(
+            title=title,
+            defaultextension=".csv",
+            filetypes=EXPORT_FILE_TYPES,
+            confirmoverwrite=confirm_overwrite,
+            parent=parent_window
+        )
+    
+    def start_data_export(self, file_path, data_to_export=None, fmt=None, append=False, chunk_rows=None):
+        """Create a chunked export job for a DataFrame, or the dataset summary when none is given"""
+        df = self.get_summary_report() if data_to_export is None else data_to_export
+        return ExportJob(frame_chunks(df, chunk_rows), file_path, len(df), fmt, append, template=df)
+    
+    def start_predictions_export(self, file_path, predictions_data, fmt=None, append=False, chunk_rows=None):
+        """Create a chunked export job for prediction records, stamped with the export time"""
+        timestamp = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        if isinstance(predictions_data, pd.DataFrame):
+            chunks = frame_chunks(predictions_data, chunk_rows)
+        else:
+            predictions_data = list(predictions_data)
+            chunks = record_chunks(predictions_data, chunk_rows)
+        chunks = (chunk.assign(timestamp=timestamp) for chunk in chunks)
+        
+        template = None
+        if resolve_export_format(file_path, fmt) == 'parquet':
+            # Parquet column types are fixed up front; take them from a sample spread over all records
+            template = records_template(predictions_data).assign(timestamp=timestamp)
+        return ExportJob(chunks, file_path, len(predictions_data), fmt, append, template)
+    
+    def start_prediction_log_export(self, file_path, task=None, fmt=None, append=False):
+        """Create a chunked export job for the SQLite prediction log"""
+        if self.sql_store is None:
+            raise ValueError("The prediction log needs the SQLite store (SQLITE_CONFIG['enabled'])")
+        return prediction_log_job(self.sql_store, file_path, task, fmt, append)
+    
+    def get_summary_report(self):
+        """One row per dataset with its size, missing values and status"""
+        report_data = {
+            'Dataset': [],
+            'Samples': [],
+            'Features': [],
+            'Missing_Values': [],
+            'Status': [],
+            'Last_Updated': []
+        }
+        
+        for name, info in self.data_info.items():
+            report_data['Dataset'].append(name.replace('_', ' ').title())
+            report_data['Samples'].append(info['samples'])
+            report_data['Features'].append(info['features'])
+            report_data['Missing_Values'].append(info['missing_values'])
+            report_data['Status'].append(info['status'])
+            report_data['Last_Updated'].append(info['last_updated'])
+        
+        return pd.DataFrame(report_data)
+    
     def get_data_summary(self):
         """Get summary of all datasets"""
         summary = {}
-        for name, df in self.data.items():
+        for name in self.data:
+            profile = self.get_profile(name)
             summary[name] = {
-                'shape': df.shape,
-                'columns': list(df.columns),
-                'dtypes': df.dtypes.to_dict(),
-                'missing_values': df.isnull().sum().to_dict(),
-                'numeric_columns': df.select_dtypes(include=['number']).columns.tolist(),
-                'categorical_columns': df.select_dtypes(include=['object']).columns.tolist()
+                'shape': (profile.rows, len(profile.columns)),
+                'columns': list(profile.columns),
+                'dtypes': {column: stats.dtype for column, stats in profile.columns.items()},
+                'missing_values': profile.missing_values(),
+                'numeric_columns': profile.columns_of_kind('numeric'),
+                'categorical_columns': profile.columns_of_kind('category', 'text'),
+                'statistics': profile.to_frame()
             }
         return summary
     
@@ -179,19 +438,19 @@ class DataManager:
                 }
                 continue
             
-            df = self.data[dataset_name]
+            profile = self.get_profile(dataset_name)
             
             # Check if dataset has minimum required samples
-            if len(df) < 50:
+            if profile.rows < 50:
                 validation_results[dataset_name] = {
                     'valid': False,
-                    'message': f"Dataset has only {len(df)} samples. Minimum 50 required."
+                    'message': f"Dataset has only {profile.rows} samples. Minimum 50 required."
                 }
                 continue
             
             # Check for required columns based on dataset type
             required_columns = self._get_required_columns(dataset_name)
-            missing_columns = [col for col in required_columns if col not in df.columns]
+            missing_columns = [col for col in required_columns if col not in profile.columns]
             
             if missing_columns:
                 validation_results[dataset_name] = {
@@ -201,7 +460,7 @@ class DataManager:
                 continue
             
             # Check for excessive missing values
-            missing_percentage = (df.isnull().sum() / len(df) * 100).max()
+            missing_percentage = profile.max_missing_percentage()
             if missing_percentage > 20:
                 validation_results[dataset_name] = {
                     'valid': False,
@@ -209,9 +468,23 @@ class DataManager:
                 }
                 continue
             
+            # Check every row against the declared types, ranges and categories
+            report = self.validate_rows(dataset_name)
+            if report.bad_row_count:
+                validation_results[dataset_name] = {
+                    'valid': False,
+                    'message': f"{report.summary()}. Quarantine them before training.",
+                    'invalid_rows': report.bad_row_count
+                }
+                continue
+            
+            message = "Dataset is valid for training"
+            if report.warning_counts:
+                message += f" ({report.summary()})"
             validation_results[dataset_name] = {
                 'valid': True,
-                'message': "Dataset is valid for training"
+                'message': message,
+                'warnings': dict(report.warning_counts)
             }
         
         return validation_results
@@ -227,26 +500,39 @@ class DataManager:
         return required_columns.get(dataset_name, [])
     
     def backup_data(self, backup_dir=None):
-        """Create backup of current data"""
+        """Back up all datasets to a columnar store, rewriting only changed datasets"""
         try:
             if backup_dir is None:
                 backup_dir = filedialog.askdirectory(title="Select backup directory")
             
             if backup_dir:
-                timestamp = datetime.now().strftime('%Y%m%d_%H%M%S')
-                
-                for name, df in self.data.items():
-                    backup_filename = f"{name}_backup_{timestamp}.csv"
-                    backup_path = os.path.join(backup_dir, backup_filename)
-                    df.to_csv(backup_path, index=False)
-                
-                return True, f"Data backed up to {backup_dir}"
+                result = DatasetStore(backup_dir).save_all(self.data)
+                return True, (f"Backed up {len(result['written'])} changed dataset(s) to {backup_dir} "
+                              f"({len(result['skipped'])} unchanged)")
             
         except Exception as e:
             return False, f"Backup failed: {str(e)}"
         
         return False, "No backup directory selected"
     
+    def restore_backup(self, backup_dir=None):
+        """Reopen datasets from a columnar store (memory-mapped, so this is near-instant)"""
+        try:
+            if backup_dir is None:
+                backup_dir = filedialog.askdirectory(title="Select backup directory")
+            
+            if backup_dir:
+                restored = DatasetStore(backup_dir).load_all()
+                if not restored:
+                    return False, f"No datasets found in {backup_dir}"
+                self.set_data({**self.data, **restored})
+                return True, f"Restored {len(restored)} dataset(s) from {backup_dir}"
+            
+        except Exception as e:
+            return False, f"Restore failed: {str(e)}"
+        
+        return False, "No backup directory selected"
+    
     def get_dataset_info(self):
         """Get formatted dataset information for display"""
         info_list = []
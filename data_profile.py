@@ -0,0 +1,200 @@
+# data_profile.py - Single-Pass, Cached Dataset Profiling
+
+import numpy as np
+import pandas as pd
+from config import PROFILE_CONFIG
+
+class ColumnProfile:
+    """Statistics of one column, mergeable so appended rows only need profiling themselves"""
+
+    def __init__(self, name, dtype, kind):
+        self.name = name
+        self.dtype = dtype
+        self.kind = kind  # 'numeric', 'category', 'text' or 'other'
+        self.count = 0
+        self.nulls = 0
+        self.min = None
+        self.max = None
+        self.sum = 0.0
+        self.distinct = set()  # numeric values, while there are few enough to track
+        self.histogram = {}  # category -> rows, for category and text columns
+        self.distinct_exact = True
+
+    @classmethod
+    def from_series(cls, values):
+        """Profile a column in one pass over its values"""
+        dtype = values.dtype
+        if isinstance(dtype, pd.CategoricalDtype):
+            profile = cls(values.name, str(dtype), 'category')
+            codes = values.cat.codes.to_numpy()
+            counts = np.bincount(codes[codes >= 0], minlength=len(values.cat.categories))
+            profile.nulls = int(len(codes) - counts.sum())
+            profile.histogram = {category: int(count) for category, count
+                                 in zip(values.cat.categories.tolist(), counts.tolist()) if count}
+        elif pd.api.types.is_bool_dtype(dtype) or pd.api.types.is_numeric_dtype(dtype):
+            profile = cls(values.name, str(dtype), 'numeric')
+            array = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            present = array[~np.isnan(array)]
+            profile.nulls = int(len(array) - len(present))
+            if len(present):
+                profile.min = float(present.min())
+                profile.max = float(present.max())
+                profile.sum = float(present.sum())
+                profile._track_distinct(np.unique(present))
+        elif pd.api.types.is_string_dtype(dtype) or pd.api.types.is_object_dtype(dtype):
+            profile = cls(values.name, str(dtype), 'text')
+            counts = values.value_counts(dropna=True, sort=False)
+            profile.nulls = int(len(values) - counts.sum())
+            if len(counts) <= PROFILE_CONFIG['max_histogram_size']:
+                profile.histogram = {str(value): int(count) for value, count in counts.items()}
+            else:
+                profile._stop_tracking(len(counts))
+        else:
+            profile = cls(values.name, str(dtype), 'other')
+            profile.nulls = int(values.isna().sum())
+
+        profile.count = len(values)
+        return profile
+
+    @property
+    def non_null(self):
+        return self.count - self.nulls
+
+    @property
+    def mean(self):
+        if self.kind != 'numeric' or not self.non_null:
+            return None
+        return self.sum / self.non_null
+
+    @property
+    def cardinality(self):
+        """Distinct non-null values (a lower bound when distinct_exact is False)"""
+        if self.kind == 'other':
+            return None
+        if self.histogram is not None and self.kind in ('category', 'text'):
+            return len(self.histogram)
+        if isinstance(self.distinct, set):
+            return len(self.distinct)
+        return self.distinct
+
+    def merge(self, other):
+        """Fold in the profile of appended rows"""
+        if other.kind != self.kind:
+            raise ValueError(f"Column '{self.name}' changed from {self.kind} to {other.kind}")
+
+        self.count += other.count
+        self.nulls += other.nulls
+        self.sum += other.sum
+        if other.min is not None:
+            self.min = other.min if self.min is None else min(self.min, other.min)
+            self.max = other.max if self.max is None else max(self.max, other.max)
+
+        if self.kind == 'numeric':
+            if self.distinct_exact and other.distinct_exact:
+                self._track_distinct(other.distinct)
+            else:
+                self._stop_tracking(max(self.cardinality, other.cardinality))
+        elif self.kind in ('category', 'text'):
+            if self.histogram is not None and other.histogram is not None:
+                for value, count in other.histogram.items():
+                    self.histogram[value] = self.histogram.get(value, 0) + count
+                if self.kind == 'text' and len(self.histogram) > PROFILE_CONFIG['max_histogram_size']:
+                    self._stop_tracking(len(self.histogram))
+            else:
+                self._stop_tracking(max(self.cardinality, other.cardinality))
+
+    def to_dict(self):
+        """Plain statistics for display and export"""
+        return {
+            'column': self.name,
+            'dtype': self.dtype,
+            'count': self.count,
+            'nulls': self.nulls,
+            'min': self.min,
+            'max': self.max,
+            'mean': self.mean,
+            'cardinality': self.cardinality,
+            'cardinality_exact': self.distinct_exact
+        }
+
+    def _track_distinct(self, values):
+        """Add values to the distinct set, switching to a lower bound once it grows too large"""
+        if not self.distinct_exact:
+            self.distinct = max(self.distinct, len(values))
+        elif len(self.distinct) + len(values) > PROFILE_CONFIG['max_tracked_distinct']:
+            self._stop_tracking(max(len(self.distinct), len(values)))
+        else:
+            self.distinct.update(values.tolist() if isinstance(values, np.ndarray) else values)
+
+    def _stop_tracking(self, lower_bound):
+        """Keep only a lower bound on the number of distinct values"""
+        self.distinct_exact = False
+        self.distinct = lower_bound
+        self.histogram = None
+
+class DatasetProfile:
+    """Column statistics of one dataset version"""
+
+    def __init__(self, version, rows, columns):
+        self.version = version
+        self.rows = rows
+        self.columns = columns
+
+    @classmethod
+    def from_frame(cls, df, version=0):
+        """Profile every column of a DataFrame"""
+        return cls(version, len(df), {column: ColumnProfile.from_series(df[column]) for column in df.columns})
+
+    def merge(self, other, version):
+        """Profile of this dataset with other's rows appended"""
+        if list(other.columns) != list(self.columns):
+            raise ValueError("Appended rows must have the same columns")
+        for name, column in self.columns.items():
+            column.merge(other.columns[name])
+        self.rows += other.rows
+        self.version = version
+        return self
+
+    def missing_values(self):
+        """Null count per column"""
+        return {name: column.nulls for name, column in self.columns.items()}
+
+    def max_missing_percentage(self):
+        """Highest share of nulls in any column"""
+        if not self.rows:
+            return 0.0
+        return max((column.nulls for column in self.columns.values()), default=0) / self.rows * 100
+
+    def columns_of_kind(self, *kinds):
+        return [name for name, column in self.columns.items() if column.kind in kinds]
+
+    def to_frame(self):
+        """One row of statistics per column"""
+        return pd.DataFrame([column.to_dict() for column in self.columns.values()])
+
+class DataProfiler:
+    """Caches one profile per dataset and version"""
+
+    def __init__(self):
+        self.profiles = {}
+        self.scans = 0
+
+    def get(self, name, df, version):
+        """Profile of a dataset version, scanning it only if that version is not cached"""
+        profile = self.profiles.get(name)
+        if profile is None or profile.version != version:
+            profile = DatasetProfile.from_frame(df, version)
+            self.profiles[name] = profile
+            self.scans += 1
+        return profile
+
+    def append(self, name, appended_rows, version):
+        """Update a cached profile with appended rows, without rescanning existing ones"""
+        profile = self.profiles.get(name)
+        if profile is None:
+            return None
+        self.profiles[name] = profile.merge(DatasetProfile.from_frame(appended_rows), version)
+        return self.profiles[name]
+
+    def discard(self, name):
+        self.profiles.pop(name, None)
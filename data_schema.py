@@ -0,0 +1,130 @@
+# data_schema.py - Compact Column Dtypes for the Datasets
+
+import sys
+import numpy as np
+import pandas as pd
+from pandas.api.types import union_categoricals
+from config import DTYPE_CONFIG, CATEGORY_SETS
+
+# Column kinds per dataset: measurements are stored as floats, text columns as categories
+DATASET_SCHEMAS = {
+    'crop_recommendation': {
+        'N': 'float', 'P': 'float', 'K': 'float', 'temperature': 'float',
+        'humidity': 'float', 'ph': 'float', 'rainfall': 'float', 'label': 'category'
+    },
+    'fertilizer': {
+        'temperature': 'float', 'humidity': 'float', 'moisture': 'float',
+        'soil_type': 'category', 'crop_type': 'category', 'nitrogen': 'float',
+        'phosphorous': 'float', 'potassium': 'float', 'fertilizer': 'category'
+    },
+    'yield': {
+        'state': 'category', 'district': 'category', 'season': 'category', 'crop': 'category',
+        'area': 'float', 'production': 'float', 'yield': 'float'
+    }
+}
+
+# Bytes per row of a float64 column or an object column's pointer
+WIDE_ITEM_BYTES = 8
+
+def match_dataset(columns):
+    """Dataset whose schema columns are all present (the largest such schema), or None"""
+    columns = set(columns)
+    matches = [name for name, schema in DATASET_SCHEMAS.items() if set(schema) <= columns]
+    return max(matches, key=lambda name: len(DATASET_SCHEMAS[name]), default=None)
+
+def compact_frame(dataset_name, df, enabled=None):
+    """Apply the dtype policy to a known dataset (other datasets are returned unchanged)"""
+    enabled = DTYPE_CONFIG['enabled'] if enabled is None else enabled
+    schema = DATASET_SCHEMAS.get(dataset_name)
+    if not enabled or schema is None:
+        return df
+
+    float_dtype = np.dtype(DTYPE_CONFIG['float_dtype'])
+    columns = {}
+    for column, kind in schema.items():
+        if column not in df.columns:
+            continue
+        values = df[column]
+
+        if kind == 'float' and pd.api.types.is_numeric_dtype(values) and values.dtype != float_dtype:
+            columns[column] = values.astype(float_dtype)
+        elif kind == 'category':
+            categorical = to_categorical(values, CATEGORY_SETS.get(column, []))
+            if categorical is not None:
+                columns[column] = categorical
+
+    if not columns:
+        return df
+    return df.assign(**columns)
+
+def to_categorical(values, categories):
+    """Convert a text column to a Categorical over the fixed category set
+
+    Values outside the set are kept as extra categories rather than lost, with the
+    combined set re-sorted so codes still follow LabelEncoder ordering.
+    """
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        extra = set(values.cat.categories) - set(categories)
+        if not extra and list(values.cat.categories) == list(categories):
+            return None
+    elif pd.api.types.infer_dtype(values, skipna=True) not in ('string', 'empty'):
+        return None
+    else:
+        extra = set(pd.unique(values.dropna())) - set(categories)
+
+    if extra:
+        categories = sorted(set(categories) | extra)
+    return pd.Series(pd.Categorical(values, categories=categories), index=values.index, name=values.name)
+
+def concat_frames(chunks):
+    """Concatenate frames row-wise, merging categories that differ between them"""
+    if not chunks:
+        return pd.DataFrame()
+    if len(chunks) == 1:
+        return chunks[0].reset_index(drop=True)
+
+    columns = {}
+    for column in chunks[0].columns:
+        parts = [chunk[column] for chunk in chunks]
+        if all(isinstance(part.dtype, pd.CategoricalDtype) for part in parts):
+            columns[column] = pd.Series(union_categoricals(parts, sort_categories=True), name=column)
+        else:
+            columns[column] = pd.concat(parts, ignore_index=True)
+    return pd.DataFrame(columns)
+
+def memory_usage(df):
+    """Bytes held by a DataFrame, including string contents"""
+    return int(df.memory_usage(index=False, deep=True).sum())
+
+def wide_memory_usage(df):
+    """Bytes the same data would take as float64 and object-dtype strings"""
+    total = 0
+    for column in df.columns:
+        values = df[column]
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Each row would hold a pointer to its own string object
+            counts = np.bincount(values.cat.codes[values.cat.codes >= 0],
+                                 minlength=len(values.cat.categories))
+            string_sizes = np.array([sys.getsizeof(value) for value in values.cat.categories], dtype=np.int64)
+            total += WIDE_ITEM_BYTES * len(values) + int((counts * string_sizes).sum())
+        elif pd.api.types.is_float_dtype(values):
+            total += WIDE_ITEM_BYTES * len(values)
+        else:
+            total += int(values.memory_usage(index=False, deep=True))
+    return total
+
+def memory_report(data):
+    """Compact vs wide memory for each dataset"""
+    report = {}
+    for name, df in data.items():
+        compact = memory_usage(df)
+        wide = max(wide_memory_usage(df), compact)
+        report[name] = {'bytes': compact, 'wide_bytes': wide, 'saved_bytes': wide - compact}
+    return report
+
+def format_bytes(size):
+    """Human readable byte count"""
+    for unit in ('B', 'KB', 'MB', 'GB'):
+        if abs(size) < 1024 or unit == 'GB':
+            return f"{size:,.0f} {unit}" if unit == 'B' else f"{size:,.1f} {unit}"
+        size /= 1024
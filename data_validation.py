@@ -0,0 +1,354 @@
+# data_validation.py - Vectorized Row-Level Schema and Range Validation
+
+from functools import lru_cache
+import numpy as np
+import pandas as pd
+from config import VALIDATION_CONFIG, VALIDATION_RANGES, CATEGORY_SETS, STATE_DISTRICT_MAPPING
+from data_schema import DATASET_SCHEMAS
+
+# Column pairs whose combinations must appear in a reference mapping: dataset -> [(parent, child)]
+PAIR_RULES = {
+    'yield': [('state', 'district')]
+}
+
+# Target label column per dataset, checked against a label set only on request
+TARGET_COLUMNS = {
+    'crop_recommendation': 'label',
+    'fertilizer': 'fertilizer'
+}
+
+def is_warning_check(dataset_name, column, check, strict=None):
+    """Whether a failed check only warns: unknown feature categories and unmapped column pairs
+
+    Type, range and missing-value failures (and target labels checked on request) always
+    make a row invalid; the rest do too when VALIDATION_CONFIG['strict_categories'] is set.
+    """
+    strict = VALIDATION_CONFIG['strict_categories'] if strict is None else strict
+    if strict:
+        return False
+    if check == 'unknown_category':
+        return column != TARGET_COLUMNS.get(dataset_name)
+    return check.startswith('not_in_')
+
+class ColumnRule:
+    """Declared type, range and allowed categories of one column"""
+
+    def __init__(self, name, kind, minimum=None, maximum=None, categories=None):
+        self.name = name
+        self.kind = kind  # 'float' or 'category'
+        self.minimum = minimum
+        self.maximum = maximum
+        self.categories = categories
+
+    def masks(self, values):
+        """Boolean mask of offending rows for each check, computed on the whole column at once"""
+        if self.kind == 'float':
+            return self._numeric_masks(values)
+        return self._category_masks(values)
+
+    def _numeric_masks(self, values):
+        masks = {}
+        if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+            array = values.to_numpy(dtype=np.float64, na_value=np.nan)
+            masks['missing'] = np.isnan(array)
+        else:
+            array = pd.to_numeric(values, errors='coerce').to_numpy(dtype=np.float64, na_value=np.nan)
+            missing = values.isna().to_numpy()
+            masks['missing'] = missing
+            masks['not_numeric'] = np.isnan(array) & ~missing
+
+        # NaN compares False, so missing values only show up under 'missing'
+        if self.minimum is not None:
+            masks['below_min'] = array < self.minimum
+        if self.maximum is not None:
+            masks['above_max'] = array > self.maximum
+        return masks
+
+    def _category_masks(self, values):
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Check each category once, then look the answer up by code
+            codes = values.cat.codes.to_numpy()
+            missing = codes < 0
+            if self.categories is None:
+                return {'missing': missing}
+            allowed = np.append(values.cat.categories.isin(self.categories), True)
+            return {'missing': missing, 'unknown_category': ~allowed[codes]}
+
+        missing = values.isna().to_numpy()
+        if self.categories is None:
+            return {'missing': missing}
+        return {'missing': missing, 'unknown_category': ~values.isin(self.categories).to_numpy() & ~missing}
+
+    def describe(self):
+        if self.kind == 'category':
+            return f"one of {len(self.categories)} categories" if self.categories is not None else 'category'
+        low = '-inf' if self.minimum is None else self.minimum
+        high = 'inf' if self.maximum is None else self.maximum
+        return f"number in [{low}, {high}]"
+
+class ValidPairsIndex:
+    """Precomputed set of valid (parent, child) pairs, joined against columns through their codes"""
+
+    def __init__(self, parent, child, mapping):
+        self.parent = parent
+        self.child = child
+        pairs = [(key, value) for key, values in mapping.items() for value in values]
+        self.parents = pd.Index(sorted({key for key, _ in pairs}))
+        self.children = pd.Index(sorted({value for _, value in pairs}))
+        self.valid = np.zeros((len(self.parents), len(self.children)), dtype=bool)
+        for key, value in pairs:
+            self.valid[self.parents.get_loc(key), self.children.get_loc(value)] = True
+
+    def mismatch_mask(self, parents, children):
+        """Rows whose pair is not in the index (rows with a missing value are left to the column checks)"""
+        return self._match(parents, children)[0]
+
+    def mismatched_pairs(self, parents, children):
+        """Mismatched pairs with the number of rows holding each, most frequent first"""
+        bad, parent_codes, parent_labels, child_codes, child_labels = self._match(parents, children)
+        pair_ids = parent_codes[bad].astype(np.int64) * len(child_labels) + child_codes[bad]
+        counts = np.bincount(pair_ids, minlength=len(parent_labels) * len(child_labels))
+        found = np.flatnonzero(counts)
+        mismatches = pd.DataFrame({
+            self.parent: np.asarray(parent_labels, dtype=object)[found // len(child_labels)],
+            self.child: np.asarray(child_labels, dtype=object)[found % len(child_labels)],
+            'rows': counts[found]
+        })
+        return mismatches.sort_values('rows', ascending=False, kind='stable').reset_index(drop=True)
+
+    def _match(self, parents, children):
+        """Mask of mismatched rows, plus the codes and labels of both columns"""
+        parent_codes, parent_labels = _codes(parents)
+        child_codes, child_labels = _codes(children)
+        # Join the distinct labels against the index once, then look rows up by code
+        table = self._lookup(parent_labels, child_labels)
+        present = (parent_codes >= 0) & (child_codes >= 0)
+        bad = np.zeros(len(parent_codes), dtype=bool)
+        bad[present] = ~table[parent_codes[present], child_codes[present]]
+        return bad, parent_codes, parent_labels, child_codes, child_labels
+
+    def _lookup(self, parent_labels, child_labels):
+        """Validity of every (parent label, child label) combination seen in the data"""
+        parent_pos = self.parents.get_indexer(parent_labels)
+        child_pos = self.children.get_indexer(child_labels)
+        table = np.zeros((len(parent_labels), len(child_labels)), dtype=bool)
+        known_parents = np.flatnonzero(parent_pos >= 0)
+        known_children = np.flatnonzero(child_pos >= 0)
+        table[np.ix_(known_parents, known_children)] = \
+            self.valid[np.ix_(parent_pos[known_parents], child_pos[known_children])]
+        return table
+
+def _codes(values):
+    """Integer codes (-1 for missing) and the labels they point to"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        return values.cat.codes.to_numpy(), values.cat.categories
+    codes, labels = pd.factorize(values)
+    return codes, labels
+
+@lru_cache(maxsize=None)
+def state_district_index():
+    """Valid state/district pairs from STATE_DISTRICT_MAPPING, built once"""
+    return ValidPairsIndex('state', 'district', STATE_DISTRICT_MAPPING)
+
+PAIR_INDEXES = {
+    ('state', 'district'): state_district_index
+}
+
+def check_referential_integrity(dataset_name, df):
+    """Mismatched pairs with row counts for every pair rule of a dataset
+
+    Returns {(parent, child): DataFrame of mismatched pairs}; empty frames mean all pairs are valid.
+    """
+    results = {}
+    for parent, child in PAIR_RULES.get(dataset_name, []):
+        if parent in df.columns and child in df.columns:
+            index = PAIR_INDEXES[(parent, child)]()
+            results[(parent, child)] = index.mismatched_pairs(df[parent], df[child])
+    return results
+
+def describe_integrity(results, max_pairs=5):
+    """Short text listing the most frequent mismatched pairs"""
+    lines = []
+    for (parent, child), mismatches in results.items():
+        if mismatches.empty:
+            continue
+        total = int(mismatches['rows'].sum())
+        pairs = ', '.join(f"{row[parent]}/{row[child]} ({row['rows']:,})"
+                          for _, row in mismatches.head(max_pairs).iterrows())
+        lines.append(f"{total:,} rows with a {child} outside its {parent}: {pairs}")
+    return '\n'.join(lines)
+
+def build_row_schema(dataset_name, known_labels=None):
+    """Column rules for a dataset, from the dtype schema, VALIDATION_RANGES and CATEGORY_SETS
+
+    The target column is only checked against known_labels (e.g. the trained classes) when
+    given, or against CATEGORY_SETS when VALIDATION_CONFIG['check_target_labels'] is set.
+    Feature categories outside CATEGORY_SETS only warn (see is_warning_check).
+    """
+    if dataset_name not in DATASET_SCHEMAS:
+        raise ValueError(f"No validation schema for dataset '{dataset_name}'")
+
+    ranges = VALIDATION_RANGES.get(dataset_name, {})
+    target = TARGET_COLUMNS.get(dataset_name)
+    rules = {}
+    for column, kind in DATASET_SCHEMAS[dataset_name].items():
+        minimum, maximum = ranges.get(column, (None, None))
+        categories = CATEGORY_SETS.get(column) if kind == 'category' else None
+        if column == target:
+            if known_labels is not None:
+                categories = sorted(known_labels)
+            elif not VALIDATION_CONFIG['check_target_labels']:
+                categories = None
+        rules[column] = ColumnRule(column, kind, minimum, maximum, categories)
+    return rules
+
+class ValidationReport:
+    """Per-check counts and the positions of offending rows"""
+
+    def __init__(self, dataset_name, version=None):
+        self.dataset_name = dataset_name
+        self.version = version
+        self.rows_checked = 0
+        self.missing_columns = []
+        self.rule_counts = {}  # 'column:check' -> offending rows
+        self.warning_counts = {}  # 'column:check' -> rows flagged by checks that only warn
+        self.examples = {}  # 'column:check' -> [(row, value), ...]
+        self._bad_rows = []
+
+    @property
+    def bad_rows(self):
+        """Sorted row positions (0-based) that failed any check"""
+        if not self._bad_rows:
+            return np.empty(0, dtype=np.int64)
+        if len(self._bad_rows) > 1:
+            self._bad_rows = [np.concatenate(self._bad_rows)]
+        return self._bad_rows[0]
+
+    @property
+    def bad_row_count(self):
+        return int(sum(len(rows) for rows in self._bad_rows))
+
+    @property
+    def valid(self):
+        return not self.missing_columns and not self.bad_row_count
+
+    def add_chunk(self, chunk, start, masks, strict=None):
+        """Fold in the masks of one chunk of rows starting at position start
+
+        Returns the mask of invalid rows in the chunk (warnings leave rows valid).
+        """
+        bad = np.zeros(len(chunk), dtype=bool)
+        max_examples = VALIDATION_CONFIG['max_examples']
+        for (column, check), mask in masks.items():
+            count = int(np.count_nonzero(mask))
+            if not count:
+                continue
+            key = f"{column}:{check}"
+            if is_warning_check(self.dataset_name, column, check, strict):
+                self.warning_counts[key] = self.warning_counts.get(key, 0) + count
+            else:
+                self.rule_counts[key] = self.rule_counts.get(key, 0) + count
+                bad |= mask
+
+            examples = self.examples.setdefault(key, [])
+            if len(examples) < max_examples:
+                rows = np.flatnonzero(mask)[:max_examples - len(examples)]
+                values = chunk[column].iloc[rows].tolist()
+                examples.extend((int(start + row), value) for row, value in zip(rows, values))
+
+        self._bad_rows.append(np.flatnonzero(bad).astype(np.int64) + start)
+        self.rows_checked += len(chunk)
+        return bad
+
+    def summary(self, max_rules=5):
+        """Short text description of the problems found"""
+        parts = []
+        if self.valid:
+            parts.append(f"All {self.rows_checked:,} rows passed validation")
+        if self.missing_columns:
+            parts.append(f"missing columns {self.missing_columns}")
+        if self.bad_row_count:
+            parts.append(f"{self.bad_row_count:,} of {self.rows_checked:,} rows invalid: "
+                         f"{_worst_checks(self.rule_counts, max_rules)}")
+        if self.warning_counts:
+            parts.append(f"warnings: {_worst_checks(self.warning_counts, max_rules)}")
+        return '; '.join(parts)
+
+    def to_dict(self):
+        """Compact report for display and export"""
+        return {
+            'dataset': self.dataset_name,
+            'rows_checked': self.rows_checked,
+            'bad_rows': self.bad_row_count,
+            'missing_columns': list(self.missing_columns),
+            'rule_counts': dict(self.rule_counts),
+            'warning_counts': dict(self.warning_counts),
+            'examples': {key: list(examples) for key, examples in self.examples.items()}
+        }
+
+def _worst_checks(counts, max_rules):
+    """The most frequent checks with their row counts, as text"""
+    worst = sorted(counts.items(), key=lambda item: -item[1])[:max_rules]
+    return ', '.join(f"{key} ({count:,})" for key, count in worst)
+
+def check_chunk(rules, chunk, pairs=()):
+    """Offending-row masks of every rule and column pair for one chunk, keyed by (column, check)"""
+    masks = {}
+    for column, rule in rules.items():
+        if column in chunk.columns:
+            for check, mask in rule.masks(chunk[column]).items():
+                masks[(column, check)] = mask
+    for parent, child in pairs:
+        if parent in chunk.columns and child in chunk.columns:
+            index = PAIR_INDEXES[(parent, child)]()
+            masks[(child, f"not_in_{parent}")] = index.mismatch_mask(chunk[parent], chunk[child])
+    return masks
+
+def validate_frame(dataset_name, df, chunk_rows=None, version=None, known_labels=None, strict=None):
+    """Validate every row of a DataFrame, a chunk of rows at a time"""
+    chunk_rows = chunk_rows or VALIDATION_CONFIG['chunk_rows']
+    rules = build_row_schema(dataset_name, known_labels)
+    report = ValidationReport(dataset_name, version)
+    report.missing_columns = [column for column in rules if column not in df.columns]
+
+    for start in range(0, len(df), chunk_rows):
+        chunk = df.iloc[start:start + chunk_rows]
+        report.add_chunk(chunk, start, check_chunk(rules, chunk, PAIR_RULES.get(dataset_name, ())), strict)
+    return report
+
+def split_invalid_rows(df, report):
+    """Split a validated DataFrame into clean rows and quarantined rows
+
+    Quarantined rows keep their original positions as the index.
+    """
+    bad = np.zeros(len(df), dtype=bool)
+    bad[report.bad_rows] = True
+    clean = df[~bad].reset_index(drop=True)
+    quarantined = df[bad].set_axis(report.bad_rows)
+    quarantined.index.name = 'row'
+    return clean, quarantined
+
+def validate_csv(file_path, dataset_name, clean_path=None, quarantine_path=None, chunk_rows=None,
+                 known_labels=None, strict=None):
+    """Validate a CSV file too large for memory, streaming clean and offending rows to separate files"""
+    from csv_ingest import infer_column_dtypes
+
+    chunk_rows = chunk_rows or VALIDATION_CONFIG['chunk_rows']
+    rules = build_row_schema(dataset_name, known_labels)
+    report = ValidationReport(dataset_name)
+    dtypes = infer_column_dtypes(file_path, dataset_name)
+
+    start = 0
+    for chunk in pd.read_csv(file_path, dtype=dtypes, chunksize=chunk_rows):
+        if start == 0:
+            report.missing_columns = [column for column in rules if column not in chunk.columns]
+        masks = check_chunk(rules, chunk, PAIR_RULES.get(dataset_name, ()))
+        bad = report.add_chunk(chunk, start, masks, strict)
+        if clean_path:
+            chunk[~bad].to_csv(clean_path, mode='w' if start == 0 else 'a', header=start == 0, index=False)
+        if quarantine_path:
+            quarantined = chunk[bad].set_axis(np.flatnonzero(bad) + start)
+            quarantined.index.name = 'row'
+            quarantined.to_csv(quarantine_path, mode='w' if start == 0 else 'a', header=start == 0)
+        start += len(chunk)
+    return report
@@ -0,0 +1,169 @@
+# dataset_store.py - Columnar, Memory-Mapped Dataset Store
+
+import os
+import json
+import shutil
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from config import STORE_CONFIG
+from model_registry import dataset_fingerprint
+
+MANIFEST_FILE = 'manifest.json'
+FEATHER_FILE = 'data.feather'
+STORE_FORMATS = ('auto', 'feather', 'npy')
+
+def resolve_store_format(fmt=None):
+    """Pick the storage format, using Feather only when pyarrow is installed"""
+    fmt = fmt or STORE_CONFIG['format']
+    if fmt not in STORE_FORMATS:
+        raise ValueError(f"Unknown store format: {fmt}")
+
+    try:
+        import pyarrow.feather  # noqa: F401
+        has_pyarrow = True
+    except ImportError:
+        has_pyarrow = False
+
+    if fmt == 'auto':
+        return 'feather' if has_pyarrow else 'npy'
+    if fmt == 'feather' and not has_pyarrow:
+        raise ValueError("Feather storage needs pyarrow (pip install pyarrow)")
+    return fmt
+
+class DatasetStore:
+    """Stores each dataset as uncompressed columns that reopen through memory mapping"""
+
+    def __init__(self, root_dir=None, fmt=None):
+        self.root_dir = root_dir or STORE_CONFIG['root_dir']
+        self.format = resolve_store_format(fmt)
+        os.makedirs(self.root_dir, exist_ok=True)
+
+    def load_manifest(self):
+        """Datasets in the store with their content hashes and column layouts"""
+        manifest_path = os.path.join(self.root_dir, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            return {'datasets': {}}
+        with open(manifest_path) as f:
+            return json.load(f)
+
+    def list_datasets(self):
+        """Names of the stored datasets"""
+        return sorted(self.load_manifest()['datasets'])
+
+    def save_all(self, data):
+        """Write every dataset whose content changed since the last save
+
+        Returns the names of the datasets written and of those skipped as unchanged.
+        """
+        manifest = self.load_manifest()
+        written, skipped = [], []
+
+        for name, df in data.items():
+            content_hash = dataset_fingerprint(df)
+            entry = manifest['datasets'].get(name)
+            if entry and entry['hash'] == content_hash and \
+                    os.path.isdir(os.path.join(self.root_dir, entry['path'])):
+                skipped.append(name)
+                continue
+
+            manifest['datasets'][name] = self._write_dataset(name, df, content_hash)
+            written.append(name)
+
+            # Point the manifest at the new files before removing the old ones
+            self._write_manifest(manifest)
+            if entry and entry['path'] != manifest['datasets'][name]['path']:
+                shutil.rmtree(os.path.join(self.root_dir, entry['path']), ignore_errors=True)
+
+        return {'written': written, 'skipped': skipped}
+
+    def load(self, name):
+        """Open one dataset, memory-mapping its columns"""
+        entry = self.load_manifest()['datasets'].get(name)
+        if entry is None:
+            raise ValueError(f"Dataset '{name}' not in store '{self.root_dir}'")
+
+        dataset_dir = os.path.join(self.root_dir, entry['path'])
+        if entry['format'] == 'feather':
+            import pyarrow.feather as feather
+            table = feather.read_table(os.path.join(dataset_dir, FEATHER_FILE), memory_map=True)
+            # One block per column, so numeric columns without missing values stay views of the
+            # mapped file instead of being copied and consolidated onto the heap
+            return table.to_pandas(split_blocks=True, self_destruct=True)
+
+        columns = {}
+        for column in entry['columns']:
+            values = np.load(os.path.join(dataset_dir, column['file']), mmap_mode='r', allow_pickle=False)
+            if column['kind'] == 'category':
+                columns[column['name']] = pd.Categorical.from_codes(
+                    values, categories=pd.Index(column['categories'], dtype=column['categories_dtype']),
+                    ordered=column['ordered'], validate=False
+                )
+            elif column['kind'] == 'text':
+                uniques = np.array(column['categories'] + [None], dtype=object)
+                columns[column['name']] = uniques[values]
+            else:
+                columns[column['name']] = values
+        return pd.DataFrame(columns, columns=[column['name'] for column in entry['columns']], copy=False)
+
+    def load_all(self):
+        """Open every stored dataset"""
+        return {name: self.load(name) for name in self.list_datasets()}
+
+    def _write_dataset(self, name, df, content_hash):
+        """Write one dataset into a new directory named after its content hash"""
+        path = f"{name}-{content_hash[:12]}"
+        dataset_dir = os.path.join(self.root_dir, path)
+        staging_dir = f"{dataset_dir}.tmp"
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        os.makedirs(staging_dir)
+
+        if self.format == 'feather':
+            # Uncompressed so the file can be memory-mapped without decoding
+            df.reset_index(drop=True).to_feather(os.path.join(staging_dir, FEATHER_FILE),
+                                                 compression='uncompressed')
+            columns = [{'name': str(column), 'dtype': str(dtype)} for column, dtype in df.dtypes.items()]
+        else:
+            columns = [self._write_column(staging_dir, index, column, df[column])
+                       for index, column in enumerate(df.columns)]
+
+        shutil.rmtree(dataset_dir, ignore_errors=True)
+        os.rename(staging_dir, dataset_dir)
+        return {
+            'hash': content_hash,
+            'path': path,
+            'format': self.format,
+            'rows': len(df),
+            'columns': columns,
+            'saved': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+    def _write_column(self, dataset_dir, index, name, values):
+        """Write one column as a .npy array (categories and text as codes)"""
+        file_name = f"{index:03d}.npy"
+        column = {'name': str(name), 'file': file_name, 'dtype': str(values.dtype)}
+
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            categories = values.cat.categories
+            array = values.cat.codes.to_numpy()
+            column.update(kind='category', categories=categories.tolist(),
+                          categories_dtype=str(categories.dtype), ordered=bool(values.cat.ordered))
+        elif isinstance(values.dtype, np.dtype) and values.dtype.kind in 'biufcmM':
+            array = values.to_numpy()
+            column['kind'] = 'array'
+        else:
+            # Strings and other objects: codes into the distinct values, -1 for missing
+            codes, uniques = pd.factorize(values)
+            array = codes.astype(np.int32)
+            column.update(kind='text', categories=[str(value) for value in uniques])
+
+        np.save(os.path.join(dataset_dir, file_name), np.ascontiguousarray(array), allow_pickle=False)
+        return column
+
+    def _write_manifest(self, manifest):
+        """Replace the manifest atomically"""
+        manifest_path = os.path.join(self.root_dir, MANIFEST_FILE)
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
@@ -0,0 +1,130 @@
+# directory_ingest.py - Concurrent Directory Ingestion with Deduplication
+
+import os
+import glob
+import json
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from config import INGEST_CONFIG
+from corpus_builder import file_checksum
+from csv_ingest import CsvIngestJob
+from data_schema import DATASET_SCHEMAS, match_dataset, concat_frames
+
+class IngestLedger:
+    """Checksums of the files already ingested, so a file is only read once"""
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path) as f:
+                self.entries = json.load(f)
+
+    def __contains__(self, checksum):
+        return checksum in self.entries
+
+    def record(self, checksum, file_name, dataset_name, rows):
+        self.entries[checksum] = {
+            'file': file_name,
+            'dataset': dataset_name,
+            'rows': rows,
+            'ingested': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+
+    def save(self):
+        """Replace the ledger file atomically"""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w') as f:
+            json.dump(self.entries, f, indent=2)
+        os.replace(tmp_path, self.path)
+
+def row_hashes(df):
+    """64-bit hash of each row's values (categories hash by value, not by code)"""
+    return pd.util.hash_pandas_object(df, index=False).to_numpy()
+
+def deduplicate(df, existing_hashes=None):
+    """Drop repeated rows, and rows whose hash is already in existing_hashes
+
+    Returns the remaining rows and the number dropped.
+    """
+    hashes = row_hashes(df)
+    keep = ~pd.Index(hashes).duplicated()
+    if existing_hashes is not None and len(existing_hashes):
+        keep &= ~np.isin(hashes, existing_hashes)
+    dropped = int(len(df) - keep.sum())
+    if not dropped:
+        return df, 0
+    return df[keep].reset_index(drop=True), dropped
+
+def read_routed_file(file_path):
+    """Read one CSV, routed to a dataset by its columns (runs on a pool thread)"""
+    columns = pd.read_csv(file_path, nrows=0).columns
+    dataset_name = match_dataset(columns)
+    if dataset_name is None:
+        return None, None
+    job = CsvIngestJob(file_path, dataset_name)
+    job.run()
+    return dataset_name, job.wait()
+
+def ingest_directory(directory, existing=None, pattern=None, workers=None, ledger_path=None):
+    """Read every new CSV in a directory concurrently and merge the rows per dataset
+
+    Files already in the ledger (by checksum) are skipped, and rows repeated within the
+    new files or already in existing ({name: DataFrame}) are dropped. Ledger entries are
+    recorded for the files read; call result['ledger'].save() once the rows are kept.
+    """
+    pattern = pattern or INGEST_CONFIG['file_pattern']
+    workers = workers or INGEST_CONFIG['directory_workers']
+    ledger = IngestLedger(ledger_path or os.path.join(directory, INGEST_CONFIG['ledger_file']))
+    existing = existing or {}
+
+    result = {'data': {}, 'files': [], 'skipped': [], 'unrecognized': [], 'errors': [],
+              'duplicates': {}, 'ledger': ledger}
+
+    # Skip files ingested before, and copies of the same file within this batch
+    new_files, checksums, new_checksums = [], {}, set()
+    for file_path in sorted(glob.glob(os.path.join(directory, pattern))):
+        checksum = file_checksum(file_path)
+        if checksum in ledger or checksum in new_checksums:
+            result['skipped'].append(os.path.basename(file_path))
+            continue
+        new_files.append(file_path)
+        checksums[file_path] = checksum
+        new_checksums.add(checksum)
+
+    chunks = {}
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(read_routed_file, file_path) for file_path in new_files]
+        for file_path, future in zip(new_files, futures):
+            file_name = os.path.basename(file_path)
+            try:
+                dataset_name, df = future.result()
+            except Exception as e:
+                result['errors'].append((file_name, str(e)))
+                continue
+            if dataset_name is None:
+                result['unrecognized'].append(file_name)
+                continue
+            chunks.setdefault(dataset_name, []).append(df)
+            ledger.record(checksums[file_path], file_name, dataset_name, len(df))
+            result['files'].append({'file': file_name, 'dataset': dataset_name, 'rows': len(df)})
+
+    for dataset_name, frames in chunks.items():
+        combined = concat_frames(_align_columns(dataset_name, frames))
+        current = existing.get(dataset_name)
+        existing_hashes = None
+        if current is not None and set(current.columns) == set(combined.columns):
+            # Same column order as the existing rows, so equal rows hash equally
+            combined = combined[list(current.columns)]
+            existing_hashes = row_hashes(current)
+        result['data'][dataset_name], result['duplicates'][dataset_name] = deduplicate(combined, existing_hashes)
+    return result
+
+def _align_columns(dataset_name, frames):
+    """Put every file's columns in one order, keeping only the schema columns if the files differ"""
+    columns = list(frames[0].columns)
+    if any(set(frame.columns) != set(columns) for frame in frames):
+        columns = list(DATASET_SCHEMAS[dataset_name])
+    return [frame if list(frame.columns) == columns else frame[columns] for frame in frames]
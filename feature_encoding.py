@@ -0,0 +1,111 @@
+# feature_encoding.py - Precomputed Categorical Encoding Tables
+
+import difflib
+import numpy as np
+import pandas as pd
+
+UNSEEN_POLICIES = ('error', 'fallback', 'nearest')
+
+class CategoryEncoding:
+    """Category -> code lookup for one column, with the same codes as its LabelEncoder"""
+
+    def __init__(self, classes, fallback_code=0):
+        self.classes = np.asarray(classes)
+        self.codes = {value: code for code, value in enumerate(self.classes.tolist())}
+        self.labels = [str(value) for value in self.classes.tolist()]
+        self.fallback_code = int(fallback_code)
+        self.nearest_codes = {}
+        self.unseen_count = 0
+
+    @classmethod
+    def from_label_encoder(cls, encoder, training_codes=None):
+        """Build from a fitted LabelEncoder, falling back to the most frequent category"""
+        fallback_code = 0
+        if training_codes is not None and len(training_codes):
+            fallback_code = int(np.bincount(np.asarray(training_codes)).argmax())
+        return cls(encoder.classes_, fallback_code)
+
+    def encode(self, value, policy='error', column=''):
+        """Encode a single value"""
+        code = self.codes.get(value)
+        if code is None:
+            code = self._resolve_unseen(value, policy, column)
+            self.unseen_count += 1
+        return code
+
+    def encode_column(self, values, policy='error', column=''):
+        """Encode a whole column at once"""
+        if isinstance(getattr(values, 'dtype', None), pd.CategoricalDtype) and \
+                list(values.cat.categories) == self.labels:
+            # Compact columns over the training categories already hold the right codes
+            codes = values.cat.codes.to_numpy(dtype=np.int64)
+        else:
+            # -1 marks values outside the training categories (and missing values)
+            codes = pd.Index(self.classes).get_indexer(np.asarray(values, dtype=object)).astype(np.int64)
+
+        unseen = np.flatnonzero(codes == -1)
+        if len(unseen):
+            values = np.asarray(values, dtype=object)
+            # Resolve each distinct unseen value once; factorize marks missing values
+            # as -1, which picks the extra last slot
+            value_ids, unseen_values = pd.factorize(values[unseen])
+            resolved = np.array(
+                [self._resolve_unseen(value, policy, column) for value in unseen_values] +
+                [self._resolve_unseen(None, policy, column) if (value_ids == -1).any() else self.fallback_code],
+                dtype=np.int64
+            )
+            codes[unseen] = resolved[value_ids]
+            self.unseen_count += len(unseen)
+        return codes
+
+    def _resolve_unseen(self, value, policy, column):
+        """Map a category that was not seen during training to a code"""
+        if policy == 'error':
+            raise ValueError(f"Unseen category '{value}' for {column or 'column'}")
+
+        if policy == 'nearest' and value is not None:
+            if value not in self.nearest_codes:
+                matches = difflib.get_close_matches(str(value), self.labels, n=1, cutoff=0.0)
+                self.nearest_codes[value] = self.labels.index(matches[0]) if matches else self.fallback_code
+            return self.nearest_codes[value]
+        return self.fallback_code
+
+class EncodingTable:
+    """Encodings for every categorical column, built once at training time"""
+
+    def __init__(self, policy='fallback'):
+        if policy not in UNSEEN_POLICIES:
+            raise ValueError(f"Unknown unseen category policy: {policy}")
+        self.policy = policy
+        self.columns = {}
+
+    def add(self, name, encoding):
+        """Register the encoding for a column"""
+        self.columns[name] = encoding
+
+    def update(self, other):
+        """Merge the columns of another table"""
+        self.columns.update(other.columns)
+
+    def __contains__(self, name):
+        return name in self.columns
+
+    def encode(self, name, value):
+        """Encode one value of a column"""
+        return self.columns[name].encode(value, self.policy, name)
+
+    def encode_column(self, name, values):
+        """Encode a column of values"""
+        return self.columns[name].encode_column(values, self.policy, name)
+
+    def unseen_counts(self):
+        """Number of unseen categories handled per column"""
+        return {name: encoding.unseen_count for name, encoding in self.columns.items()}
+
+    @classmethod
+    def from_encoders(cls, encoders, policy='fallback'):
+        """Rebuild a table from fitted LabelEncoders when no training counts are available"""
+        table = cls(policy)
+        for name, encoder in encoders.items():
+            table.add(name, CategoryEncoding.from_label_encoder(encoder))
+        return table
@@ -0,0 +1,221 @@
+# forest_inference.py - Flattened NumPy Random Forest Inference
+
+import time
+import numpy as np
+import sklearn
+
+# sklearn < 1.4 stores class counts in the leaves and normalizes them at predict time
+_SKLEARN_VERSION = tuple(int(part) for part in sklearn.__version__.split('.')[:2] if part.isdigit())
+_NORMALIZE_LEAF_COUNTS = _SKLEARN_VERSION < (1, 4)
+
+# Rows evaluated per traversal pass, bounds the (rows x trees) node index matrix
+DEFAULT_CHUNK_SIZE = 8192
+
+class FlatForest:
+    """Random forest flattened into node arrays and evaluated with NumPy.
+
+    All trees are concatenated into one set of arrays (feature, threshold,
+    left, right, value) and every (sample, tree) pair is advanced one level
+    per step. Inputs are cast to float32 and per-tree outputs are summed in
+    tree order, which reproduces sklearn's results bit for bit.
+    """
+
+    def __init__(self, feature, threshold, left, right, missing_left, values,
+                 roots, max_depth, n_features, classes=None, feature_names=None, source=None):
+        self.feature = feature
+        self.threshold = threshold
+        self.left = left
+        self.right = right
+        self.missing_left = missing_left
+        self.values = values
+        self.roots = roots
+        self.max_depth = max_depth
+        self.n_features_in_ = n_features
+        self.classes_ = classes
+        self.feature_names_in_ = feature_names
+        self.source = source
+
+    @classmethod
+    def from_sklearn(cls, model):
+        """Export a fitted RandomForestClassifier/RandomForestRegressor"""
+        if not hasattr(model, 'estimators_'):
+            raise ValueError("Model must be a fitted random forest")
+        if getattr(model, 'n_outputs_', 1) != 1:
+            raise ValueError("Only single-output forests can be flattened")
+
+        is_classifier = hasattr(model, 'classes_')
+        n_classes = len(model.classes_) if is_classifier else 1
+
+        features, thresholds, lefts, rights, missing, values, roots = [], [], [], [], [], [], []
+        offset = 0
+        max_depth = 0
+
+        for estimator in model.estimators_:
+            tree = estimator.tree_
+            node_ids = np.arange(tree.node_count)
+            is_leaf = tree.children_left == -1
+
+            # Leaves loop back to themselves so extra traversal steps are no-ops
+            left = np.where(is_leaf, node_ids, tree.children_left) + offset
+            right = np.where(is_leaf, node_ids, tree.children_right) + offset
+
+            features.append(np.where(is_leaf, 0, tree.feature))
+            thresholds.append(tree.threshold)
+            lefts.append(left)
+            rights.append(right)
+            if hasattr(tree, 'missing_go_to_left'):
+                missing.append(np.asarray(tree.missing_go_to_left, dtype=bool))
+            else:
+                missing.append(np.zeros(tree.node_count, dtype=bool))
+
+            if is_classifier:
+                values.append(_leaf_probabilities(tree.value, n_classes))
+            else:
+                values.append(tree.value[:, 0, 0].copy())
+
+            roots.append(offset)
+            offset += tree.node_count
+            max_depth = max(max_depth, tree.max_depth)
+
+        return cls(
+            feature=np.concatenate(features).astype(np.intp),
+            threshold=np.concatenate(thresholds).astype(np.float64),
+            left=np.concatenate(lefts).astype(np.intp),
+            right=np.concatenate(rights).astype(np.intp),
+            missing_left=np.concatenate(missing),
+            values=np.concatenate(values),
+            roots=np.asarray(roots, dtype=np.intp),
+            max_depth=max_depth,
+            n_features=model.n_features_in_,
+            classes=model.classes_ if is_classifier else None,
+            feature_names=getattr(model, 'feature_names_in_', None),
+            source=model
+        )
+
+    @property
+    def n_trees(self):
+        """Number of trees in the forest"""
+        return len(self.roots)
+
+    def apply(self, X, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Return the global leaf index reached in each tree, shape (n_samples, n_trees)"""
+        X = self._validate(X)
+        leaves = np.empty((len(X), self.n_trees), dtype=np.intp)
+        for start, chunk in self._chunks(X, chunk_size):
+            leaves[start:start + len(chunk)] = self._apply_chunk(chunk)
+        return leaves
+
+    def predict_proba(self, X, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Predict class probabilities, identical to sklearn's predict_proba"""
+        if self.classes_ is None:
+            raise ValueError("predict_proba is only available for classifiers")
+        X = self._validate(X)
+
+        proba = np.zeros((len(X), len(self.classes_)), dtype=np.float64)
+        for start, chunk in self._chunks(X, chunk_size):
+            leaves = self._apply_chunk(chunk)
+            out = proba[start:start + len(chunk)]
+            for tree_index in range(self.n_trees):
+                out += self.values[leaves[:, tree_index]]
+        proba /= self.n_trees
+        return proba
+
+    def predict(self, X, chunk_size=DEFAULT_CHUNK_SIZE):
+        """Predict labels (classifier) or values (regressor)"""
+        if self.classes_ is not None:
+            return self.classes_.take(np.argmax(self.predict_proba(X, chunk_size), axis=1), axis=0)
+
+        X = self._validate(X)
+        y_hat = np.zeros(len(X), dtype=np.float64)
+        for start, chunk in self._chunks(X, chunk_size):
+            leaves = self._apply_chunk(chunk)
+            out = y_hat[start:start + len(chunk)]
+            for tree_index in range(self.n_trees):
+                out += self.values[leaves[:, tree_index]]
+        y_hat /= self.n_trees
+        return y_hat
+
+    def _validate(self, X):
+        """Convert inputs to a C-contiguous float32 matrix like sklearn does"""
+        if hasattr(X, 'columns') and self.feature_names_in_ is not None:
+            X = X[list(self.feature_names_in_)]
+        X = np.ascontiguousarray(X, dtype=np.float32)
+        if X.ndim != 2 or X.shape[1] != self.n_features_in_:
+            raise ValueError(
+                f"Expected input of shape (n_samples, {self.n_features_in_}), got {X.shape}"
+            )
+        return X
+
+    def _chunks(self, X, chunk_size):
+        """Split rows into traversal chunks, yielding (start_row, chunk)"""
+        for start in range(0, len(X), chunk_size):
+            yield start, X[start:start + chunk_size]
+
+    def _apply_chunk(self, X):
+        """Advance every (sample, tree) pair to its leaf in lockstep"""
+        n_samples, n_features = X.shape
+        nodes = np.tile(self.roots, n_samples)
+        row_offsets = np.repeat(np.arange(n_samples) * n_features, self.n_trees)
+        X_flat = X.ravel()
+
+        # Pairs that reached a leaf drop out of the active set
+        active = np.arange(len(nodes))
+        for _ in range(self.max_depth):
+            current = nodes[active]
+            internal = self.left[current] != current
+            if not internal.all():
+                active = active[internal]
+                current = current[internal]
+                if len(active) == 0:
+                    break
+
+            x = X_flat[row_offsets[active] + self.feature[current]]
+            go_left = x <= self.threshold[current]
+            is_missing = np.isnan(x)
+            if is_missing.any():
+                go_left = np.where(is_missing, self.missing_left[current], go_left)
+            nodes[active] = np.where(go_left, self.left[current], self.right[current])
+
+        return nodes.reshape(n_samples, self.n_trees)
+
+def _leaf_probabilities(tree_value, n_classes):
+    """Per-node class probabilities as the tree's predict_proba returns them"""
+    proba = np.array(tree_value[:, 0, :n_classes], dtype=np.float64)
+    if _NORMALIZE_LEAF_COUNTS:
+        normalizer = proba.sum(axis=1)[:, np.newaxis]
+        normalizer[normalizer == 0.0] = 1.0
+        proba /= normalizer
+    return proba
+
+def benchmark_inference(model, X, repeats=20, flat_model=None):
+    """Compare sklearn and flattened inference latency on the same inputs"""
+    flat_model = flat_model or FlatForest.from_sklearn(model)
+    X = np.asarray(X)
+    is_classifier = hasattr(model, 'classes_')
+
+    def sklearn_call(rows):
+        return model.predict_proba(rows) if is_classifier else model.predict(rows)
+
+    def flat_call(rows):
+        return flat_model.predict_proba(rows) if is_classifier else flat_model.predict(rows)
+
+    def time_call(func, rows):
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            func(rows)
+            timings.append(time.perf_counter() - start)
+        return float(np.median(timings)) * 1000
+
+    single_row = X[:1]
+    results = {
+        'single_row_sklearn_ms': time_call(sklearn_call, single_row),
+        'single_row_flat_ms': time_call(flat_call, single_row),
+        'batch_rows': len(X),
+        'batch_sklearn_ms': time_call(sklearn_call, X),
+        'batch_flat_ms': time_call(flat_call, X),
+        'identical': bool(np.array_equal(sklearn_call(X), flat_call(X)))
+    }
+    results['single_row_speedup'] = results['single_row_sklearn_ms'] / max(results['single_row_flat_ms'], 1e-9)
+    results['batch_speedup'] = results['batch_sklearn_ms'] / max(results['batch_flat_ms'], 1e-9)
+    return results
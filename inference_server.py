@@ -0,0 +1,304 @@
+# inference_server.py - Local Asyncio HTTP Inference Service with Micro-Batching
+
+import asyncio
+import json
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http import HTTPStatus
+import pandas as pd
+from config import SERVER_CONFIG, CROP_INPUT_FIELDS, FERTILIZER_DROPDOWN_FIELDS, FERTILIZER_NUMERIC_FIELDS
+from config import YIELD_DROPDOWN_FIELDS, YIELD_NUMERIC_FIELDS
+
+# Request fields per task, in the column order the models were trained on
+TASK_FIELDS = {
+    'crop': [key for _, key in CROP_INPUT_FIELDS],
+    'fertilizer': ['temperature', 'humidity', 'moisture', 'soil_type', 'crop_type',
+                   'nitrogen', 'phosphorous', 'potassium'],
+    'yield': ['state', 'district', 'season', 'crop', 'area', 'production']
+}
+
+CATEGORICAL_FIELDS = {key for _, key, _ in FERTILIZER_DROPDOWN_FIELDS + YIELD_DROPDOWN_FIELDS}
+NUMERIC_FIELDS = {key for _, key in CROP_INPUT_FIELDS + FERTILIZER_NUMERIC_FIELDS + YIELD_NUMERIC_FIELDS}
+
+class MicroBatcher:
+    """Collects concurrent requests for one task and scores them together"""
+
+    def __init__(self, task, run_batch, executor, max_batch_size, max_latency):
+        self.task = task
+        self.run_batch = run_batch
+        self.executor = executor
+        self.max_batch_size = max_batch_size
+        self.max_latency = max_latency
+        self.queue = asyncio.Queue()
+        self.worker = None
+        self.in_flight = 0
+        self.batches = 0
+        self.rows = 0
+
+    @property
+    def depth(self):
+        """Requests waiting or being scored"""
+        return self.queue.qsize() + self.in_flight
+
+    async def submit(self, row):
+        """Queue one row and wait for its prediction"""
+        future = asyncio.get_running_loop().create_future()
+        await self.queue.put((row, future))
+        return await future
+
+    async def run(self):
+        """Batching loop: wait for a request, then gather more until the window closes"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_latency
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self.queue.get(), timeout=remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            rows = [row for row, _ in batch]
+            self.in_flight = len(batch)
+            try:
+                # Forest evaluation runs in the worker pool so the event loop stays responsive
+                try:
+                    results = await loop.run_in_executor(self.executor, self.run_batch, self.task, rows)
+                except Exception:
+                    if len(batch) == 1:
+                        raise
+                    # One bad row fails the whole batch; rescore row by row so only its request fails
+                    results = await loop.run_in_executor(self.executor, self.run_rows, rows)
+                for (_, future), result in zip(batch, results):
+                    if future.done():
+                        continue
+                    if isinstance(result, Exception):
+                        future.set_exception(result)
+                    else:
+                        future.set_result(result)
+            except Exception as e:
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+            finally:
+                self.in_flight = 0
+                self.batches += 1
+                self.rows += len(batch)
+
+    def run_rows(self, rows):
+        """Score rows one at a time, returning each row's result or the exception it raised"""
+        results = []
+        for row in rows:
+            try:
+                results.append(self.run_batch(self.task, [row])[0])
+            except Exception as e:
+                results.append(e)
+        return results
+
+class InferenceServer:
+    def __init__(self, ml_models, host=None, port=None, max_batch_size=None, max_latency_ms=None, workers=None):
+        self.ml_models = ml_models
+        self.host = host or SERVER_CONFIG['host']
+        self.port = port if port is not None else SERVER_CONFIG['port']
+        self.max_batch_size = max_batch_size or SERVER_CONFIG['max_batch_size']
+        self.max_latency = (max_latency_ms if max_latency_ms is not None else SERVER_CONFIG['max_latency_ms']) / 1000
+        self.executor = ThreadPoolExecutor(max_workers=workers or SERVER_CONFIG['workers'],
+                                           thread_name_prefix='inference')
+        self.batchers = {}
+        self.server = None
+        self.started = None
+
+    async def start(self):
+        """Load the models, start the batchers and begin listening"""
+        # Load lazily attached models up front instead of inside concurrent worker threads
+        for task in TASK_FIELDS:
+            self.ml_models._ensure_model(task)
+        self.ml_models._ensure_encoders()
+
+        for task in TASK_FIELDS:
+            batcher = MicroBatcher(task, self.run_batch, self.executor, self.max_batch_size, self.max_latency)
+            batcher.worker = asyncio.create_task(batcher.run())
+            self.batchers[task] = batcher
+
+        self.server = await asyncio.start_server(self.handle_connection, self.host, self.port)
+        self.port = self.server.sockets[0].getsockname()[1]
+        self.started = time.time()
+        return self.server
+
+    async def stop(self):
+        """Stop listening and cancel the batchers"""
+        if self.server:
+            self.server.close()
+            await self.server.wait_closed()
+        for batcher in self.batchers.values():
+            batcher.worker.cancel()
+        self.executor.shutdown(wait=False)
+
+    def run_batch(self, task, rows):
+        """Score a batch of request rows (runs in a worker thread)"""
+        frame = pd.DataFrame(rows, columns=TASK_FIELDS[task])
+        if task == 'crop':
+            prediction_data = self.ml_models.predict_crop_batch(frame)
+        elif task == 'fertilizer':
+            prediction_data = self.ml_models.predict_fertilizer_batch(frame)
+        else:
+            prediction_data = self.ml_models.predict_yield_batch(frame)
+            return [{'prediction': float(value)} for value in prediction_data['predictions']]
+
+        results = []
+        for i, prediction in enumerate(prediction_data['predictions']):
+            results.append({
+                'prediction': str(prediction),
+                'confidence': float(prediction_data['confidences'][i]),
+                'top_k': [[str(label), float(prob)] for label, prob in zip(
+                    prediction_data['top_k_labels'][i], prediction_data['top_k_probabilities'][i]
+                )]
+            })
+        return results
+
+    def health(self):
+        """Health report with model versions and queue depth"""
+        return {
+            'status': 'ok',
+            'model_version': self.ml_models.registry_version,
+            'model_generation': self.ml_models.generation,
+            'fingerprints': self.ml_models.fingerprints,
+            'queue_depth': {task: batcher.depth for task, batcher in self.batchers.items()},
+            'batches': {task: batcher.batches for task, batcher in self.batchers.items()},
+            'rows': {task: batcher.rows for task, batcher in self.batchers.items()},
+            'uptime_seconds': time.time() - self.started if self.started else 0.0
+        }
+
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection until it closes"""
+        try:
+            while True:
+                request = await self._read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+
+                status, payload = await self.route(method, path, body)
+                keep_alive = headers.get('connection', '').lower() != 'close'
+                self._write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        except ValueError as e:
+            self._write_response(writer, HTTPStatus.BAD_REQUEST, {'error': str(e)}, False)
+        finally:
+            writer.close()
+
+    async def route(self, method, path, body):
+        """Dispatch a request to an endpoint"""
+        if path == '/health':
+            if method != 'GET':
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': "Use GET"}
+            return HTTPStatus.OK, self.health()
+
+        if path.startswith('/predict/') and path[len('/predict/'):] in TASK_FIELDS:
+            if method != 'POST':
+                return HTTPStatus.METHOD_NOT_ALLOWED, {'error': "Use POST"}
+            task = path[len('/predict/'):]
+            try:
+                row = self._parse_row(task, body)
+            except ValueError as e:
+                return HTTPStatus.BAD_REQUEST, {'error': str(e)}
+
+            try:
+                result = await self.batchers[task].submit(row)
+            except ValueError as e:
+                # Inputs the models reject, such as an unseen category under the 'error' policy
+                return HTTPStatus.BAD_REQUEST, {'error': str(e)}
+            except Exception as e:
+                return HTTPStatus.INTERNAL_SERVER_ERROR, {'error': str(e)}
+            return HTTPStatus.OK, result
+
+        return HTTPStatus.NOT_FOUND, {'error': f"Unknown endpoint: {path}"}
+
+    def _parse_row(self, task, body):
+        """Validate a JSON request body into a row of model inputs"""
+        try:
+            payload = json.loads(body or b'{}')
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSON: {str(e)}")
+        if not isinstance(payload, dict):
+            raise ValueError("Request body must be a JSON object")
+
+        missing = [field for field in TASK_FIELDS[task] if field not in payload]
+        if missing:
+            raise ValueError(f"Missing fields: {', '.join(missing)}")
+
+        row = []
+        for field in TASK_FIELDS[task]:
+            value = payload[field]
+            if field in NUMERIC_FIELDS:
+                try:
+                    value = float(value)
+                except (TypeError, ValueError):
+                    raise ValueError(f"Invalid numeric value for {field}")
+            elif field in CATEGORICAL_FIELDS:
+                value = str(value)
+            row.append(value)
+        return row
+
+    async def _read_request(self, reader):
+        """Read one HTTP request, returning None when the client disconnects"""
+        request_line = await reader.readline()
+        if not request_line:
+            return None
+
+        parts = request_line.decode('latin-1').split()
+        if len(parts) != 3:
+            raise ValueError("Malformed request line")
+        method, path, _ = parts
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        length = int(headers.get('content-length', 0))
+        if length > SERVER_CONFIG['max_body_bytes']:
+            raise ValueError("Request body too large")
+        body = await reader.readexactly(length) if length else b''
+        return method.upper(), path.split('?', 1)[0], headers, body
+
+    def _write_response(self, writer, status, payload, keep_alive):
+        """Write a JSON response"""
+        body = json.dumps(payload).encode('utf-8')
+        head = (
+            f"HTTP/1.1 {status.value} {status.phrase}\r\n"
+            f"Content-Type: application/json\r\n"
+            f"Content-Length: {len(body)}\r\n"
+            f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n"
+        )
+        writer.write(head.encode('latin-1') + body)
+
+def run_server(ml_models, **options):
+    """Run the inference service until interrupted"""
+    server = InferenceServer(ml_models, **options)
+
+    async def main():
+        await server.start()
+        print(f"Serving models {ml_models.registry_version} on http://{server.host}:{server.port} "
+              f"(batch up to {server.max_batch_size}, window {server.max_latency * 1000:.1f}ms)")
+        try:
+            async with server.server:
+                await server.server.serve_forever()
+        finally:
+            await server.stop()
+
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -1,43 +1,54 @@
 # main_gui.py - Main GUI Application
 
 import tkinter as tk
-from tkinter import messagebox
+from tkinter import ttk, messagebox, filedialog
 from datetime import datetime
+import os
 import warnings
 warnings.filterwarnings('ignore')
 
-# Import custom modules
+# Import custom modules (the data, model and chart modules load pandas, sklearn and
+# matplotlib, so they are imported on first use; see load_components)
 from config import APP_CONFIG, CROP_INPUT_FIELDS, FERTILIZER_DROPDOWN_FIELDS, FERTILIZER_NUMERIC_FIELDS
-from config import YIELD_DROPDOWN_FIELDS, YIELD_NUMERIC_FIELDS, STATE_DISTRICT_MAPPING
-from data_generator import DataGenerator
-from ml_models import CropMLModels
-from prediction_engine import PredictionEngine
-from visualizations import CropVisualizations
-from data_manager import DataManager
+from config import YIELD_DROPDOWN_FIELDS, YIELD_NUMERIC_FIELDS, STATE_DISTRICT_MAPPING, INGEST_CONFIG
+from config import STARTUP_CONFIG
 from ui_components import UIComponents
+from task_executor import TaskExecutor, watch_job
+from startup_timing import StartupTimer
+
+STARTUP = StartupTimer()
 
 class CropManagementSystem:
     def __init__(self, root):
         self.root = root
         self.setup_window()
         
-        # Initialize components
+        # Initialize components (the rest are created by load_components during initialization)
         self.ui = UIComponents(root)
-        self.data_generator = DataGenerator()
-        self.ml_models = CropMLModels()
-        self.data_manager = DataManager()
-        self.prediction_engine = PredictionEngine(self.ml_models)
+        self.data_generator = None
+        self.ml_models = None
+        self.model_registry = None
+        self.data_manager = None
+        self.prediction_engine = None
+        self.visualizations = None
         
         # Initialize variables
         self.crop_inputs = {}
         self.fertilizer_inputs = {}
         self.yield_inputs = {}
+        self.predict_buttons = []
+        self.chart_buttons = {}
+        self.data_buttons = {}
+        self.data_tree = None
+        self.lazy_tabs = {}
+        self.tasks = TaskExecutor(root, self.ui.set_widget_state)
         
         # Create UI
         self.create_interface()
+        STARTUP.mark('interface built')
         
-        # Initialize data and train models
-        self.initialize_system()
+        # Initialize data and train models once the window is on screen
+        self.root.bind('<Map>', self.on_first_map)
     
     def setup_window(self):
         """Setup main window properties"""
@@ -65,11 +76,40 @@ class CropManagementSystem:
         self.create_crop_recommendation_tab()
         self.create_fertilizer_tab()
         self.create_yield_prediction_tab()
-        self.create_analysis_tab()
-        self.create_data_management_tab()
         
-        # Create status bar
+        # The analysis and data tabs are built the first time they are selected
+        self.add_lazy_tab("Data Analysis", "📈", self.create_analysis_tab)
+        self.add_lazy_tab("Data Management", "💾", self.create_data_management_tab)
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        
+        # Create status bar, with a Cancel button shown while a background task runs
         self.status_frame, self.status_label, self.time_label = self.ui.create_status_bar(self.root)
+        self.task_cancel_button = ttk.Button(self.status_frame, text="✖ Cancel", command=self.cancel_task)
+    
+    def add_lazy_tab(self, tab_name, icon, builder):
+        """Add an empty tab whose content builder(tab_frame) creates when it is first selected"""
+        tab_frame = self.ui.create_tab_content(self.notebook, tab_name, icon)
+        self.lazy_tabs[str(tab_frame)] = (tab_frame, builder)
+    
+    def on_tab_changed(self, event=None):
+        """Build a deferred tab on its first selection"""
+        selected = self.notebook.select()
+        if selected not in self.lazy_tabs:
+            return
+        
+        tab_frame, builder = self.lazy_tabs.pop(selected)
+        existing = self.busy_widgets()
+        builder(tab_frame)
+        # Buttons built while a task runs stay disabled until it finishes
+        self.tasks.hold([widget for widget in self.busy_widgets() if widget not in existing])
+    
+    def on_first_map(self, event):
+        """Start initialization once the main window has been shown"""
+        if event.widget is not self.root:
+            return
+        self.root.unbind('<Map>')
+        STARTUP.mark('window shown')
+        self.root.after_idle(self.initialize_system)
     
     def on_state_selected(self, event=None):
         """Handle state selection and update district dropdown"""
@@ -98,6 +138,7 @@ class CropManagementSystem:
                                command=self.predict_crop, 
                                bg='#3498db', fg='white', font=('Arial', 10, 'bold'))
         predict_btn.pack(pady=20)
+        self.predict_buttons.append(predict_btn)
         
         # Create result panel
         right_panel, self.crop_result = self.ui.create_result_panel(
@@ -142,6 +183,7 @@ class CropManagementSystem:
                                command=self.predict_fertilizer,
                                bg='#e74c3c', fg='white', font=('Arial', 10, 'bold'))
         predict_btn.pack(pady=20)
+        self.predict_buttons.append(predict_btn)
         
         # Create result panel
         right_panel, self.fertilizer_result = self.ui.create_result_panel(
@@ -190,6 +232,7 @@ class CropManagementSystem:
                                command=self.predict_yield,
                                bg='#27ae60', fg='white', font=('Arial', 10, 'bold'))
         predict_btn.pack(pady=20)
+        self.predict_buttons.append(predict_btn)
         
         # Create result panel
         right_panel, self.yield_result = self.ui.create_result_panel(
@@ -197,9 +240,10 @@ class CropManagementSystem:
             "Yield Prediction Results"
         )
     
-    def create_analysis_tab(self):
+    def create_analysis_tab(self, tab_frame):
         """Create data analysis and visualization tab"""
-        tab_frame = self.ui.create_tab_content(self.notebook, "Data Analysis", "📈")
+        from visualizations import CropVisualizations
+        
         main_container = self.ui.create_main_container(tab_frame)
         
         # Control panel
@@ -211,20 +255,19 @@ class CropManagementSystem:
         
         # Create buttons
         buttons = [
-            ("📊 Crop Distribution", self.show_crop_distribution, None),
-            ("🌡️ Parameter Analysis", self.show_parameter_analysis, None),
-            ("📈 Yield Trends", self.show_yield_trends, None)
+            ("📊 Crop Distribution", self.show_crop_distribution, 'crop_distribution'),
+            ("🌡️ Parameter Analysis", self.show_parameter_analysis, 'parameter_analysis'),
+            ("📈 Yield Trends", self.show_yield_trends, 'yield_trends')
         ]
         
-        self.ui.create_button_panel(control_panel, buttons)
+        _, self.chart_buttons = self.ui.create_button_panel(control_panel, buttons)
         
         # Chart area
         self.chart_frame = self.ui.create_chart_frame(main_container)
         self.visualizations = CropVisualizations(self.chart_frame)
     
-    def create_data_management_tab(self):
+    def create_data_management_tab(self, tab_frame):
         """Create data management tab"""
-        tab_frame = self.ui.create_tab_content(self.notebook, "Data Management", "💾")
         main_container = self.ui.create_main_container(tab_frame)
         
         # Control panel
@@ -236,12 +279,26 @@ class CropManagementSystem:
         
         # Create buttons
         buttons = [
-            ("📁 Load Data", self.load_data, None),
-            ("💾 Export Results", self.export_data, None),
-            ("🔄 Retrain Models", self.retrain_models, None)
+            ("📁 Load Data", self.load_data, 'load'),
+            ("🗂 Load Folder", self.load_directory, 'load_directory'),
+            ("💾 Export Results", self.export_data, 'export'),
+            ("📜 Export Prediction Log", self.export_prediction_log, 'export_log'),
+            ("🧹 Quarantine Invalid Rows", self.quarantine_invalid_rows, 'quarantine'),
+            ("🗄 Backup Data", self.backup_data, 'backup'),
+            ("📂 Restore Backup", self.restore_backup, 'restore'),
+            ("🔄 Retrain Models", self.retrain_models, 'retrain'),
+            ("⏪ Rollback Models", self.rollback_models, 'rollback')
         ]
         
-        self.ui.create_button_panel(control_panel, buttons)
+        _, self.data_buttons = self.ui.create_button_panel(control_panel, buttons)
+        
+        # Progress of a background CSV load (shown only while loading)
+        self.load_progress_frame = tk.Frame(control_panel, bg='white')
+        self.load_progress_label = tk.Label(self.load_progress_frame, text="", bg='white')
+        self.load_progress_label.pack(side='left', padx=10)
+        self.load_progress_bar = self.ui.create_progress_bar(self.load_progress_frame, mode='determinate')
+        self.load_progress_bar.pack(side='left', fill='x', expand=True, padx=10)
+        ttk.Button(self.load_progress_frame, text="✖ Cancel", command=self.cancel_data_load).pack(side='left', padx=10)
         
         # Data preview
         data_frame = tk.Frame(main_container, bg='white', relief='raised', bd=2)
@@ -257,52 +314,191 @@ class CropManagementSystem:
         # Pack treeview and scrollbar
         self.data_tree.pack(side='left', fill='both', expand=True, padx=10, pady=10)
         scrollbar.pack(side='right', fill='y', pady=10)
+        if not self.tasks.tasks:
+            self.update_data_tree()  # otherwise the task's completion refreshes it
     
     def initialize_system(self):
-        """Initialize system with data and trained models"""
+        """Generate data and load or train models on a worker thread, keeping the window responsive"""
         self.update_status("Initializing system...")
+        self.run_task('initialize', "System initialization", self._initialize_task, self._on_initialized,
+                      error_title="Initialization Error")
+    
+    def _initialize_task(self, context):
+        """Worker: components, sample data, then saved models for it or fresh training"""
+        context.report("Loading components...")
+        self.load_components()
+        
+        context.report("Generating sample data...")
+        self.data_manager.set_data(self.data_generator.generate_all_data())
+        STARTUP.mark('sample data')
+        
+        context.check_cancelled()
+        context.report("Looking for saved models...")
+        version = self.load_saved_models()
+        if version is not None:
+            message = f"Loaded saved models ({version})"
+        else:
+            message = self._train_task(context)
+        STARTUP.mark('models ready')
+        return message
+    
+    def _on_initialized(self, message):
+        self.update_data_tree()
+        self.update_status(f"System initialized successfully! {message}. {self.data_manager.get_memory_summary()}")
+        if STARTUP_CONFIG['log_timings']:
+            print(STARTUP.format_report())  # Log to console
+    
+    def load_components(self):
+        """Import the data, model and prediction modules and create their objects"""
+        from data_generator import DataGenerator
+        from ml_models import CropMLModels
+        from model_registry import ModelRegistry
+        from prediction_engine import PredictionEngine
+        from data_manager import DataManager
+        STARTUP.mark('heavy imports')
         
+        self.data_generator = DataGenerator()
+        self.ml_models = CropMLModels()
+        self.model_registry = ModelRegistry()
+        self.ml_models.load_tuned_params(self.model_registry)
+        self.data_manager = DataManager()
+        self.prediction_engine = PredictionEngine(self.ml_models, prediction_log=self.data_manager.sql_store)
+    
+    def load_saved_models(self):
+        """Attach the newest saved model version matching the current data (returns it, or None)"""
         try:
-            # Generate sample data
-            data = self.data_generator.generate_all_data()
-            self.data_manager.set_data(data)
-            
-            # Train models
-            self.train_models()
-            
-            # Update data tree
-            self.update_data_tree()
+            version = self.model_registry.find_version(self.data_manager.data)
+            if version is None:
+                return None
             
-            self.update_status("System initialized successfully!")
+            self.model_registry.set_current_version(version)
+            self.ml_models.attach_registry(self.model_registry, version)
+            return version
             
         except Exception as e:
-            error_msg = f"System initialization failed: {str(e)}"
-            self.update_status(error_msg)
-            messagebox.showerror("Initialization Error", error_msg)
+            print(f"Could not load saved models: {str(e)}")
+            return None
     
-    def train_models(self):
-        """Train all machine learning models"""
+    def train_models(self, on_done=None):
+        """Train all machine learning models in the background"""
         self.update_status("Training models...")
+        self.run_task('train', "Model training", self._train_task, on_done or self.update_status,
+                      error_title="Training Error")
+    
+    def _train_task(self, context):
+        """Worker: train every model, reporting after each one"""
+        def progress(model_type, done, total):
+            context.report(f"Trained {model_type} model ({done}/{total})...", done / total)
+            context.check_cancelled()
+        
+        self._check_training_data(context)
+        context.report("Training models...", 0.0)
+        results = self.ml_models.train_all_models(self.data_manager.data, progress=progress)
+        
+        # Log training results
+        training_info = "Model Training Results:\n"
+        for model_name, result in results.items():
+            if 'test_accuracy' in result:
+                training_info += f"{model_name}: {result['test_accuracy']:.3f} accuracy\n"
+            elif 'test_score' in result:
+                training_info += f"{model_name}: {result['test_score']:.3f} R² score\n"
+        
+        print(training_info)  # Log to console
+        
+        version = self.ml_models.save_to_registry(self.model_registry)
+        return f"Models trained successfully! Saved as {version}"
+    
+    def retrain_changed_models(self):
+        """Retrain only the models whose data changed, in the background"""
+        self.update_status("Retraining changed models...")
+        self.run_task('retrain', "Model training", self._retrain_changed_task, self._on_retrained,
+                      error_title="Training Error")
+    
+    def _retrain_changed_task(self, context):
+        """Worker: skip, extend or rebuild each model"""
+        def progress(model_type, done, total):
+            context.report(f"Checked {model_type} model ({done}/{total})...", done / total)
+            context.check_cancelled()
+        
+        self._check_training_data(context)
+        results = self.ml_models.retrain_incremental(self.data_manager.data, progress=progress)
+        
+        summary = "Retrain Summary:\n"
+        for model_name, result in results.items():
+            if result['action'] == 'skipped':
+                summary += f"{model_name}: skipped (data unchanged)\n"
+            elif result['action'] == 'extended':
+                score = result.get('appended_test_accuracy', result.get('appended_test_score'))
+                summary += (f"{model_name}: extended (+{result['added_trees']} trees "
+                            f"on {result['appended_rows']:,} new rows, {score:.3f} on held-out new rows)\n")
+            elif 'test_accuracy' in result:
+                summary += f"{model_name}: rebuilt ({result['test_accuracy']:.3f} accuracy)\n"
+            else:
+                summary += f"{model_name}: rebuilt ({result['test_score']:.3f} R² score)\n"
         
-        try:
-            data = self.data_manager.data
-            results = self.ml_models.train_all_models(data)
-            
-            # Log training results
-            training_info = "Model Training Results:\n"
-            for model_name, result in results.items():
-                if 'test_accuracy' in result:
-                    training_info += f"{model_name}: {result['test_accuracy']:.3f} accuracy\n"
-                elif 'test_score' in result:
-                    training_info += f"{model_name}: {result['test_score']:.3f} R² score\n"
-            
-            print(training_info)  # Log to console
-            self.update_status("Models trained successfully!")
-            
-        except Exception as e:
-            error_msg = f"Model training failed: {str(e)}"
+        print(summary)  # Log to console
+        
+        if any(result['action'] != 'skipped' for result in results.values()):
+            version = self.ml_models.save_to_registry(self.model_registry)
+            return summary, f"Models updated and saved as {version}"
+        return summary, "Models already up to date"
+    
+    def _check_training_data(self, context):
+        """Worker: refuse to train on data with type, range or missing-value failures"""
+        context.report("Validating data...")
+        results = self.data_manager.validate_data_for_training()
+        for name, result in results.items():
+            if result.get('warnings'):
+                print(f"{name}: {result['message']}")  # Log to console; unseen categories are handled
+        problems = [f"{name}: {result['message']}" for name, result in results.items() if not result['valid']]
+        if problems:
+            raise ValueError("Data is not ready for training:\n" + "\n".join(problems))
+    
+    def _on_retrained(self, result):
+        summary, status = result
+        self.update_status(status)
+        messagebox.showinfo("Retrain Models", summary)
+    
+    def run_task(self, name, label, func, on_done, error_title="Error", on_progress=None):
+        """Run func(context) on a worker thread with model and data buttons disabled"""
+        def on_error(error):
+            self._task_finished()
+            error_msg = f"{label} failed: {str(error)}"
             self.update_status(error_msg)
-            messagebox.showerror("Training Error", error_msg)
+            messagebox.showerror(error_title, error_msg)
+        
+        def on_cancel():
+            self._task_finished()
+            self.update_status(f"{label} cancelled")
+        
+        def done(result):
+            self._task_finished()
+            on_done(result)
+        
+        task = self.tasks.submit(name, func, on_done=done, on_error=on_error, on_cancel=on_cancel,
+                                 on_progress=on_progress or (lambda message, fraction: self.update_status(message)),
+                                 widgets=self.busy_widgets())
+        if task is not None:
+            self.task_cancel_button.pack(side='right', padx=5)
+        return task
+    
+    def run_job(self, name, label, job, on_progress, on_done):
+        """Run an ingest or export job as a task, so it holds the data buttons like any other"""
+        return self.run_task(name, label, watch_job(job, INGEST_CONFIG['poll_ms']), on_done,
+                             on_progress=lambda message, fraction: on_progress(job))
+    
+    def busy_widgets(self):
+        """Buttons that read or replace the data and models while a task changes them"""
+        return list(self.data_buttons.values()) + list(self.chart_buttons.values()) + self.predict_buttons
+    
+    def _task_finished(self):
+        if not self.tasks.tasks:
+            self.task_cancel_button.pack_forget()
+    
+    def cancel_task(self):
+        """Ask running background tasks to stop at their next checkpoint"""
+        self.tasks.cancel_all()
+        self.update_status("Cancelling...")
     
     def predict_crop(self):
         """Handle crop prediction"""
@@ -411,43 +607,184 @@ class CropManagementSystem:
     def show_crop_distribution(self):
         """Show crop distribution visualization"""
         try:
-            self.visualizations.show_crop_distribution(self.data_manager.data)
-            self.update_status("Crop distribution chart generated")
+            redrawn = self.visualizations.show_crop_distribution(self.data_manager.data, self.data_manager.data_versions)
+            self.update_status("Crop distribution chart generated" if redrawn else "Crop distribution chart (data unchanged)")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate chart: {str(e)}")
     
     def show_parameter_analysis(self):
         """Show parameter analysis visualization"""
         try:
-            self.visualizations.show_parameter_analysis(self.data_manager.data)
-            self.update_status("Parameter analysis chart generated")
+            redrawn = self.visualizations.show_parameter_analysis(self.data_manager.data, self.data_manager.data_versions)
+            self.update_status("Parameter analysis chart generated" if redrawn else "Parameter analysis chart (data unchanged)")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate chart: {str(e)}")
     
     def show_yield_trends(self):
         """Show yield trends visualization"""
         try:
-            self.visualizations.show_yield_trends(self.data_manager.data)
-            self.update_status("Yield trends chart generated")
+            redrawn = self.visualizations.show_yield_trends(self.data_manager.data, self.data_manager.data_versions)
+            self.update_status("Yield trends chart generated" if redrawn else "Yield trends chart (data unchanged)")
         except Exception as e:
             messagebox.showerror("Error", f"Failed to generate chart: {str(e)}")
     
     def load_data(self):
-        """Load data from file"""
-        success, message = self.data_manager.load_csv_data(self.root)
-        if success:
-            self.update_data_tree()
-            # Optionally retrain models with new data
-            response = messagebox.askyesno("Retrain Models", 
-                                          "Data loaded successfully. Do you want to retrain models with new data?")
-            if response:
-                self.train_models()
+        """Load data from file on a background thread"""
+        if self.tasks.is_running('ingest'):
+            return
         
-        self.update_status(message)
+        file_path = self.data_manager.ask_csv_file(self.root)
+        if not file_path:
+            self.update_status("No file selected")
+            return
+        
+        try:
+            job = self.data_manager.start_csv_load(file_path)
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load data: {str(e)}", parent=self.root)
+            return
+        
+        self.load_progress_bar['value'] = 0
+        self.load_progress_frame.pack(fill='x', padx=10, pady=(0, 10))
+        self.update_status(f"Loading {os.path.basename(file_path)}...")
+        self.run_job('ingest', "Data load", job, self.show_load_progress, self._on_data_loaded)
+    
+    def show_load_progress(self, job):
+        self.load_progress_bar['value'] = job.progress * 100
+        self.load_progress_label.config(text=f"{job.rows_read:,} rows ({job.progress:.0%})")
+    
+    def _on_data_loaded(self, job):
+        """Finish a CSV load on the Tk thread (no other data task can run meanwhile)"""
+        self.load_progress_frame.pack_forget()
+        
+        if job.error is not None:
+            error_msg = f"Failed to load data: {str(job.error)}"
+            self.update_status(error_msg)
+            messagebox.showerror("Error", error_msg, parent=self.root)
+            return
+        if job.cancelled or job.result is None:
+            self.update_status("Data load cancelled")
+            return
+        
+        self.data_manager.finish_csv_load(job)
+        messagebox.showinfo("Data Loaded", self.data_manager.describe_loaded_data(job), parent=self.root)
+        self.update_data_tree()
+        self.update_status(f"Data loaded from {os.path.basename(job.file_path)}")
+        
+        # Optionally retrain models with new data
+        response = messagebox.askyesno("Retrain Models", 
+                                      "Data loaded successfully. Do you want to retrain models with new data?")
+        if response:
+            self.retrain_changed_models()
+    
+    def cancel_data_load(self):
+        """Stop a running background load"""
+        if self.tasks.is_running('ingest'):
+            self.tasks.cancel('ingest')
+            self.update_status("Cancelling data load...")
     
     def export_data(self):
-        """Export data to file"""
-        success, message = self.data_manager.export_data(parent_window=self.root)
+        """Export results in chunks on a background thread"""
+        if self.tasks.is_running('export'):
+            return
+        
+        file_path = self.data_manager.ask_export_file("Save results", self.root)
+        if not file_path:
+            self.update_status("No file selected")
+            return
+        self.start_export(lambda: self.data_manager.start_data_export(file_path), file_path)
+    
+    def export_prediction_log(self):
+        """Export the logged predictions, appending to an existing file if the user chooses"""
+        if self.tasks.is_running('export'):
+            return
+        if self.data_manager.sql_store is None:
+            messagebox.showinfo("Prediction Log", "Predictions are only logged when the SQLite store is "
+                                "enabled (SQLITE_CONFIG['enabled'] in config.py)", parent=self.root)
+            return
+        
+        file_path = self.data_manager.ask_export_file("Save prediction log", self.root, confirm_overwrite=False)
+        if not file_path:
+            self.update_status("No file selected")
+            return
+        append = os.path.exists(file_path) and messagebox.askyesno(
+            "Prediction Log", f"Append to {os.path.basename(file_path)}? (No replaces it)", parent=self.root)
+        self.start_export(lambda: self.data_manager.start_prediction_log_export(file_path, append=append), file_path)
+    
+    def start_export(self, make_job, file_path):
+        """Run an export job in the background"""
+        try:
+            job = make_job()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to export data: {str(e)}", parent=self.root)
+            return
+        
+        self.update_status(f"Exporting to {os.path.basename(file_path)}...")
+        self.run_job('export', "Export", job,
+                     lambda job: self.update_status(f"Exporting... {job.rows_written:,} rows ({job.progress:.0%})"),
+                     self._on_exported)
+    
+    def _on_exported(self, job):
+        if job.error is not None:
+            error_msg = f"Failed to export data: {str(job.error)}"
+            self.update_status(error_msg)
+            messagebox.showerror("Error", error_msg, parent=self.root)
+        elif job.cancelled:
+            self.update_status("Export cancelled")
+        else:
+            self.update_status(f"Exported {job.rows_written:,} rows to {os.path.basename(job.file_path)}")
+    
+    def load_directory(self):
+        """Load all new CSV files from a directory in the background"""
+        directory = filedialog.askdirectory(title="Select data directory", parent=self.root)
+        if not directory:
+            self.update_status("No directory selected")
+            return
+        self.update_status(f"Loading files from {directory}...")
+        self.run_task('load_directory', "Directory load",
+                      lambda context: self.data_manager.load_directory(directory), self._on_data_operation)
+    
+    def backup_data(self):
+        """Back up datasets to the columnar store in the background"""
+        backup_dir = filedialog.askdirectory(title="Select backup directory", parent=self.root)
+        if not backup_dir:
+            self.update_status("No backup directory selected")
+            return
+        self.update_status("Backing up data...")
+        self.run_task('backup', "Backup", lambda context: self.data_manager.backup_data(backup_dir),
+                      self._on_data_operation)
+    
+    def restore_backup(self):
+        """Reopen datasets from a columnar store backup in the background"""
+        backup_dir = filedialog.askdirectory(title="Select backup directory", parent=self.root)
+        if not backup_dir:
+            self.update_status("No backup directory selected")
+            return
+        self.update_status("Restoring backup...")
+        self.run_task('restore', "Restore", lambda context: self.data_manager.restore_backup(backup_dir),
+                      self._on_data_operation)
+    
+    def quarantine_invalid_rows(self):
+        """Move rows that fail validation out of the datasets in the background"""
+        output_dir = filedialog.askdirectory(title="Save quarantined rows to (Cancel to keep them in memory)",
+                                             parent=self.root)
+        self.update_status("Validating rows...")
+        self.run_task('quarantine', "Quarantine",
+                      lambda context: self._quarantine_task(output_dir or None), self._on_data_operation)
+    
+    def _quarantine_task(self, output_dir):
+        """Worker: quarantine invalid rows of every dataset"""
+        moved = self.data_manager.quarantine_invalid_rows(output_dir=output_dir)
+        if not moved:
+            return True, "All rows passed validation"
+        counts = ', '.join(f"{name}: {rows:,}" for name, rows in moved.items())
+        return True, f"Quarantined invalid rows ({counts})"
+    
+    def _on_data_operation(self, result):
+        """Show the (success, message) outcome of a data task"""
+        success, message = result
+        if success:
+            self.update_data_tree()
         self.update_status(message)
     
     def retrain_models(self):
@@ -455,12 +792,30 @@ class CropManagementSystem:
         response = messagebox.askyesno("Retrain Models", 
                                       "This will retrain all models with current data. Continue?")
         if response:
-            self.train_models()
-            self.update_data_tree()
-            messagebox.showinfo("Success", "All models have been retrained successfully!")
+            self.train_models(on_done=self._on_models_retrained)
+    
+    def _on_models_retrained(self, message):
+        self.update_status(message)
+        self.update_data_tree()
+        messagebox.showinfo("Success", "All models have been retrained successfully!")
+    
+    def rollback_models(self):
+        """Roll back to the previous saved model version"""
+        try:
+            current = self.ml_models.registry_version
+            response = messagebox.askyesno("Rollback Models",
+                                          f"Replace current models ({current}) with the previous saved version?")
+            if response:
+                version = self.ml_models.rollback()
+                self.update_status(f"Rolled back models to {version}")
+        except Exception as e:
+            messagebox.showerror("Rollback Error", f"Rollback failed: {str(e)}")
     
     def update_data_tree(self):
         """Update the data tree view"""
+        if self.data_tree is None or self.data_manager is None:
+            return
+        
         # Clear existing items
         for item in self.data_tree.get_children():
             self.data_tree.delete(item)
@@ -474,7 +829,6 @@ class CropManagementSystem:
         """Update status bar message"""
         self.status_label.config(text=message)
         self.time_label.config(text=f"Last updated: {datetime.now().strftime('%Y-%m-%d %H:%M')}")
-        self.root.update_idletasks()
 
 def main():
     """Main function to run the application"""
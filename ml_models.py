@@ -1,20 +1,58 @@
 # ml_models.py - Machine Learning Models
 
+import os
+import math
+import time
+import itertools
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 import numpy as np
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
-from sklearn.model_selection import train_test_split
+from sklearn.model_selection import train_test_split, cross_val_score
 from sklearn.preprocessing import LabelEncoder
 from sklearn.metrics import accuracy_score, mean_squared_error
-from config import MODEL_CONFIG
+from config import MODEL_CONFIG, MODEL_DATASETS, TUNING_CONFIG
+from forest_inference import FlatForest, benchmark_inference
+from model_registry import dataset_fingerprint
+from feature_encoding import CategoryEncoding, EncodingTable, UNSEEN_POLICIES
 import warnings
 warnings.filterwarnings('ignore')
 
+# Training method for each model
+TRAINERS = {
+    'crop': 'train_crop_model',
+    'fertilizer': 'train_fertilizer_model',
+    'yield': 'train_yield_model'
+}
+
+# Target column of each model's dataset
+TARGET_COLUMNS = {
+    'crop': 'label',
+    'fertilizer': 'fertilizer',
+    'yield': 'yield'
+}
+
+# Categorical features per model: (column, encoder name, position in the input row)
+CATEGORICAL_FEATURES = {
+    'fertilizer': [('soil_type', 'soil_type', 3), ('crop_type', 'crop_type', 4)],
+    'yield': [('state', 'state', 0), ('district', 'district', 1),
+              ('season', 'season', 2), ('crop', 'crop_yield', 3)]
+}
+
 class CropMLModels:
     def __init__(self):
         self.models = {}
         self.encoders = {}
         self.model_config = MODEL_CONFIG
+        self.encoding_table = EncodingTable(self.model_config['unseen_category_policy'])
+        self.inference_engines = {}
+        self.flat_models = {}
+        self.fingerprints = {}
+        self.row_counts = {}
+        self.tuned_params = {}
+        self.generation = 0
+        self.registry = None
+        self.registry_version = None
     
     def train_crop_model(self, data):
         """Train crop recommendation model"""
@@ -27,11 +65,8 @@ class CropMLModels:
             random_state=self.model_config['random_state']
         )
         
-        self.models['crop'] = RandomForestClassifier(
-            n_estimators=self.model_config['n_estimators'],
-            random_state=self.model_config['random_state']
-        )
-        self.models['crop'].fit(X_train, y_train)
+        self.models['crop'] = self._fit_forest('crop', RandomForestClassifier, X_train, y_train)
+        self._record_training_data('crop', data)
         
         # Calculate accuracy
         train_accuracy = self.models['crop'].score(X_train, y_train)
@@ -49,12 +84,10 @@ class CropMLModels:
         y = data['fertilizer']
         
         # Encode categorical variables
-        self.encoders['soil_type'] = LabelEncoder()
-        self.encoders['crop_type'] = LabelEncoder()
-        
         X_encoded = X.copy()
-        X_encoded['soil_type'] = self.encoders['soil_type'].fit_transform(X['soil_type'])
-        X_encoded['crop_type'] = self.encoders['crop_type'].fit_transform(X['crop_type'])
+        X_encoded['soil_type'] = self._fit_encoder('soil_type', X['soil_type'])
+        X_encoded['crop_type'] = self._fit_encoder('crop_type', X['crop_type'])
+        self._index_encoders('fertilizer', X_encoded)
         
         X_train, X_test, y_train, y_test = train_test_split(
             X_encoded, y,
@@ -62,11 +95,8 @@ class CropMLModels:
             random_state=self.model_config['random_state']
         )
         
-        self.models['fertilizer'] = RandomForestClassifier(
-            n_estimators=self.model_config['n_estimators'],
-            random_state=self.model_config['random_state']
-        )
-        self.models['fertilizer'].fit(X_train, y_train)
+        self.models['fertilizer'] = self._fit_forest('fertilizer', RandomForestClassifier, X_train, y_train)
+        self._record_training_data('fertilizer', data)
         
         train_accuracy = self.models['fertilizer'].score(X_train, y_train)
         test_accuracy = self.models['fertilizer'].score(X_test, y_test)
@@ -83,16 +113,12 @@ class CropMLModels:
         y = data['yield']
         
         # Encode categorical variables
-        self.encoders['state'] = LabelEncoder()
-        self.encoders['district'] = LabelEncoder()
-        self.encoders['season'] = LabelEncoder()
-        self.encoders['crop_yield'] = LabelEncoder()
-        
         X_encoded = X.copy()
-        X_encoded['state'] = self.encoders['state'].fit_transform(X['state'])
-        X_encoded['district'] = self.encoders['district'].fit_transform(X['district'])
-        X_encoded['season'] = self.encoders['season'].fit_transform(X['season'])
-        X_encoded['crop'] = self.encoders['crop_yield'].fit_transform(X['crop'])
+        X_encoded['state'] = self._fit_encoder('state', X['state'])
+        X_encoded['district'] = self._fit_encoder('district', X['district'])
+        X_encoded['season'] = self._fit_encoder('season', X['season'])
+        X_encoded['crop'] = self._fit_encoder('crop_yield', X['crop'])
+        self._index_encoders('yield', X_encoded)
         
         X_train, X_test, y_train, y_test = train_test_split(
             X_encoded, y,
@@ -100,11 +126,8 @@ class CropMLModels:
             random_state=self.model_config['random_state']
         )
         
-        self.models['yield'] = RandomForestRegressor(
-            n_estimators=self.model_config['n_estimators'],
-            random_state=self.model_config['random_state']
-        )
-        self.models['yield'].fit(X_train, y_train)
+        self.models['yield'] = self._fit_forest('yield', RandomForestRegressor, X_train, y_train)
+        self._record_training_data('yield', data)
         
         train_score = self.models['yield'].score(X_train, y_train)
         test_score = self.models['yield'].score(X_test, y_test)
@@ -119,29 +142,230 @@ class CropMLModels:
             'model': self.models['yield']
         }
     
-    def train_all_models(self, data):
-        """Train all models"""
+    def train_all_models(self, data, parallel=None, progress=None):
+        """Train all models
+        
+        progress(model_type, done, total) is called after each model; an exception it raises
+        stops training before the next model.
+        """
+        if parallel is None:
+            parallel = self.model_config['parallel_training']
+        if parallel and (os.cpu_count() or 1) > 1:
+            return self.train_all_models_parallel(data, progress)
+        
         results = {}
         
         # Train crop model
         results['crop'] = self.train_crop_model(data['crop_recommendation'])
+        _report(progress, 'crop', results)
         
         # Train fertilizer model
         results['fertilizer'] = self.train_fertilizer_model(data['fertilizer'])
+        _report(progress, 'fertilizer', results)
         
         # Train yield model
         results['yield'] = self.train_yield_model(data['yield'])
+        _report(progress, 'yield', results)
+        
+        return results
+    
+    def train_all_models_parallel(self, data, progress=None):
+        """Train the three models concurrently in a process pool"""
+        cpu_count = os.cpu_count() or 1
+        workers = max(1, min(len(TRAINERS), cpu_count))
+        tree_jobs = self.get_tree_jobs(workers, cpu_count)
+        
+        # Each worker builds its forest with its share of the cores
+        worker_config = dict(self.model_config, n_jobs=tree_jobs)
+        
+        results = {}
+        with ProcessPoolExecutor(max_workers=workers, initializer=_limit_worker_threads,
+                                 initargs=(tree_jobs,)) as pool:
+            futures = {
+                model_type: pool.submit(_train_model_task, model_type,
+                                        data[MODEL_DATASETS[model_type]], worker_config,
+                                        self.tuned_params.get(model_type, {}))
+                for model_type in TRAINERS
+            }
+            
+            for model_type, future in futures.items():
+                result, encoders, encoding_table, fingerprint = future.result()
+                self.models[model_type] = result['model']
+                self.encoders.update(encoders)
+                self.encoding_table.update(encoding_table)
+                self.fingerprints[model_type] = fingerprint
+                self.row_counts[model_type] = len(data[MODEL_DATASETS[model_type]])
+                self.generation += 1
+                results[model_type] = result
+                _report(progress, model_type, results)
+        
+        return results
+    
+    def get_tree_jobs(self, workers=1, cpu_count=None):
+        """Threads each forest may use so workers x threads never exceeds the cores"""
+        cpu_count = cpu_count or os.cpu_count() or 1
+        per_worker = max(1, cpu_count // workers)
+        
+        n_jobs = self.model_config['n_jobs']
+        if n_jobs is None or n_jobs < 0:
+            return per_worker
+        return max(1, min(n_jobs, per_worker))
+    
+    def _fit_forest(self, model_type, estimator_class, X_train, y_train):
+        """Build and fit a random forest with the configured (or tuned) parameters"""
+        params = {'n_estimators': self.model_config['n_estimators']}
+        params.update(self.tuned_params.get(model_type, {}))
+        
+        model = estimator_class(
+            random_state=self.model_config['random_state'],
+            n_jobs=self.get_tree_jobs(),
+            **params
+        )
+        model.fit(X_train, y_train)
+        
+        # Predictions are mostly single rows, where thread dispatch only adds latency
+        model.set_params(n_jobs=1)
+        return model
+    
+    def load_tuned_params(self, registry):
+        """Use the tuned forest parameters stored in a registry"""
+        self.tuned_params = {
+            task: entry['params'] for task, entry in registry.load_tuned_params().items()
+        }
+        return self.tuned_params
+    
+    def tune_models(self, data, registry=None, tasks=None, time_budget=None):
+        """Tune each task's forest and write the winning parameters to the registry"""
+        tasks = tasks or list(TRAINERS)
+        if time_budget is None:
+            time_budget = TUNING_CONFIG['time_budget_seconds']
+        
+        results = {}
+        for index, task in enumerate(tasks):
+            # Split what is left of the budget evenly over the remaining tasks
+            task_budget = time_budget / (len(tasks) - index)
+            X, y = self.prepare_training_data(task, data[MODEL_DATASETS[task]])
+            
+            tuner = ForestTuner(task, time_budget=task_budget)
+            result = tuner.search(X, y)
+            results[task] = result
+            time_budget -= result['elapsed']
+            
+            self.tuned_params[task] = result['best_params']
+            if registry is not None:
+                registry.save_tuned_params(task, result['best_params'], result['best_score'])
         
         return results
     
+    def prepare_training_data(self, model_type, data):
+        """Split a dataset into an encoded feature matrix and target, without touching the encoders"""
+        target = TARGET_COLUMNS[model_type]
+        X = data.drop(target, axis=1).copy()
+        for column, _, _ in CATEGORICAL_FEATURES.get(model_type, []):
+            X[column] = category_codes(X[column])
+        return X, data[target]
+    
+    def retrain_incremental(self, data, progress=None):
+        """Retrain only what changed: skip, extend with new trees, or rebuild each model"""
+        results = {}
+        
+        for model_type, dataset_name in MODEL_DATASETS.items():
+            if dataset_name not in data:
+                continue
+            df = data[dataset_name]
+            
+            # Untouched dataset, keep the current model
+            if self.fingerprints.get(model_type) == dataset_fingerprint(df) and self._ensure_model(model_type):
+                results[model_type] = {'action': 'skipped'}
+                _report(progress, model_type, results)
+                continue
+            
+            appended = self._get_appended_rows(model_type, df)
+            result = self.extend_model(model_type, df, appended) if appended is not None else None
+            if result is None:
+                result = getattr(self, TRAINERS[model_type])(df)
+                result['action'] = 'rebuilt'
+            results[model_type] = result
+            _report(progress, model_type, results)
+        
+        return results
+    
+    def extend_model(self, model_type, data, appended):
+        """Grow a trained forest with warm-start trees fitted on appended rows only"""
+        model = self.models[model_type]
+        target = TARGET_COLUMNS[model_type]
+        
+        max_trees = self.model_config['n_estimators'] * self.model_config['incremental_max_growth']
+        if len(appended) < self.model_config['incremental_min_rows'] or len(model.estimators_) >= max_trees:
+            return None
+        
+        X = appended.drop(target, axis=1)
+        y = appended[target]
+        
+        # New categories would change the model's layout
+        for column, encoder_name, _ in CATEGORICAL_FEATURES.get(model_type, []):
+            if not np.isin(X[column], self.encoders[encoder_name].classes_).all():
+                return None
+        
+        X = self.encode_categorical_frame(X, model_type)
+        X = X[list(model.feature_names_in_)]
+        
+        # Hold out part of the appended rows, so the reported score is not on the rows the new trees saw
+        X_train, X_test, y_train, y_test = train_test_split(
+            X, y, test_size=self.model_config['test_size'], random_state=self.model_config['random_state']
+        )
+        # So would new trees fitted on a partial class set
+        if hasattr(model, 'classes_') and set(np.unique(y_train)) != set(model.classes_):
+            return None
+        
+        # New trees in proportion to how much the dataset grew
+        growth = len(appended) / len(data)
+        added_trees = max(self.model_config['incremental_min_trees'],
+                          int(round(len(model.estimators_) * growth)))
+        
+        model.set_params(warm_start=True, n_estimators=len(model.estimators_) + added_trees,
+                         n_jobs=self.get_tree_jobs())
+        model.fit(X_train, y_train)
+        model.set_params(warm_start=False, n_jobs=1)
+        
+        self.flat_models.pop(model_type, None)
+        self._record_training_data(model_type, data)
+        
+        score_name = 'appended_test_accuracy' if hasattr(model, 'classes_') else 'appended_test_score'
+        return {
+            'action': 'extended',
+            'appended_rows': len(appended),
+            'added_trees': added_trees,
+            'total_trees': len(model.estimators_),
+            score_name: model.score(X_test, y_test),
+            'model': model
+        }
+    
+    def _get_appended_rows(self, model_type, data):
+        """Return rows added after the trained data, or None if earlier rows changed"""
+        trained_rows = self.row_counts.get(model_type)
+        if not trained_rows or len(data) <= trained_rows or not self._ensure_model(model_type):
+            return None
+        
+        if dataset_fingerprint(data.iloc[:trained_rows]) != self.fingerprints.get(model_type):
+            return None
+        return data.iloc[trained_rows:]
+    
+    def _record_training_data(self, model_type, data):
+        """Remember which data a model was trained on"""
+        self.fingerprints[model_type] = dataset_fingerprint(data)
+        self.row_counts[model_type] = len(data)
+        self.generation += 1
+    
     def predict_crop(self, inputs):
         """Predict crop recommendation"""
-        if 'crop' not in self.models:
+        if not self._ensure_model('crop'):
             raise ValueError("Crop model not trained")
         
-        prediction = self.models['crop'].predict([inputs])[0]
-        probabilities = self.models['crop'].predict_proba([inputs])[0]
+        # A single predict_proba pass gives both the label and the scores
+        probabilities = self._get_predictor('crop').predict_proba([inputs])[0]
         classes = self.models['crop'].classes_
+        prediction = classes[np.argmax(probabilities)]
         
         crop_probs = list(zip(classes, probabilities))
         crop_probs.sort(key=lambda x: x[1], reverse=True)
@@ -154,11 +378,11 @@ class CropMLModels:
     
     def predict_fertilizer(self, inputs):
         """Predict fertilizer recommendation"""
-        if 'fertilizer' not in self.models:
+        if not self._ensure_model('fertilizer'):
             raise ValueError("Fertilizer model not trained")
         
-        prediction = self.models['fertilizer'].predict([inputs])[0]
-        probabilities = self.models['fertilizer'].predict_proba([inputs])[0]
+        probabilities = self._get_predictor('fertilizer').predict_proba([inputs])[0]
+        prediction = self.models['fertilizer'].classes_[np.argmax(probabilities)]
         
         return {
             'prediction': prediction,
@@ -167,30 +391,347 @@ class CropMLModels:
     
     def predict_yield(self, inputs):
         """Predict crop yield"""
-        if 'yield' not in self.models:
+        if not self._ensure_model('yield'):
             raise ValueError("Yield model not trained")
         
-        prediction = self.models['yield'].predict([inputs])[0]
+        prediction = self._get_predictor('yield').predict([inputs])[0]
         
         return {
             'prediction': prediction
         }
     
+    def predict_crop_batch(self, inputs, top_k=3):
+        """Predict crop recommendations for many rows at once"""
+        if not self._ensure_model('crop'):
+            raise ValueError("Crop model not trained")
+        
+        X = self._prepare_batch(inputs, 'crop')
+        return self._classify_batch('crop', X, top_k)
+    
+    def predict_fertilizer_batch(self, inputs, top_k=3):
+        """Predict fertilizer recommendations for many rows at once"""
+        if not self._ensure_model('fertilizer'):
+            raise ValueError("Fertilizer model not trained")
+        
+        X = self._prepare_batch(inputs, 'fertilizer')
+        return self._classify_batch('fertilizer', X, top_k)
+    
+    def predict_yield_batch(self, inputs):
+        """Predict crop yield for many rows at once"""
+        if not self._ensure_model('yield'):
+            raise ValueError("Yield model not trained")
+        
+        X = self._prepare_batch(inputs, 'yield')
+        return {
+            'predictions': self._get_predictor('yield').predict(X)
+        }
+    
+    def attach_registry(self, registry, version=None):
+        """Serve models from a saved registry version, loading them on first use"""
+        version = version or registry.get_current_version()
+        if version is None:
+            raise ValueError("Model registry has no saved versions")
+        
+        manifest = registry.load_manifest(version)
+        self.registry = registry
+        self.registry_version = version
+        self.models = {}
+        self.encoders = {}
+        self.encoding_table = EncodingTable(self.model_config['unseen_category_policy'])
+        self.fingerprints = dict(manifest['fingerprints'])
+        self.row_counts = dict(manifest.get('row_counts', {}))
+        self.generation += 1
+        return manifest
+    
+    def save_to_registry(self, registry, notes=''):
+        """Save the trained models as a new registry version"""
+        # Lazily attached models must be in memory before they can be written out
+        for model_type in list(self.fingerprints):
+            self._ensure_model(model_type)
+        self._ensure_encoders()
+        
+        version = registry.save(self, notes=notes)
+        self.registry = registry
+        self.registry_version = version
+        return version
+    
+    def rollback(self, version=None):
+        """Switch to an older registry version"""
+        if self.registry is None:
+            raise ValueError("No model registry attached")
+        version = self.registry.rollback(version)
+        self.attach_registry(self.registry, version)
+        return version
+    
+    def _ensure_model(self, model_type):
+        """Make sure a model is in memory, loading it from the registry if needed"""
+        if model_type in self.models:
+            return True
+        if self.registry is None or model_type not in self.fingerprints:
+            return False
+        
+        self.models[model_type] = self.registry.load_model(model_type, self.registry_version)
+        self._ensure_encoders()
+        return True
+    
+    def _ensure_encoders(self):
+        """Load label encoders from the registry if they are not in memory"""
+        if not self.encoders and self.registry is not None:
+            self.encoders.update(self.registry.load_encoders(self.registry_version))
+            
+            # Versions saved before encoding tables existed are rebuilt from the encoders
+            encoding_table = self.registry.load_encoding_table(self.registry_version)
+            if encoding_table is None:
+                encoding_table = EncodingTable.from_encoders(self.encoders)
+            encoding_table.policy = self.encoding_table.policy
+            self.encoding_table = encoding_table
+    
+    def _fit_encoder(self, encoder_name, values):
+        """Fit a column's LabelEncoder and return its codes"""
+        encoder = LabelEncoder()
+        if isinstance(values.dtype, pd.CategoricalDtype):
+            # Compact datasets already carry sorted codes, so reuse them instead of re-encoding
+            encoder.classes_ = np.asarray(values.cat.categories, dtype=object)
+        else:
+            encoder.fit(values)
+        self.encoders[encoder_name] = encoder
+        return category_codes(values, encoder)
+    
+    def _index_encoders(self, model_type, encoded_data):
+        """Build the encoding table entries for a model's categorical columns"""
+        for column, encoder_name, _ in CATEGORICAL_FEATURES[model_type]:
+            self.encoding_table.add(encoder_name, CategoryEncoding.from_label_encoder(
+                self.encoders[encoder_name], encoded_data[column]
+            ))
+    
+    def set_unseen_category_policy(self, policy):
+        """Choose how unseen categories are handled: 'error', 'fallback' or 'nearest'"""
+        if policy not in UNSEEN_POLICIES:
+            raise ValueError(f"Unknown unseen category policy: {policy}")
+        self._ensure_encoders()
+        self.encoding_table.policy = policy
+        self.generation += 1
+    
+    def set_inference_engine(self, model_type, engine):
+        """Select 'sklearn' or 'flat' inference for one model"""
+        if engine not in ('sklearn', 'flat'):
+            raise ValueError(f"Unknown inference engine: {engine}")
+        self.inference_engines[model_type] = engine
+    
+    def get_inference_engine(self, model_type):
+        """Get the inference engine configured for a model"""
+        return self.inference_engines.get(model_type, self.model_config['inference_engine'])
+    
+    def _get_predictor(self, model_type):
+        """Return the object that serves predictions for a model"""
+        model = self.models[model_type]
+        if self.get_inference_engine(model_type) != 'flat':
+            return model
+        
+        # Re-export whenever the underlying forest has been retrained
+        flat_model = self.flat_models.get(model_type)
+        if flat_model is None or flat_model.source is not model:
+            flat_model = FlatForest.from_sklearn(model)
+            self.flat_models[model_type] = flat_model
+        return flat_model
+    
+    def compare_inference_engines(self, model_type, X, repeats=20):
+        """Compare sklearn and flattened inference latency for a model"""
+        if not self._ensure_model(model_type):
+            raise ValueError(f"{model_type.capitalize()} model not trained")
+        
+        model = self.models[model_type]
+        X = self._prepare_batch(X, model_type)
+        return benchmark_inference(model, X, repeats=repeats)
+    
+    def _classify_batch(self, model_type, X, top_k):
+        """Run one predict_proba pass and derive labels, confidences and top-k"""
+        model = self._get_predictor(model_type)
+        probabilities = model.predict_proba(X)
+        classes = model.classes_
+        
+        best = np.argmax(probabilities, axis=1)
+        rows = np.arange(len(probabilities))
+        
+        top_k = max(1, min(top_k, len(classes)))
+        # Stable sort on the negated scores keeps ties in class order, like argmax
+        top_indices = np.argsort(-probabilities, axis=1, kind='stable')[:, :top_k]
+        
+        return {
+            'predictions': classes[best],
+            'confidences': probabilities[rows, best],
+            'top_k_labels': classes[top_indices],
+            'top_k_probabilities': np.take_along_axis(probabilities, top_indices, axis=1),
+            'classes': classes
+        }
+    
+    def _prepare_batch(self, inputs, model_type):
+        """Turn a DataFrame or 2-D array into the feature matrix a model expects"""
+        if isinstance(inputs, pd.DataFrame):
+            X = self.encode_categorical_frame(inputs, model_type)
+            feature_names = getattr(self.models[model_type], 'feature_names_in_', None)
+            if feature_names is not None:
+                missing = [col for col in feature_names if col not in X.columns]
+                if missing:
+                    raise ValueError(f"Missing input columns for {model_type} model: {missing}")
+                X = X[list(feature_names)]
+            return X
+        
+        X = np.asarray(inputs)
+        if X.ndim != 2:
+            raise ValueError(f"Batch inputs must be 2-D, got shape {X.shape}")
+        return X
+    
     def encode_categorical_inputs(self, inputs, model_type):
         """Encode categorical inputs for prediction"""
-        if model_type == 'fertilizer':
-            encoded_inputs = inputs.copy()
-            encoded_inputs[3] = self.encoders['soil_type'].transform([inputs[3]])[0]
-            encoded_inputs[4] = self.encoders['crop_type'].transform([inputs[4]])[0]
-            return encoded_inputs
-        
-        elif model_type == 'yield':
-            encoded_inputs = []
-            encoded_inputs.append(self.encoders['state'].transform([inputs[0]])[0])
-            encoded_inputs.append(self.encoders['district'].transform([inputs[1]])[0])
-            encoded_inputs.append(self.encoders['season'].transform([inputs[2]])[0])
-            encoded_inputs.append(self.encoders['crop_yield'].transform([inputs[3]])[0])
-            encoded_inputs.extend(inputs[4:])  # Add numeric inputs
-            return encoded_inputs
-        
-        return inputs
\ No newline at end of file
+        if model_type not in CATEGORICAL_FEATURES:
+            return inputs
+        
+        self._ensure_encoders()
+        encoded_inputs = list(inputs)
+        for _, encoder_name, position in CATEGORICAL_FEATURES[model_type]:
+            encoded_inputs[position] = self.encoding_table.encode(encoder_name, inputs[position])
+        return encoded_inputs
+    
+    def encode_categorical_frame(self, data, model_type):
+        """Encode the categorical columns of a batch DataFrame"""
+        if model_type not in CATEGORICAL_FEATURES:
+            return data
+        
+        self._ensure_encoders()
+        encoded = data.copy()
+        for column, encoder_name, _ in CATEGORICAL_FEATURES[model_type]:
+            if column in encoded.columns and not pd.api.types.is_numeric_dtype(encoded[column]):
+                encoded[column] = self.encoding_table.encode_column(encoder_name, encoded[column])
+        return encoded
+
+def category_codes(values, encoder=None):
+    """Integer codes of a categorical column (Categorical codes, or a LabelEncoder's)"""
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        codes = values.cat.codes
+        if (codes < 0).any():
+            raise ValueError(f"Missing values in categorical column '{values.name}'")
+        return codes
+    return (encoder or LabelEncoder().fit(values)).transform(values)
+
+def _report(progress, model_type, results):
+    """Tell a training progress callback that one more model is done"""
+    if progress is not None:
+        progress(model_type, len(results), len(TRAINERS))
+
+def _limit_worker_threads(n_threads):
+    """Cap native thread pools in a training worker process"""
+    try:
+        from threadpoolctl import threadpool_limits
+        threadpool_limits(limits=n_threads)
+    except ImportError:
+        pass
+
+def _train_model_task(model_type, data, model_config, tuned_params=None):
+    """Train a single model in a worker process, with its tuned forest parameters if any"""
+    ml_models = CropMLModels()
+    ml_models.model_config = model_config
+    if tuned_params:
+        ml_models.tuned_params = {model_type: tuned_params}
+    result = getattr(ml_models, TRAINERS[model_type])(data)
+    return result, ml_models.encoders, ml_models.encoding_table, ml_models.fingerprints[model_type]
+
+class ForestTuner:
+    """Successive-halving search for the smallest forest that keeps accuracy"""
+    
+    def __init__(self, task, time_budget=None, tuning_config=None, random_state=None):
+        self.task = task
+        self.config = tuning_config or TUNING_CONFIG
+        self.time_budget = self.config['time_budget_seconds'] if time_budget is None else time_budget
+        self.random_state = MODEL_CONFIG['random_state'] if random_state is None else random_state
+        self.estimator_class = RandomForestRegressor if task == 'yield' else RandomForestClassifier
+    
+    def sample_candidates(self):
+        """Draw distinct parameter combinations from the search space"""
+        space = self.config['search_space']
+        names = sorted(space)
+        grid = list(itertools.product(*(space[name] for name in names)))
+        
+        rng = np.random.RandomState(self.random_state)
+        n_candidates = min(self.config['n_candidates'], len(grid))
+        picks = rng.choice(len(grid), n_candidates, replace=False)
+        return [dict(zip(names, grid[i])) for i in picks]
+    
+    def search(self, X, y):
+        """Run successive halving until the full dataset is reached or the budget runs out"""
+        start = time.perf_counter()
+        deadline = start + self.time_budget
+        eta = self.config['halving_factor']
+        
+        # A fixed shuffled row order, each round uses a longer prefix of it
+        order = np.random.RandomState(self.random_state).permutation(len(X))
+        n_rows = min(len(X), self.config['min_resources'])
+        
+        candidates = self.sample_candidates()
+        history = []
+        final_round = []
+        rounds = 0
+        budget_exhausted = False
+        
+        while candidates:
+            rows = order[:n_rows]
+            X_round, y_round = X.iloc[rows], y.iloc[rows]
+            scored = []
+            
+            for params in candidates:
+                if time.perf_counter() >= deadline:
+                    budget_exhausted = True
+                    break
+                score = self._cross_validate(params, X_round, y_round)
+                scored.append((score, params))
+                history.append({'round': rounds, 'rows': n_rows, 'score': score, 'params': params})
+            
+            rounds += 1
+            if scored:
+                final_round = scored
+            if budget_exhausted or n_rows >= len(X) or len(scored) <= 1:
+                break
+            
+            # Keep the best 1/eta candidates and give them eta times more rows
+            scored.sort(key=lambda item: item[0], reverse=True)
+            candidates = [params for _, params in scored[:max(1, math.ceil(len(scored) / eta))]]
+            n_rows = min(len(X), n_rows * eta)
+        
+        if not final_round:
+            raise ValueError(f"Time budget too small to evaluate any {self.task} candidate")
+        
+        best_params, best_score = self._select_smallest(final_round)
+        return {
+            'task': self.task,
+            'best_params': best_params,
+            'best_score': best_score,
+            'top_score': max(score for score, _ in final_round),
+            'rows': n_rows,
+            'rounds': rounds,
+            'evaluated': len(history),
+            'elapsed': time.perf_counter() - start,
+            'budget_exhausted': budget_exhausted,
+            'history': history
+        }
+    
+    def _cross_validate(self, params, X, y):
+        """Mean cross-validation score, with the folds run in parallel"""
+        estimator = self.estimator_class(random_state=self.random_state, n_jobs=1, **params)
+        folds = min(self.config['cv_folds'], len(X))
+        scores = cross_val_score(estimator, X, y, cv=folds, n_jobs=self.config['n_jobs'])
+        return float(np.mean(scores))
+    
+    def _select_smallest(self, scored):
+        """Cheapest candidate whose score is within tolerance of the best one"""
+        top_score = max(score for score, _ in scored)
+        eligible = [(score, params) for score, params in scored
+                    if score >= top_score - self.config['accuracy_tolerance']]
+        
+        # Trees times depth limit approximates both model size and prediction latency
+        def cost(item):
+            score, params = item
+            depth = params.get('max_depth') or self.config['unbounded_depth_cost']
+            return (params.get('n_estimators', MODEL_CONFIG['n_estimators']) * depth, -score)
+        
+        score, params = min(eligible, key=cost)
+        return params, score
@@ -0,0 +1,202 @@
+# model_registry.py - Persistent, Versioned Model Storage
+
+import os
+import json
+import pickle
+import shutil
+import hashlib
+from datetime import datetime
+import pandas as pd
+import sklearn
+from config import REGISTRY_CONFIG, MODEL_DATASETS
+
+MANIFEST_FILE = 'manifest.json'
+ENCODERS_FILE = 'encoders.pkl'
+ENCODING_TABLE_FILE = 'encoding_table.pkl'
+CURRENT_FILE = 'CURRENT'
+TUNED_PARAMS_FILE = 'tuned_params.json'
+
+def dataset_fingerprint(df):
+    """Content hash of a dataset (column names plus row values)"""
+    digest = hashlib.sha256()
+    digest.update('\x1f'.join(map(str, df.columns)).encode('utf-8'))
+    digest.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return digest.hexdigest()[:32]
+
+class ModelRegistry:
+    def __init__(self, root_dir=None):
+        self.root_dir = root_dir or REGISTRY_CONFIG['root_dir']
+        self.keep_versions = REGISTRY_CONFIG['keep_versions']
+        # The directory is created by the first save, so opening a registry writes nothing
+
+    def list_versions(self):
+        """List saved versions, oldest first"""
+        if not os.path.isdir(self.root_dir):
+            return []
+        versions = []
+        for name in os.listdir(self.root_dir):
+            if name.startswith('v') and name[1:].isdigit() and \
+                    os.path.exists(os.path.join(self.root_dir, name, MANIFEST_FILE)):
+                versions.append(name)
+        return sorted(versions, key=lambda name: int(name[1:]))
+
+    def get_current_version(self):
+        """Get the version predictions should be served from"""
+        current_path = os.path.join(self.root_dir, CURRENT_FILE)
+        if os.path.exists(current_path):
+            with open(current_path) as f:
+                version = f.read().strip()
+            if version in self.list_versions():
+                return version
+
+        versions = self.list_versions()
+        return versions[-1] if versions else None
+
+    def set_current_version(self, version):
+        """Point the registry at a saved version"""
+        if version not in self.list_versions():
+            raise ValueError(f"Model version '{version}' not found")
+        self._write_atomic(os.path.join(self.root_dir, CURRENT_FILE), version)
+
+    def save(self, ml_models, notes=''):
+        """Save all trained models and encoders as a new version"""
+        if not ml_models.models:
+            raise ValueError("No trained models to save")
+
+        versions = self.list_versions()
+        next_number = int(versions[-1][1:]) + 1 if versions else 1
+        version = f"v{next_number:04d}"
+
+        # Write into a staging directory and rename, so readers never see half a version
+        staging_dir = os.path.join(self.root_dir, f".{version}.tmp")
+        shutil.rmtree(staging_dir, ignore_errors=True)
+        os.makedirs(staging_dir)
+
+        for model_type, model in ml_models.models.items():
+            with open(os.path.join(staging_dir, f"{model_type}.pkl"), 'wb') as f:
+                pickle.dump(model, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        with open(os.path.join(staging_dir, ENCODERS_FILE), 'wb') as f:
+            pickle.dump(ml_models.encoders, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        with open(os.path.join(staging_dir, ENCODING_TABLE_FILE), 'wb') as f:
+            pickle.dump(ml_models.encoding_table, f, protocol=pickle.HIGHEST_PROTOCOL)
+
+        manifest = {
+            'version': version,
+            'created': datetime.now().strftime('%Y-%m-%d %H:%M:%S'),
+            'models': sorted(ml_models.models),
+            'config': dict(ml_models.model_config),
+            'fingerprints': dict(ml_models.fingerprints),
+            'row_counts': dict(ml_models.row_counts),
+            'tuned_params': dict(ml_models.tuned_params),
+            'sklearn_version': sklearn.__version__,
+            'notes': notes
+        }
+        with open(os.path.join(staging_dir, MANIFEST_FILE), 'w') as f:
+            json.dump(manifest, f, indent=2, default=str)
+
+        os.rename(staging_dir, os.path.join(self.root_dir, version))
+        self.set_current_version(version)
+        self._prune()
+        return version
+
+    def load_manifest(self, version=None):
+        """Load the manifest of a version (current version by default)"""
+        version = version or self.get_current_version()
+        if version is None:
+            raise ValueError("No saved model versions")
+        with open(os.path.join(self.root_dir, version, MANIFEST_FILE)) as f:
+            return json.load(f)
+
+    def load_model(self, model_type, version=None):
+        """Load one trained model from a version"""
+        version = version or self.get_current_version()
+        model_path = os.path.join(self.root_dir, version, f"{model_type}.pkl")
+        if not os.path.exists(model_path):
+            raise ValueError(f"{model_type.capitalize()} model not found in version {version}")
+        with open(model_path, 'rb') as f:
+            return pickle.load(f)
+
+    def load_encoders(self, version=None):
+        """Load the label encoders saved with a version"""
+        version = version or self.get_current_version()
+        with open(os.path.join(self.root_dir, version, ENCODERS_FILE), 'rb') as f:
+            return pickle.load(f)
+
+    def load_encoding_table(self, version=None):
+        """Load the categorical encoding table saved with a version, if any"""
+        version = version or self.get_current_version()
+        table_path = os.path.join(self.root_dir, version, ENCODING_TABLE_FILE)
+        if not os.path.exists(table_path):
+            return None
+        with open(table_path, 'rb') as f:
+            return pickle.load(f)
+
+    def find_version(self, data):
+        """Find a version trained on exactly these datasets, preferring the current one"""
+        fingerprints = {
+            model_type: dataset_fingerprint(data[dataset_name])
+            for model_type, dataset_name in MODEL_DATASETS.items()
+            if dataset_name in data
+        }
+
+        current = self.get_current_version()
+        candidates = [current] if current else []
+        candidates += [version for version in reversed(self.list_versions()) if version != current]
+
+        for version in candidates:
+            manifest = self.load_manifest(version)
+            if manifest['fingerprints'] == fingerprints:
+                return version
+        return None
+
+    def save_tuned_params(self, task, params, score):
+        """Record the winning hyperparameters of a tuning run for a task"""
+        tuned = self.load_tuned_params()
+        tuned[task] = {
+            'params': params,
+            'score': score,
+            'tuned': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        }
+        self._write_atomic(os.path.join(self.root_dir, TUNED_PARAMS_FILE), json.dumps(tuned, indent=2))
+
+    def load_tuned_params(self):
+        """Load tuned hyperparameters per task"""
+        tuned_path = os.path.join(self.root_dir, TUNED_PARAMS_FILE)
+        if not os.path.exists(tuned_path):
+            return {}
+        with open(tuned_path) as f:
+            return json.load(f)
+
+    def rollback(self, version=None):
+        """Make an older version current (the one before the current by default)"""
+        versions = self.list_versions()
+        current = self.get_current_version()
+
+        if version is None:
+            if current is None or versions.index(current) == 0:
+                raise ValueError("No previous model version to roll back to")
+            version = versions[versions.index(current) - 1]
+
+        self.set_current_version(version)
+        return version
+
+    def _prune(self):
+        """Delete the oldest versions beyond the retention limit"""
+        if not self.keep_versions:
+            return
+
+        current = self.get_current_version()
+        versions = self.list_versions()
+        for version in versions[:-self.keep_versions]:
+            if version != current:
+                shutil.rmtree(os.path.join(self.root_dir, version), ignore_errors=True)
+
+    def _write_atomic(self, path, content):
+        """Write a small text file atomically"""
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w') as f:
+            f.write(content)
+        os.replace(tmp_path, path)
@@ -0,0 +1,126 @@
+# prediction_cache.py - LRU Cache for Prediction Results
+
+import sys
+import threading
+from collections import OrderedDict
+from config import PREDICTION_CACHE_CONFIG
+
+# Rough per-entry bookkeeping cost (key tuple, dict, OrderedDict node)
+ENTRY_OVERHEAD_BYTES = 512
+
+class PredictionCache:
+    """Bounded LRU cache of prediction results, invalidated by the model generation"""
+
+    def __init__(self, max_entries=None, max_bytes=None, quantize_decimals=None, enabled=None):
+        config = PREDICTION_CACHE_CONFIG
+        self.enabled = config['enabled'] if enabled is None else enabled
+        self.max_entries = max_entries or config['max_entries']
+        self.max_bytes = max_bytes or config['max_bytes']
+        self.quantize_decimals = config['quantize_decimals'] if quantize_decimals is None else quantize_decimals
+
+        self.entries = OrderedDict()
+        self.generation = None
+        self.current_bytes = 0
+        self.lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self):
+        """Reset hit/miss counters"""
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def make_key(self, task, values):
+        """Normalized cache key for a task and its raw input values"""
+        return (task,) + tuple(self._normalize(value) for value in values)
+
+    def get(self, key, generation):
+        """Look up an entry, returning None on a miss"""
+        if not self.enabled:
+            return None
+
+        with self.lock:
+            self._check_generation(generation)
+            entry = self.entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return entry['value']
+
+    def put(self, key, generation, value):
+        """Store an entry, evicting least recently used entries to stay within bounds"""
+        if not self.enabled:
+            return
+
+        size = self._estimate_size(key, value)
+        if size > self.max_bytes:
+            return
+
+        with self.lock:
+            self._check_generation(generation)
+            if key in self.entries:
+                self.current_bytes -= self.entries.pop(key)['size']
+
+            self.entries[key] = {'value': value, 'size': size}
+            self.current_bytes += size
+
+            while len(self.entries) > self.max_entries or self.current_bytes > self.max_bytes:
+                _, evicted = self.entries.popitem(last=False)
+                self.current_bytes -= evicted['size']
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all entries"""
+        with self.lock:
+            self.entries.clear()
+            self.current_bytes = 0
+
+    def get_stats(self):
+        """Hit/miss statistics and current size"""
+        with self.lock:
+            lookups = self.hits + self.misses
+            return {
+                'enabled': self.enabled,
+                'entries': len(self.entries),
+                'bytes': self.current_bytes,
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0,
+                'evictions': self.evictions,
+                'invalidations': self.invalidations,
+                'generation': self.generation
+            }
+
+    def _check_generation(self, generation):
+        """Drop everything once the models have been retrained (caller holds the lock)"""
+        if generation != self.generation:
+            if self.entries:
+                self.invalidations += 1
+            self.entries.clear()
+            self.current_bytes = 0
+            self.generation = generation
+
+    def _normalize(self, value):
+        """Make equal numeric inputs produce equal keys (5 == 5.0, optional rounding)"""
+        if isinstance(value, str):
+            # Strings are keyed exactly as the model will see them; callers clean them first
+            return value
+        try:
+            number = float(value)
+        except (TypeError, ValueError):
+            return value
+        if self.quantize_decimals is not None:
+            number = round(number, self.quantize_decimals)
+        return number
+
+    def _estimate_size(self, key, value):
+        """Approximate memory held by an entry"""
+        size = ENTRY_OVERHEAD_BYTES + sys.getsizeof(key)
+        size += sum(sys.getsizeof(part) for part in key)
+        if isinstance(value, dict):
+            size += sum(sys.getsizeof(item) for item in value.values())
+        return size
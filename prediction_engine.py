@@ -1,10 +1,14 @@
 # prediction_engine.py - Prediction Logic and Results
 
+import pandas as pd
 from config import CROP_INFO, FERTILIZER_INFO, YIELD_RECOMMENDATIONS, DEFAULT_RECOMMENDATIONS
+from prediction_cache import PredictionCache
 
 class PredictionEngine:
-    def __init__(self, ml_models):
+    def __init__(self, ml_models, cache=None, prediction_log=None):
         self.ml_models = ml_models
+        self.cache = cache or PredictionCache()
+        self.prediction_log = prediction_log  # optional SQLiteStore recording each prediction
     
     def format_crop_results(self, prediction_data, inputs):
         """Format crop recommendation results"""
@@ -140,13 +144,11 @@ class PredictionEngine:
     def predict_crop(self, inputs):
         """Predict crop recommendation with formatted results"""
         try:
-            prediction_data = self.ml_models.predict_crop(inputs)
-            formatted_results = self.format_crop_results(prediction_data, inputs)
-            return {
-                'success': True,
-                'results': formatted_results,
-                'prediction': prediction_data['prediction']
-            }
+            return self._cached_predict(
+                'crop', inputs,
+                lambda: self.ml_models.predict_crop(inputs),
+                lambda prediction_data: self.format_crop_results(prediction_data, inputs)
+            )
         except Exception as e:
             return {
                 'success': False,
@@ -156,6 +158,7 @@ class PredictionEngine:
     def predict_fertilizer(self, categorical_inputs, numeric_inputs):
         """Predict fertilizer recommendation with formatted results"""
         try:
+            categorical_inputs = self._clean_categorical(categorical_inputs)
             # Prepare inputs for model
             inputs = [
                 numeric_inputs['temperature'], 
@@ -170,18 +173,17 @@ class PredictionEngine:
                 numeric_inputs['potassium']
             ])
             
-            # Encode categorical inputs
-            encoded_inputs = self.ml_models.encode_categorical_inputs(inputs, 'fertilizer')
-            prediction_data = self.ml_models.predict_fertilizer(encoded_inputs)
-            formatted_results = self.format_fertilizer_results(
-                prediction_data, categorical_inputs, numeric_inputs
-            )
+            def predict():
+                # Encode categorical inputs
+                encoded_inputs = self.ml_models.encode_categorical_inputs(inputs, 'fertilizer')
+                return self.ml_models.predict_fertilizer(encoded_inputs)
             
-            return {
-                'success': True,
-                'results': formatted_results,
-                'prediction': prediction_data['prediction']
-            }
+            return self._cached_predict(
+                'fertilizer', inputs, predict,
+                lambda prediction_data: self.format_fertilizer_results(
+                    prediction_data, categorical_inputs, numeric_inputs
+                )
+            )
         except Exception as e:
             return {
                 'success': False,
@@ -191,6 +193,7 @@ class PredictionEngine:
     def predict_yield(self, categorical_inputs, numeric_inputs):
         """Predict yield with formatted results"""
         try:
+            categorical_inputs = self._clean_categorical(categorical_inputs)
             # Prepare inputs for model
             inputs = [
                 categorical_inputs['state'],
@@ -201,20 +204,116 @@ class PredictionEngine:
                 numeric_inputs['production']
             ]
             
-            # Encode categorical inputs
-            encoded_inputs = self.ml_models.encode_categorical_inputs(inputs, 'yield')
-            prediction_data = self.ml_models.predict_yield(encoded_inputs)
-            formatted_results = self.format_yield_results(
-                prediction_data, categorical_inputs, numeric_inputs
-            )
+            def predict():
+                # Encode categorical inputs
+                encoded_inputs = self.ml_models.encode_categorical_inputs(inputs, 'yield')
+                return self.ml_models.predict_yield(encoded_inputs)
             
+            return self._cached_predict(
+                'yield', inputs, predict,
+                lambda prediction_data: self.format_yield_results(
+                    prediction_data, categorical_inputs, numeric_inputs
+                )
+            )
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    def _clean_categorical(self, categorical_inputs):
+        """Strip categorical values once so the cache key and the encoder see the same text"""
+        return {name: value.strip() if isinstance(value, str) else value
+                for name, value in categorical_inputs.items()}
+    
+    def _cached_predict(self, task, inputs, predict, format_results):
+        """Serve a prediction from the cache, running the model only on a miss"""
+        generation = self.ml_models.generation
+        key = self.cache.make_key(task, inputs)
+        entry = self.cache.get(key, generation)
+        
+        if entry is None:
+            prediction_data = predict()
+            formatted_results = format_results(prediction_data)
+            self.cache.put(key, generation, {
+                'inputs': tuple(inputs),
+                'prediction_data': prediction_data,
+                'results': formatted_results
+            })
+        else:
+            prediction_data = entry['prediction_data']
+            # Quantized keys can match slightly different inputs, whose text must show their own values
+            if entry['inputs'] == tuple(inputs):
+                formatted_results = entry['results']
+            else:
+                formatted_results = format_results(prediction_data)
+        
+        if self.prediction_log is not None:
+            self.prediction_log.log_prediction(task, inputs, prediction_data['prediction'], generation)
+        
+        return {
+            'success': True,
+            'results': formatted_results,
+            'prediction': prediction_data['prediction']
+        }
+    
+    def get_cache_stats(self):
+        """Get prediction cache hit/miss statistics"""
+        return self.cache.get_stats()
+    
+    def predict_crop_batch(self, inputs, top_k=3):
+        """Predict crop recommendations for a batch of soil samples"""
+        try:
+            prediction_data = self.ml_models.predict_crop_batch(inputs, top_k=top_k)
+            return {
+                'success': True,
+                'results': self._format_batch_results(prediction_data),
+                'prediction': prediction_data['predictions']
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    def predict_fertilizer_batch(self, inputs, top_k=3):
+        """Predict fertilizer recommendations for a batch of samples"""
+        try:
+            prediction_data = self.ml_models.predict_fertilizer_batch(inputs, top_k=top_k)
             return {
                 'success': True,
-                'results': formatted_results,
-                'prediction': prediction_data['prediction']
+                'results': self._format_batch_results(prediction_data),
+                'prediction': prediction_data['predictions']
             }
         except Exception as e:
             return {
                 'success': False,
                 'error': str(e)
-            }
\ No newline at end of file
+            }
+    
+    def predict_yield_batch(self, inputs):
+        """Predict yield for a batch of samples"""
+        try:
+            prediction_data = self.ml_models.predict_yield_batch(inputs)
+            return {
+                'success': True,
+                'results': self._format_batch_results(prediction_data),
+                'prediction': prediction_data['predictions']
+            }
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e)
+            }
+    
+    def _format_batch_results(self, prediction_data):
+        """Build a results table with one row per input sample"""
+        results = pd.DataFrame({'prediction': prediction_data['predictions']})
+        if 'confidences' in prediction_data:
+            results['confidence'] = prediction_data['confidences']
+            top_labels = prediction_data['top_k_labels']
+            top_probs = prediction_data['top_k_probabilities']
+            for rank in range(top_labels.shape[1]):
+                results[f'top_{rank + 1}'] = top_labels[:, rank]
+                results[f'top_{rank + 1}_probability'] = top_probs[:, rank]
+        return results
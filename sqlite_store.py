@@ -0,0 +1,212 @@
+# sqlite_store.py - Embedded SQLite Store for Datasets and Prediction History
+
+import json
+import sqlite3
+import threading
+from datetime import datetime
+import numpy as np
+import pandas as pd
+from config import SQLITE_CONFIG
+from data_schema import compact_frame
+from model_registry import dataset_fingerprint
+
+# Column types of prediction history frames, the same for every page
+PREDICTION_DTYPES = {'id': 'int64', 'timestamp': 'str', 'task': 'str', 'inputs': 'str',
+                     'prediction': 'str', 'model_generation': 'Int64'}
+
+def quote_identifier(name):
+    """Quote a table or column name for SQL"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+def sql_type(values):
+    """SQLite column type for a pandas column"""
+    if pd.api.types.is_bool_dtype(values) or pd.api.types.is_integer_dtype(values):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(values):
+        return 'REAL'
+    return 'TEXT'
+
+def sql_values(values):
+    """Column values as Python objects sqlite3 can bind (None for missing)"""
+    if pd.api.types.is_float_dtype(values):
+        array = values.to_numpy(dtype=np.float64, na_value=np.nan)
+        return [None if value != value else value for value in array.tolist()]
+    if isinstance(values.dtype, pd.CategoricalDtype):
+        # Convert each category once; code -1 (missing) picks the trailing None
+        labels = np.array([str(value) for value in values.cat.categories] + [None], dtype=object)
+        return labels[values.cat.codes.to_numpy()].tolist()
+    return values.astype(object).where(values.notna(), None).tolist()
+
+class SQLiteStore:
+    """Datasets as indexed SQLite tables, plus a log of the predictions made"""
+
+    def __init__(self, path=None):
+        self.path = path or SQLITE_CONFIG['path']
+        self.batch_rows = SQLITE_CONFIG['batch_rows']
+        self.indexed_columns = SQLITE_CONFIG['indexed_columns']
+        self.composite_indexes = SQLITE_CONFIG['composite_indexes']
+        # One connection shared by the GUI and worker threads, serialized by a lock
+        self.conn = sqlite3.connect(self.path, check_same_thread=False)
+        self.lock = threading.Lock()
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA synchronous=NORMAL")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS datasets (
+                    name TEXT PRIMARY KEY, hash TEXT, rows INTEGER, columns TEXT, saved TEXT
+                )""")
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS predictions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT, timestamp TEXT, task TEXT,
+                    inputs TEXT, prediction TEXT, model_generation INTEGER
+                )""")
+            self.conn.execute("CREATE INDEX IF NOT EXISTS idx_predictions_task ON predictions (task, id)")
+
+    def close(self):
+        self.conn.close()
+
+    def list_datasets(self):
+        """Names of the stored datasets"""
+        with self.lock:
+            return [row[0] for row in self.conn.execute("SELECT name FROM datasets ORDER BY name")]
+
+    def save_all(self, data):
+        """Write every dataset whose content changed since it was last stored
+
+        Returns the names of the datasets written and of those skipped as unchanged.
+        """
+        with self.lock:
+            stored = dict(self.conn.execute("SELECT name, hash FROM datasets").fetchall())
+        written, skipped = [], []
+        for name, df in data.items():
+            content_hash = dataset_fingerprint(df)
+            if stored.get(name) == content_hash:
+                skipped.append(name)
+                continue
+            self.write_dataset(name, df, content_hash)
+            written.append(name)
+        return {'written': written, 'skipped': skipped}
+
+    def write_dataset(self, name, df, content_hash=None):
+        """Replace a dataset's table in one transaction: bulk insert, then build the indexes"""
+        content_hash = content_hash or dataset_fingerprint(df)
+        table = quote_identifier(name)
+        columns = [str(column) for column in df.columns]
+        definitions = ', '.join(f"{quote_identifier(column)} {sql_type(df[column])}" for column in df.columns)
+        placeholders = ', '.join('?' * len(columns))
+
+        with self.lock, self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.execute(f"DROP TABLE IF EXISTS {table}")
+            self.conn.execute(f"CREATE TABLE {table} ({definitions})")
+            insert = f"INSERT INTO {table} VALUES ({placeholders})"
+            for start in range(0, len(df), self.batch_rows):
+                batch = df.iloc[start:start + self.batch_rows]
+                self.conn.executemany(insert, zip(*(sql_values(batch[column]) for column in batch.columns)))
+
+            # Indexes are cheaper to build once over the loaded rows than to maintain per insert
+            indexes = [(column,) for column in self.indexed_columns] + list(self.composite_indexes.get(name, []))
+            for index_columns in indexes:
+                if all(column in columns for column in index_columns):
+                    index_name = quote_identifier(f"idx_{name}_{'_'.join(index_columns)}")
+                    column_list = ', '.join(quote_identifier(column) for column in index_columns)
+                    self.conn.execute(f"CREATE INDEX {index_name} ON {table} ({column_list})")
+            self.conn.execute(f"ANALYZE {table}")
+            self.conn.execute(
+                "INSERT OR REPLACE INTO datasets (name, hash, rows, columns, saved) VALUES (?, ?, ?, ?, ?)",
+                (name, content_hash, len(df), json.dumps(columns), datetime.now().strftime('%Y-%m-%d %H:%M:%S'))
+            )
+
+    def drop_dataset(self, name):
+        with self.lock, self.conn:
+            self.conn.execute("BEGIN")
+            self.conn.execute(f"DROP TABLE IF EXISTS {quote_identifier(name)}")
+            self.conn.execute("DELETE FROM datasets WHERE name = ?", (name,))
+
+    def query(self, name, columns=None, **filters):
+        """Rows of a dataset matching column == value filters, e.g. query('yield', state='Punjab')"""
+        sql, params = self._select(name, columns, filters)
+        with self.lock:
+            cursor = self.conn.execute(sql, params)
+            rows = cursor.fetchall()
+            names = [description[0] for description in cursor.description]
+        return compact_frame(name, pd.DataFrame.from_records(rows, columns=names))
+
+    def aggregate(self, name, value, by, func='AVG', **filters):
+        """Aggregate of one column per group, computed inside SQLite"""
+        if func.upper() not in ('AVG', 'SUM', 'MIN', 'MAX', 'COUNT'):
+            raise ValueError(f"Unsupported aggregate: {func}")
+        group = quote_identifier(by)
+        where, params = self._where(filters)
+        sql = (f"SELECT {group}, {func.upper()}({quote_identifier(value)}) FROM {quote_identifier(name)}"
+               f"{where} GROUP BY {group}")
+        with self.lock:
+            rows = self.conn.execute(sql, params).fetchall()
+        return pd.Series([row[1] for row in rows], index=pd.Index([row[0] for row in rows], name=by), name=value)
+
+    def explain(self, name, columns=None, **filters):
+        """SQLite's query plan for a filtered query (shows which index is used)"""
+        sql, params = self._select(name, columns, filters)
+        with self.lock:
+            return [row[-1] for row in self.conn.execute(f"EXPLAIN QUERY PLAN {sql}", params)]
+
+    def log_prediction(self, task, inputs, prediction, model_generation=None):
+        """Append one prediction to the history"""
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO predictions (timestamp, task, inputs, prediction, model_generation) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (datetime.now().strftime('%Y-%m-%d %H:%M:%S'), task, json.dumps(list(inputs), default=str),
+                 str(prediction), model_generation)
+            )
+
+    def prediction_history(self, task=None, limit=100):
+        """Most recent predictions first"""
+        sql = "SELECT id, timestamp, task, inputs, prediction, model_generation FROM predictions"
+        params = []
+        if task is not None:
+            sql += " WHERE task = ?"
+            params.append(task)
+        sql += " ORDER BY id DESC LIMIT ?"
+        params.append(limit)
+        with self.lock:
+            return pd.read_sql_query(sql, self.conn, params=params).astype(PREDICTION_DTYPES)
+
+    def iter_predictions(self, task=None, chunk_rows=10000, after_id=0):
+        """Prediction history after an id, oldest first, as DataFrames of up to chunk_rows rows"""
+        sql = "SELECT id, timestamp, task, inputs, prediction, model_generation FROM predictions WHERE id > ?"
+        if task is not None:
+            sql += " AND task = ?"
+        sql += " ORDER BY id LIMIT ?"
+        last_id = after_id
+        while True:
+            # Page by id so the lock is only held for one chunk at a time
+            params = [last_id] + ([task] if task is not None else []) + [chunk_rows]
+            with self.lock:
+                cursor = self.conn.execute(sql, params)
+                rows = cursor.fetchall()
+                names = [description[0] for description in cursor.description]
+            if not rows:
+                return
+            yield pd.DataFrame.from_records(rows, columns=names).astype(PREDICTION_DTYPES)
+            last_id = rows[-1][0]
+
+    def count_predictions(self, task=None, after_id=0):
+        sql = "SELECT COUNT(*) FROM predictions WHERE id > ?"
+        params = [after_id]
+        if task is not None:
+            sql += " AND task = ?"
+            params.append(task)
+        with self.lock:
+            return self.conn.execute(sql, params).fetchone()[0]
+
+    def _select(self, name, columns, filters):
+        selected = ', '.join(quote_identifier(column) for column in columns) if columns else '*'
+        where, params = self._where(filters)
+        return f"SELECT {selected} FROM {quote_identifier(name)}{where}", params
+
+    def _where(self, filters):
+        if not filters:
+            return '', []
+        conditions = ' AND '.join(f"{quote_identifier(column)} = ?" for column in filters)
+        return f" WHERE {conditions}", list(filters.values())
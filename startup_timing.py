@@ -0,0 +1,85 @@
+# startup_timing.py - Startup Phase Timings and Import-Time Report
+
+import os
+import re
+import sys
+import time
+import threading
+import subprocess
+from config import STARTUP_CONFIG
+
+IMPORT_LINE = re.compile(r'import time:\s+(\d+)\s+\|\s+(\d+)\s+\|( +)(\S+)')
+
+class StartupTimer:
+    """Wall-clock time of each startup phase, measured from when the timer is created"""
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.last = self.start
+        self.phases = []  # (name, phase seconds, seconds since start)
+        self.lock = threading.Lock()
+
+    def mark(self, name):
+        """Record the end of a phase (callable from worker threads)"""
+        with self.lock:
+            now = time.perf_counter()
+            self.phases.append((name, now - self.last, now - self.start))
+            self.last = now
+
+    def format_report(self):
+        lines = ["Startup timings:"]
+        for name, phase, total in self.phases:
+            lines.append(f"  {name:<24} {phase * 1000:9.1f} ms   (at {total * 1000:9.1f} ms)")
+        return "\n".join(lines)
+
+def import_times(module='main_gui'):
+    """Cost of each import made by `import module` in a fresh interpreter, from python -X importtime
+
+    Returns (name, self_us, cumulative_us, depth) tuples in the order the imports finished.
+    """
+    result = subprocess.run([sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+                            capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        raise ValueError(f"Importing {module} failed: {result.stderr.strip().splitlines()[-1]}")
+
+    rows = []
+    for line in result.stderr.splitlines():
+        match = IMPORT_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, name = match.groups()
+            rows.append((name, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return rows
+
+def import_time_report(module='main_gui', top=15):
+    """Slowest direct imports of a module, and the deferred modules it pulled in anyway
+
+    Returns the report text and whether the import stayed within budget.
+    """
+    rows = import_times(module)
+    # A package's own imports finish just before it, so the module's direct imports are the
+    # depth-1 rows between the previous top-level row and the module's row
+    end = max(index for index, row in enumerate(rows) if row[0] == module and row[3] == 0)
+    start = max([index for index, row in enumerate(rows[:end]) if row[3] == 0], default=-1) + 1
+    direct = sorted((row for row in rows[start:end] if row[3] == 1), key=lambda row: row[2], reverse=True)
+    total_ms = rows[end][2] / 1000
+    loaded = {row[0] for row in rows}
+    eager = [name for name in STARTUP_CONFIG['deferred_modules'] if name in loaded]
+
+    lines = [f"Import time of {module}: {total_ms:.1f} ms (budget {STARTUP_CONFIG['import_budget_ms']} ms)"]
+    for name, _, cumulative_us, _ in direct[:top]:
+        lines.append(f"  {name:<32} {cumulative_us / 1000:9.1f} ms")
+    if eager:
+        lines.append(f"Imported at startup but should be deferred: {', '.join(eager)}")
+
+    ok = total_ms <= STARTUP_CONFIG['import_budget_ms'] and not eager
+    return "\n".join(lines), ok
+
+def main():
+    """Print the import-time report; exit status 1 flags a startup regression"""
+    module = sys.argv[1] if len(sys.argv) > 1 else 'main_gui'
+    report, ok = import_time_report(module)
+    print(report)
+    sys.exit(0 if ok else 1)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,195 @@
+# task_executor.py - Background Tasks with Tk-Thread Callbacks
+
+import queue
+import threading
+from config import TASK_CONFIG
+
+class TaskCancelled(Exception):
+    """Raised inside a task when it has been asked to stop"""
+
+class TaskContext:
+    """Passed to a thread task for progress reporting and cancellation checks"""
+
+    def __init__(self, task):
+        self._task = task
+
+    @property
+    def cancelled(self):
+        return self._task.cancel_event.is_set()
+
+    def check_cancelled(self):
+        """Stop the task here if cancel was requested"""
+        if self.cancelled:
+            raise TaskCancelled()
+
+    def report(self, message, fraction=None):
+        """Send a progress message (and optional 0-1 fraction) to the Tk thread"""
+        self._task.messages.put((message, fraction))
+
+def watch_job(job, poll_ms=None):
+    """Task function running a start/cancel job (CSV ingest, export) and relaying its progress
+
+    The job runs on its own thread; cancelling the task cancels the job, and the task
+    returns the finished job so its callback can check error, cancelled and result.
+    """
+    poll_seconds = (poll_ms or TASK_CONFIG['poll_ms']) / 1000
+
+    def watch(context):
+        if context.cancelled:
+            job.cancel()
+        job.start()
+        while not job.done_event.wait(poll_seconds):
+            if context.cancelled:
+                job.cancel()
+            context.report(None, job.progress)
+        return job
+    return watch
+
+class BackgroundTask:
+    """One job with its callbacks; the executor runs it and delivers its outcome"""
+
+    def __init__(self, name, func, args, kwargs, on_done=None, on_error=None, on_progress=None,
+                 on_cancel=None, widgets=(), use_process=False):
+        self.name = name
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.on_done = on_done
+        self.on_error = on_error
+        self.on_progress = on_progress
+        self.on_cancel = on_cancel
+        self.widgets = list(widgets)
+        self.use_process = use_process
+
+        self.state = 'pending'  # 'running', 'done', 'failed' or 'cancelled'
+        self.result = None
+        self.error = None
+        self.messages = queue.Queue()
+        self.cancel_event = threading.Event()
+        self.done_event = threading.Event()
+        self.thread = None
+
+    @property
+    def done(self):
+        return self.done_event.is_set()
+
+    def run(self):
+        """Run the job (worker thread entry point)"""
+        try:
+            if self.use_process:
+                from concurrent.futures import ProcessPoolExecutor
+                # Process tasks cannot report progress; a cancelled one finishes but its result is dropped
+                with ProcessPoolExecutor(max_workers=1) as pool:
+                    self.result = pool.submit(self.func, *self.args, **self.kwargs).result()
+                if self.cancel_event.is_set():
+                    raise TaskCancelled()
+            else:
+                self.result = self.func(TaskContext(self), *self.args, **self.kwargs)
+            self.state = 'done'
+        except TaskCancelled:
+            self.state = 'cancelled'
+        except Exception as e:
+            self.error = e
+            self.state = 'failed'
+        finally:
+            self.done_event.set()
+
+class TaskExecutor:
+    """Runs long jobs off the Tk thread and delivers progress and results through root.after polling
+
+    Callbacks always run on the Tk thread, so they may update widgets. Widgets passed with a
+    task are disabled while it runs.
+    """
+
+    def __init__(self, root, set_widget_state=None, poll_ms=None):
+        self.root = root
+        self.poll_ms = poll_ms or TASK_CONFIG['poll_ms']
+        self.set_widget_state = set_widget_state or (lambda widget, state: widget.config(state=state))
+        self.tasks = {}
+        self.held = []
+        self._polling = False
+
+    def submit(self, name, func, *args, on_done=None, on_error=None, on_progress=None, on_cancel=None,
+               widgets=(), use_process=False, **kwargs):
+        """Start func on a worker thread (as func(context, *args)) or in a worker process (as func(*args))
+
+        Returns the task, or None if a task with the same name is still running.
+        """
+        if self.is_running(name):
+            return None
+
+        task = BackgroundTask(name, func, args, kwargs, on_done, on_error, on_progress,
+                              on_cancel, widgets, use_process)
+        for widget in task.widgets:
+            self.set_widget_state(widget, 'disabled')
+        self.tasks[name] = task
+
+        task.state = 'running'
+        task.thread = threading.Thread(target=task.run, name=f"task-{name}", daemon=True)
+        task.thread.start()
+        self._schedule_poll()
+        return task
+
+    def is_running(self, name):
+        return name in self.tasks
+
+    def hold(self, widgets):
+        """Disable widgets created while tasks run; they are re-enabled once no task is running"""
+        if not self.tasks:
+            return
+        for widget in widgets:
+            self.set_widget_state(widget, 'disabled')
+        self.held.extend(widgets)
+
+    def cancel(self, name):
+        """Ask a running task to stop at its next cancellation check"""
+        task = self.tasks.get(name)
+        if task is not None:
+            task.cancel_event.set()
+
+    def cancel_all(self):
+        for name in list(self.tasks):
+            self.cancel(name)
+
+    def _schedule_poll(self):
+        if not self._polling:
+            self._polling = True
+            self.root.after(self.poll_ms, self.poll)
+
+    def poll(self):
+        """Deliver queued progress and finished results on the Tk thread"""
+        self._polling = False
+        for name, task in list(self.tasks.items()):
+            self._deliver_progress(task)
+            if task.done:
+                del self.tasks[name]
+                self._finish(task)
+        if self.tasks:
+            self._schedule_poll()
+        else:
+            self._release_held()
+
+    def _release_held(self):
+        for widget in self.held:
+            self.set_widget_state(widget, 'normal')
+        self.held = []
+
+    def _deliver_progress(self, task):
+        while True:
+            try:
+                message, fraction = task.messages.get_nowait()
+            except queue.Empty:
+                return
+            if task.on_progress is not None:
+                task.on_progress(message, fraction)
+
+    def _finish(self, task):
+        for widget in task.widgets:
+            self.set_widget_state(widget, 'normal')
+
+        if task.state == 'done' and task.on_done is not None:
+            task.on_done(task.result)
+        elif task.state == 'failed' and task.on_error is not None:
+            task.on_error(task.error)
+        elif task.state == 'cancelled' and task.on_cancel is not None:
+            task.on_cancel()
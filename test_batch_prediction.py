@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Test script to verify batch predictions match the single-row prediction path
+"""
+
+import numpy as np
+from data_generator import DataGenerator
+from ml_models import CropMLModels
+from prediction_engine import PredictionEngine
+
+def test_batch_matches_single_row():
+    """Test that batch predictions agree with row-by-row predictions"""
+    print("🌾 Testing Batch Predictions")
+    print("=" * 50)
+
+    data = DataGenerator().generate_all_data()
+    ml_models = CropMLModels()
+    ml_models.train_all_models(data)
+
+    # Crop model
+    crop_rows = data['crop_recommendation'].drop('label', axis=1).head(25)
+    batch = ml_models.predict_crop_batch(crop_rows, top_k=3)
+    for i, row in enumerate(crop_rows.values.tolist()):
+        single = ml_models.predict_crop(row)
+        assert batch['predictions'][i] == single['prediction']
+        assert batch['confidences'][i] == single['confidence']
+        assert batch['top_k_labels'][i][0] == single['all_probabilities'][0][0]
+    assert batch['top_k_probabilities'].shape == (25, 3)
+    print(f"✅ Crop batch matches {len(crop_rows)} single-row predictions")
+
+    # Fertilizer model, raw categorical columns are encoded on the way in
+    fert_rows = data['fertilizer'].drop('fertilizer', axis=1).head(25)
+    batch = ml_models.predict_fertilizer_batch(fert_rows)
+    for i, row in enumerate(fert_rows.values.tolist()):
+        encoded = ml_models.encode_categorical_inputs(row, 'fertilizer')
+        assert batch['predictions'][i] == ml_models.predict_fertilizer(encoded)['prediction']
+    print(f"✅ Fertilizer batch matches {len(fert_rows)} single-row predictions")
+
+    # Yield model
+    yield_rows = data['yield'].drop('yield', axis=1).head(25)
+    batch = ml_models.predict_yield_batch(yield_rows)
+    for i, row in enumerate(yield_rows.values.tolist()):
+        encoded = ml_models.encode_categorical_inputs(row, 'yield')
+        assert np.isclose(batch['predictions'][i], ml_models.predict_yield(encoded)['prediction'])
+    print(f"✅ Yield batch matches {len(yield_rows)} single-row predictions")
+
+    # Prediction engine entry point
+    engine = PredictionEngine(ml_models)
+    result = engine.predict_crop_batch(crop_rows.values)
+    assert result['success']
+    assert list(result['results'].columns[:3]) == ['prediction', 'confidence', 'top_1']
+    print("\n📊 Sample Batch Results")
+    print("=" * 50)
+    print(result['results'].head(5).to_string(index=False))
+
+if __name__ == "__main__":
+    test_batch_matches_single_row()
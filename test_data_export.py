@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Test script to verify streaming compressed export and appending to prediction files
+"""
+
+import os
+import importlib.util
+import tempfile
+import pandas as pd
+from config import EXPORT_CONFIG
+from data_generator import DataGenerator
+from data_manager import DataManager
+from data_export import resolve_export_format, read_export_csv, records_template
+
+def test_data_export():
+    """Test chunked CSV/gzip output, appends, rollback of failed appends and cancel"""
+    print("🌾 Testing Streaming Export")
+    print("=" * 50)
+
+    manager = DataManager()
+    manager.set_data(DataGenerator().generate_all_data())
+    crops = manager.data['crop_recommendation']
+
+    with tempfile.TemporaryDirectory() as tmp:
+        for name in ('crops.csv', 'crops.csv.gz'):
+            path = os.path.join(tmp, name)
+            job = manager.start_data_export(path, crops, chunk_rows=300)
+            job.start().wait()
+            exported = pd.read_csv(path)
+            assert len(exported) == len(crops) and job.progress == 1.0
+            assert exported['label'].tolist() == crops['label'].tolist()
+        assert resolve_export_format(os.path.join(tmp, 'crops.csv.gz')) == 'gzip'
+        print("✅ Chunked CSV and gzip exports read back intact")
+
+        path = os.path.join(tmp, 'predictions.csv.gz')
+        records = [{'task': 'crop', 'prediction': 'rice', 'confidence': 0.9}] * 5
+        manager.start_predictions_export(path, records, chunk_rows=2).start().wait()
+        manager.start_predictions_export(path, records, append=True).start().wait()
+        log = pd.read_csv(path)
+        assert len(log) == 10 and list(log.columns) == ['task', 'prediction', 'confidence', 'timestamp']
+        print("✅ Predictions appended to an existing compressed file")
+
+        size = os.path.getsize(path)
+        job = manager.start_predictions_export(path, [{'other': 1}], append=True)
+        job.run()
+        assert job.error is not None and os.path.getsize(path) == size
+        print("✅ Failed append rolled back to the original file")
+
+        if importlib.util.find_spec('zstandard') is None:
+            print("⚠️ zstandard not installed, skipping the zstd round trip")
+        else:
+            path = os.path.join(tmp, 'predictions.csv.zst')
+            manager.start_predictions_export(path, records, chunk_rows=2).start().wait()
+            with open(path, 'rb') as f:
+                first_frame = f.read()
+            manager.start_predictions_export(path, records, append=True).start().wait()
+            with open(path, 'rb') as f:
+                # The append adds a frame after the existing bytes instead of rewriting them
+                assert f.read(len(first_frame)) == first_frame and f.read()
+            job = manager.start_predictions_export(path, [{'other': 1}], append=True)
+            job.run()
+            assert job.error is not None
+            log = read_export_csv(path, 'zstd')
+            assert len(log) == 10 and list(log.columns) == ['task', 'prediction', 'confidence', 'timestamp']
+            print("✅ zstd append written as a new frame and read back across frames")
+
+        if importlib.util.find_spec('pyarrow') is None:
+            print("⚠️ pyarrow not installed, skipping the Parquet export")
+        else:
+            # The first chunk has only missing notes and whole-number counts; later chunks do not
+            records = ([{'task': 'yield', 'note': None, 'count': 1}] * 3 +
+                       [{'task': 'yield', 'note': 'late frost', 'count': None}] * 3)
+            path = os.path.join(tmp, 'predictions.parquet')
+            manager.start_predictions_export(path, records, chunk_rows=3).start().wait()
+            exported = pd.read_parquet(path)
+            assert exported['note'].tolist()[-1] == 'late frost' and exported['count'].isna().sum() == 3
+            print("✅ Parquet column types come from a sample of the records, not the first chunk")
+
+            # The sample is bounded, and a column missing from it is still written as text
+            many = ([{'task': 'crop', 'note': None, 'confidence': 0.5}] * 5000 +
+                    [{'task': 'crop', 'note': 'x', 'confidence': 0.5}])
+            assert len(records_template(many, sample_rows=100)) <= 100
+            sample_rows = EXPORT_CONFIG['schema_sample_rows']
+            EXPORT_CONFIG['schema_sample_rows'] = 100
+            try:
+                path = os.path.join(tmp, 'many.parquet')
+                manager.start_predictions_export(path, many, chunk_rows=1000).start().wait()
+            finally:
+                EXPORT_CONFIG['schema_sample_rows'] = sample_rows
+            assert pd.read_parquet(path)['note'].tolist()[-1] == 'x'
+            print("✅ Parquet schema sample stays bounded")
+
+        path = os.path.join(tmp, 'cancelled.csv')
+        job = manager.start_data_export(path, crops)
+        job.cancel()
+        job.run()
+        assert job.error is None and not os.path.exists(path)
+        print("✅ Cancelled export leaves no partial file")
+
+    print("🎉 All export tests passed!")
+
+if __name__ == "__main__":
+    test_data_export()
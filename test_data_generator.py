@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Test script to verify chunked data generation is deterministic across worker counts
+"""
+
+from config import CATEGORY_SETS
+from data_generator import DataGenerator, DATASETS
+from data_schema import compact_frame, memory_report
+from ml_models import CropMLModels
+
+def test_chunked_generation():
+    """Test that chunked output does not depend on the number of workers"""
+    print("🌾 Testing Chunked Data Generation")
+    print("=" * 50)
+
+    generator = DataGenerator()
+    for dataset in DATASETS:
+        sequential = generator.generate_dataset(dataset, 5000, chunk_size=1200, workers=1)
+        parallel = generator.generate_dataset(dataset, 5000, chunk_size=1200, workers=2)
+        assert len(sequential) == 5000
+        assert list(sequential.index) == list(range(5000))
+        assert sequential.equals(parallel)
+        print(f"✅ {dataset}: identical output with 1 and 2 workers")
+
+    # Chunks arrive one at a time, each starting where the previous one ended
+    chunks = list(generator.generate_chunks('crop_recommendation', 2500, chunk_size=1000))
+    assert [len(chunk) for chunk in chunks] == [1000, 1000, 500]
+    assert chunks[1].index[0] == 1000
+    print("✅ Chunks are streamed in order")
+
+    # A different seed gives different data
+    other = generator.generate_dataset('crop_recommendation', 5000, chunk_size=1200, seed=7)
+    assert not other.equals(generator.generate_dataset('crop_recommendation', 5000, chunk_size=1200))
+    print("✅ Seed controls the generated data")
+
+    print("🎉 All chunked generation tests passed!")
+
+def test_compact_dtypes():
+    """Test float32/Categorical columns, memory savings and training on category codes"""
+    print("🌾 Testing Compact Dtypes")
+    print("=" * 50)
+
+    data = DataGenerator().generate_all_data()
+    yield_data = data['yield']
+    assert str(yield_data['area'].dtype) == 'float32'
+    for column in ('state', 'district', 'season', 'crop'):
+        assert list(yield_data[column].cat.categories) == CATEGORY_SETS[column]
+    print("✅ Measurements are float32, text columns use the configured categories")
+
+    report = memory_report(data)
+    assert all(info['saved_bytes'] > 0 for info in report.values())
+    print(f"✅ Memory saved: {sum(info['saved_bytes'] for info in report.values()):,} bytes")
+
+    # Unknown categories in loaded data are kept, not turned into NaN
+    loaded = compact_frame('yield', yield_data.astype({'state': object}).head(10).assign(state='Kerala'))
+    assert 'Kerala' in loaded['state'].cat.categories and loaded['state'].notna().all()
+    print("✅ Unknown categories are preserved")
+
+    ml_models = CropMLModels()
+    ml_models.train_yield_model(yield_data)
+    assert list(ml_models.encoders['district'].classes_) == CATEGORY_SETS['district']
+    print("✅ Training reuses the category codes")
+
+    print("🎉 All compact dtype tests passed!")
+
+if __name__ == "__main__":
+    test_chunked_generation()
+    test_compact_dtypes()
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Test script to verify cached dataset profiling and incremental updates on append
+"""
+
+import numpy as np
+from data_generator import DataGenerator
+from data_manager import DataManager
+from data_profile import DatasetProfile
+
+def test_data_profile():
+    """Test profile statistics, caching per version and incremental appends"""
+    print("🌾 Testing Data Profiling")
+    print("=" * 50)
+
+    data = DataGenerator().generate_all_data()
+    manager = DataManager()
+    manager.set_data(data)
+    assert manager.profiler.scans == len(data)
+
+    profile = manager.get_profile('crop_recommendation')
+    assert profile.rows == 1000
+    assert profile.columns['ph'].min == float(data['crop_recommendation']['ph'].min())
+    assert profile.columns['label'].histogram == data['crop_recommendation']['label'].value_counts().loc[
+        lambda counts: counts > 0].to_dict()
+    print("✅ Statistics match the data")
+
+    manager.get_data_summary()
+    manager.validate_data_for_training()
+    manager.set_data(manager.data)
+    assert manager.profiler.scans == len(data)
+    print("✅ Summary, validation and unchanged data reuse the cached profiles")
+
+    extra = DataGenerator().generate_yield_data().head(50)
+    extra.loc[extra.index[0], 'area'] = np.nan
+    manager.append_data('yield', extra)
+    assert manager.profiler.scans == len(data)
+
+    appended = manager.get_profile('yield').to_frame()
+    rescanned = DatasetProfile.from_frame(manager.data['yield']).to_frame()
+    assert appended.drop(columns='mean').equals(rescanned.drop(columns='mean'))
+    assert np.allclose(appended['mean'].astype(float), rescanned['mean'].astype(float), equal_nan=True)
+    assert manager.data_info['yield']['samples'] == 1050
+    assert manager.data_info['yield']['missing_values'] == 1
+    print("✅ Append updated the profile without rescanning")
+
+    print("🎉 All data profiling tests passed!")
+
+if __name__ == "__main__":
+    test_data_profile()
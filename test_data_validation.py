@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script to verify row-level schema validation and quarantining of bad rows
+"""
+
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+from data_generator import DataGenerator
+from data_manager import DataManager
+from data_validation import validate_frame, validate_csv
+
+def test_data_validation():
+    """Test range, type and category checks, the report and quarantine"""
+    print("🌾 Testing Row-Level Validation")
+    print("=" * 50)
+
+    data = DataGenerator().generate_all_data()
+    for name, df in data.items():
+        assert validate_frame(name, df).valid, name
+    print("✅ Generated datasets pass validation")
+
+    crops = data['crop_recommendation'].copy()
+    crops.loc[[3, 700], 'ph'] = 40.0
+    crops.loc[10, 'rainfall'] = -5.0
+    crops.loc[20, 'N'] = np.nan
+    crops['label'] = crops['label'].cat.add_categories(['banana'])
+    crops.loc[3, 'label'] = 'banana'
+
+    report = validate_frame('crop_recommendation', crops, chunk_rows=256)
+    assert report.bad_rows.tolist() == [3, 10, 20, 700]
+    assert report.rule_counts == {'ph:above_max': 2, 'rainfall:below_min': 1, 'N:missing': 1}
+    assert report.examples['ph:above_max'] == [(3, 40.0), (700, 40.0)]
+    print(f"✅ Report: {report.summary()}")
+
+    # Labels outside the display set are real crops, checked only against a given label set
+    trained = sorted(data['crop_recommendation']['label'].unique())
+    report = validate_frame('crop_recommendation', crops, known_labels=trained)
+    assert report.rule_counts['label:unknown_category'] == 1
+    assert report.examples['label:unknown_category'] == [(3, 'banana')]
+    print("✅ Unknown labels flagged only against known labels")
+
+    # A district outside the configured list warns but does not block training
+    yields = data['yield'].copy()
+    yields['district'] = yields['district'].astype(object)
+    yields.loc[[5, 6], 'district'] = 'Nashik'
+    report = validate_frame('yield', yields)
+    assert report.valid and report.bad_row_count == 0
+    assert report.warning_counts == {'district:unknown_category': 2, 'district:not_in_state': 2}
+    assert 'warnings' in report.summary()
+    strict = validate_frame('yield', yields, strict=True)
+    assert strict.bad_rows.tolist() == [5, 6]
+    checker = DataManager()
+    checker.set_data({**data, 'yield': yields})
+    result = checker.validate_data_for_training()['yield']
+    assert result['valid'] and result['warnings']['district:unknown_category'] == 2
+    assert checker.quarantine_invalid_rows() == {}
+    print("✅ Unknown feature categories only warn unless strict")
+
+    manager = DataManager()
+    manager.set_data({**data, 'crop_recommendation': crops})
+    results = manager.validate_data_for_training()
+    assert not results['crop_recommendation']['valid']
+    assert results['crop_recommendation']['invalid_rows'] == 4
+
+    with tempfile.TemporaryDirectory() as tmp:
+        assert manager.quarantine_invalid_rows(output_dir=tmp) == {'crop_recommendation': 4}
+        saved = pd.read_csv(os.path.join(tmp, 'crop_recommendation_quarantine.csv'), index_col='row')
+        assert saved.index.tolist() == [3, 10, 20, 700]
+    assert len(manager.data['crop_recommendation']) == 996
+    assert manager.validate_data_for_training()['crop_recommendation']['valid']
+    print("✅ Invalid rows quarantined before training")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, 'crops.csv')
+        crops.to_csv(source, index=False)
+        clean_path = os.path.join(tmp, 'clean.csv')
+        quarantine_path = os.path.join(tmp, 'quarantine.csv')
+        report = validate_csv(source, 'crop_recommendation', clean_path, quarantine_path, chunk_rows=300)
+        assert report.bad_rows.tolist() == [3, 10, 20, 700]
+        assert len(pd.read_csv(clean_path)) == 996
+        assert pd.read_csv(quarantine_path)['row'].tolist() == [3, 10, 20, 700]
+    print("✅ Streaming CSV validation split clean and quarantined rows")
+
+    print("🎉 All validation tests passed!")
+
+if __name__ == "__main__":
+    test_data_validation()
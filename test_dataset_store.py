@@ -0,0 +1,81 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the columnar dataset store and incremental backups
+"""
+
+import os
+import mmap
+import tempfile
+import numpy as np
+import pandas as pd
+from data_generator import DataGenerator
+from dataset_store import DatasetStore, FEATHER_FILE, resolve_store_format
+
+def is_memory_mapped(array):
+    """Whether an array's memory comes from a memory-mapped file"""
+    while array is not None:
+        if isinstance(array, (np.memmap, mmap.mmap)):
+            return True
+        array = getattr(array, 'base', None)
+    return False
+
+def maps_file(array, file_path):
+    """Whether an array's data lies in a memory mapping of file_path (None where /proc is missing)"""
+    if not os.path.exists('/proc/self/maps'):
+        return None
+    address = array.__array_interface__['data'][0]
+    real_path = os.path.realpath(file_path)
+    with open('/proc/self/maps') as f:
+        for line in f:
+            fields = line.split(None, 5)
+            if len(fields) == 6 and os.path.realpath(fields[5].strip()) == real_path:
+                start, end = (int(bound, 16) for bound in fields[0].split('-'))
+                if start <= address < end:
+                    return True
+    return False
+
+def test_dataset_store_round_trip():
+    """Test that datasets reopen memory-mapped with their dtypes, and only changes are rewritten"""
+    print("🌾 Testing Dataset Store")
+    print("=" * 50)
+
+    data = DataGenerator().generate_all_data()
+    data['notes'] = pd.DataFrame({'id': [1, 2, 3], 'text': ['a', None, 'c']})
+
+    with tempfile.TemporaryDirectory() as root_dir:
+        store = DatasetStore(root_dir, fmt='npy')
+        result = store.save_all(data)
+        assert sorted(result['written']) == sorted(data)
+        print(f"✅ Wrote datasets: {result['written']}")
+
+        loaded = store.load_all()
+        for name, df in data.items():
+            assert loaded[name].equals(df), name
+        assert is_memory_mapped(loaded['yield']['area'].to_numpy())
+        print("✅ Reopened datasets match, with dtypes and memory-mapped columns")
+
+        if resolve_store_format() == 'feather':
+            feather_store = DatasetStore(os.path.join(root_dir, 'feather'), fmt='feather')
+            feather_store.save_all(data)
+            loaded = feather_store.load_all()
+            for name, df in data.items():
+                assert loaded[name].equals(df), name
+            entry = feather_store.load_manifest()['datasets']['yield']
+            feather_path = os.path.join(feather_store.root_dir, entry['path'], FEATHER_FILE)
+            area = loaded['yield']['area'].to_numpy()
+            assert not area.flags.owndata and maps_file(area, feather_path) in (True, None)
+            print("✅ Feather datasets reopen with numeric columns left in the mapped file")
+        else:
+            print("⚠️ pyarrow not installed, skipping the Feather store")
+
+        changed = dict(data)
+        changed['fertilizer'] = data['fertilizer'].head(100)
+        result = store.save_all(changed)
+        assert result['written'] == ['fertilizer']
+        assert len(store.load('fertilizer')) == 100
+        print(f"✅ Incremental backup rewrote only {result['written']}, skipped {result['skipped']}")
+
+    print("🎉 All dataset store tests passed!")
+
+if __name__ == "__main__":
+    test_dataset_store_round_trip()
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""
+Test script to verify directory ingestion with schema routing, deduplication and the checksum ledger
+"""
+
+import os
+import tempfile
+from data_generator import DataGenerator
+from data_manager import DataManager
+from directory_ingest import ingest_directory
+
+def test_directory_ingest():
+    """Test routing by columns, row deduplication and skipping of files already loaded"""
+    print("🌾 Testing Directory Ingestion")
+    print("=" * 50)
+
+    data = DataGenerator().generate_all_data()
+    with tempfile.TemporaryDirectory() as tmp:
+        # Names say nothing about the content; columns decide the dataset
+        data['crop_recommendation'].iloc[:600].to_csv(os.path.join(tmp, 'office_a.csv'), index=False)
+        data['crop_recommendation'].iloc[400:].to_csv(os.path.join(tmp, 'office_b.csv'), index=False)
+        data['yield'].iloc[:, ::-1].to_csv(os.path.join(tmp, 'daily.csv'), index=False)
+        data['yield'].to_csv(os.path.join(tmp, 'daily_copy.csv'), index=False)
+        data['fertilizer'][['temperature', 'humidity']].to_csv(os.path.join(tmp, 'notes.csv'), index=False)
+
+        result = ingest_directory(tmp, workers=3)
+        assert sorted(result['data']) == ['crop_recommendation', 'yield']
+        assert result['unrecognized'] == ['notes.csv']
+        assert len(result['data']['crop_recommendation']) == 1000
+        assert result['duplicates'] == {'crop_recommendation': 200, 'yield': 1000}
+        print(f"✅ Routed {len(result['files'])} files by columns, dropped duplicate rows")
+
+        manager = DataManager()
+        manager.set_data({'crop_recommendation': data['crop_recommendation']})
+        success, message = manager.load_directory(tmp)
+        assert success, message
+        assert len(manager.data['crop_recommendation']) == 1000
+        assert len(manager.data['yield']) == 1000
+        print(f"✅ {message}")
+
+        success, message = manager.load_directory(tmp)
+        assert success and "0 file(s)" in message and "4 already loaded" in message
+        data['fertilizer'].to_csv(os.path.join(tmp, 'new_day.csv'), index=False)
+        manager.load_directory(tmp)
+        assert len(manager.data['fertilizer']) == 1000 and len(manager.data['yield']) == 1000
+        print("✅ Files in the ledger are not read again")
+
+    print("🎉 All directory ingestion tests passed!")
+
+if __name__ == "__main__":
+    test_directory_ingest()
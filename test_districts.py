@@ -3,8 +3,14 @@
 Test script to verify state-district mapping functionality
 """
 
+import os
+import time
 from config import STATE_DISTRICT_MAPPING
 from data_generator import DataGenerator
+from data_validation import check_referential_integrity, describe_integrity, validate_frame
+
+# Rows in the large-dataset check; set AGRI_LARGE_TESTS=1 for the full million-row run
+LARGE_ROWS = 1_000_000 if os.environ.get('AGRI_LARGE_TESTS') else 20_000
 
 def test_state_district_mapping():
     """Test the state-district mapping"""
@@ -33,20 +39,32 @@ def test_state_district_mapping():
     print("\n🔍 Checking State-District Consistency")
     print("=" * 50)
     
-    inconsistencies = []
-    for _, row in yield_data.iterrows():
-        state = row['state']
-        district = row['district']
-        if state in STATE_DISTRICT_MAPPING:
-            if district not in STATE_DISTRICT_MAPPING[state]:
-                inconsistencies.append(f"State: {state}, District: {district}")
-    
-    if inconsistencies:
+    mismatches = check_referential_integrity('yield', yield_data)[('state', 'district')]
+    if not mismatches.empty:
         print("❌ Found inconsistencies:")
-        for inc in inconsistencies[:10]:  # Show first 10
-            print(f"   {inc}")
+        print(mismatches.head(10).to_string(index=False))
     else:
         print("✅ All state-district combinations are valid!")
+    assert mismatches.empty
+    
+    # A district moved to the wrong state is reported with its row count
+    broken = yield_data.copy()
+    broken['district'] = broken['district'].astype(object)
+    broken.loc[broken.index[:3], ['state', 'district']] = ['Punjab', 'Patna']
+    mismatches = check_referential_integrity('yield', broken)[('state', 'district')]
+    assert mismatches.to_dict('records') == [{'state': 'Punjab', 'district': 'Patna', 'rows': 3}]
+    report = validate_frame('yield', broken)
+    assert report.valid and report.warning_counts == {'district:not_in_state': 3}
+    assert validate_frame('yield', broken, strict=True).rule_counts == {'district:not_in_state': 3}
+    print(f"✅ Detected: {describe_integrity({('state', 'district'): mismatches})}")
+    
+    # Large datasets are checked through category codes, without a per-row loop
+    large = generator.generate_dataset('yield', LARGE_ROWS)
+    start = time.perf_counter()
+    mismatches = check_referential_integrity('yield', large)[('state', 'district')]
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    assert mismatches.empty
+    print(f"✅ Checked {len(large):,} rows in {elapsed_ms:.1f} ms")
     
     # Show sample data
     print("\n📊 Sample Generated Data")
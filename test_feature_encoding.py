@@ -0,0 +1,52 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the categorical encoding table and unseen-category policies
+"""
+
+import warnings
+import numpy as np
+from sklearn.preprocessing import LabelEncoder
+from config import STATE_DISTRICT_MAPPING
+from feature_encoding import CategoryEncoding, EncodingTable
+
+def test_encoding_table_policies():
+    """Test encoding matches LabelEncoder and unseen categories follow the policy"""
+    print("🌾 Testing Categorical Encoding Table")
+    print("=" * 50)
+
+    districts = np.array([d for ds in STATE_DISTRICT_MAPPING.values() for d in ds] + ['Ludhiana'] * 5)
+    encoder = LabelEncoder()
+    codes = encoder.fit_transform(districts)
+
+    table = EncodingTable('error')
+    table.add('district', CategoryEncoding.from_label_encoder(encoder, codes))
+
+    # Same codes as LabelEncoder, one value and a whole column
+    assert table.encode('district', 'Patna') == encoder.transform(['Patna'])[0]
+    assert np.array_equal(table.encode_column('district', districts), codes)
+    print("✅ Codes match LabelEncoder")
+
+    try:
+        table.encode('district', 'Ludhiyana')
+        assert False, "unseen category should raise under the 'error' policy"
+    except ValueError as e:
+        print(f"✅ error policy: {e}")
+
+    table.policy = 'fallback'
+    ludhiana = encoder.transform(['Ludhiana'])[0]
+    assert table.encode('district', 'Nagpur') == ludhiana
+    print("✅ fallback policy uses the most frequent district")
+
+    table.policy = 'nearest'
+    column = np.array(['Patna', 'Ludhiyana', None, 'Amritsar'], dtype=object)
+    with warnings.catch_warnings():
+        # Unseen values must not go through deprecated pandas paths
+        warnings.simplefilter('error')
+        encoded = table.encode_column('district', column)
+    assert encoded[1] == ludhiana
+    assert encoded[2] == ludhiana
+    assert list(encoded[[0, 3]]) == list(encoder.transform(['Patna', 'Amritsar']))
+    print(f"✅ nearest policy maps 'Ludhiyana' to Ludhiana, unseen counts: {table.unseen_counts()}")
+
+if __name__ == "__main__":
+    test_encoding_table_policies()
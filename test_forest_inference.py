@@ -0,0 +1,62 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the flattened forest engine reproduces sklearn exactly
+"""
+
+import numpy as np
+from data_generator import DataGenerator
+from ml_models import CropMLModels
+
+def test_flat_forest_matches_sklearn():
+    """Test flat inference against sklearn and report the latency comparison"""
+    print("🌾 Testing Flattened Forest Inference")
+    print("=" * 50)
+
+    data = DataGenerator().generate_all_data()
+    ml_models = CropMLModels()
+    ml_models.train_all_models(data)
+
+    samples = {
+        'crop': data['crop_recommendation'].drop('label', axis=1),
+        'fertilizer': ml_models.encode_categorical_frame(
+            data['fertilizer'].drop('fertilizer', axis=1), 'fertilizer'),
+        'yield': ml_models.encode_categorical_frame(data['yield'].drop('yield', axis=1), 'yield')
+    }
+
+    for model_type, X in samples.items():
+        ml_models.set_inference_engine(model_type, 'sklearn')
+        model = ml_models.models[model_type]
+        if model_type == 'yield':
+            expected = model.predict(X)
+            ml_models.set_inference_engine(model_type, 'flat')
+            actual = ml_models._get_predictor(model_type).predict(X)
+        else:
+            expected = model.predict_proba(X)
+            ml_models.set_inference_engine(model_type, 'flat')
+            actual = ml_models._get_predictor(model_type).predict_proba(X)
+
+        # Bit-identical, not just close
+        assert np.array_equal(expected, actual), f"{model_type} outputs differ"
+
+        timings = ml_models.compare_inference_engines(model_type, X.head(1000), repeats=5)
+        assert timings['identical']
+        print(f"✅ {model_type:10} identical | single row: "
+              f"sklearn {timings['single_row_sklearn_ms']:.2f}ms vs flat {timings['single_row_flat_ms']:.2f}ms | "
+              f"{timings['batch_rows']} rows: sklearn {timings['batch_sklearn_ms']:.2f}ms vs "
+              f"flat {timings['batch_flat_ms']:.2f}ms")
+
+    # Missing values follow sklearn's learned missing-value direction
+    crop_rows = np.array(samples['crop'].head(50), dtype=float)
+    crop_rows[::3, 2] = np.nan
+    ml_models.set_inference_engine('crop', 'flat')
+    assert np.array_equal(ml_models.models['crop'].predict_proba(crop_rows),
+                          ml_models._get_predictor('crop').predict_proba(crop_rows))
+    print("✅ Missing values routed identically")
+
+    # Single-row predictions go through the selected engine
+    single = ml_models.predict_crop(samples['crop'].iloc[0].tolist())
+    assert single['prediction'] in ml_models.models['crop'].classes_
+    print(f"✅ Single-row flat prediction: {single['prediction']} ({single['confidence']*100:.1f}%)")
+
+if __name__ == "__main__":
+    test_flat_forest_matches_sklearn()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Test script to verify incremental retraining: skipped, extended and rebuilt models
+"""
+
+import pandas as pd
+from data_generator import DataGenerator
+from ml_models import CropMLModels
+
+def test_incremental_retrain():
+    """Test the skip, extend and rebuild decisions and appended-row detection"""
+    print("🌾 Testing Incremental Retraining")
+    print("=" * 50)
+
+    data = DataGenerator().generate_all_data()
+    ml_models = CropMLModels()
+    ml_models.train_all_models(data)
+    trees = len(ml_models.models['crop'].estimators_)
+
+    results = ml_models.retrain_incremental(data)
+    assert {result['action'] for result in results.values()} == {'skipped'}
+    print("✅ Unchanged datasets skip retraining")
+
+    crops = data['crop_recommendation']
+    extra = crops.sample(300, random_state=1)
+    grown = dict(data)
+    grown['crop_recommendation'] = pd.concat([crops, extra], ignore_index=True)
+    appended = ml_models._get_appended_rows('crop', grown['crop_recommendation'])
+    assert len(appended) == 300 and appended.index[0] == len(crops)
+
+    # Editing an earlier row invalidates the appended-row shortcut
+    fertilizer = data['fertilizer'].copy()
+    fertilizer.loc[0, 'temperature'] += 1
+    grown['fertilizer'] = pd.concat([fertilizer, data['fertilizer'].head(50)], ignore_index=True)
+    assert ml_models._get_appended_rows('fertilizer', grown['fertilizer']) is None
+    print("✅ Appended rows detected only when the trained rows are unchanged")
+
+    generation = ml_models.generation
+    results = ml_models.retrain_incremental(grown)
+    crop = results['crop']
+    assert crop['action'] == 'extended' and crop['appended_rows'] == 300
+    assert crop['total_trees'] == trees + crop['added_trees'] and crop['added_trees'] >= 10
+    assert 0.0 <= crop['appended_test_accuracy'] <= 1.0 and 'appended_accuracy' not in crop
+    assert results['fertilizer']['action'] == 'rebuilt' and 'test_accuracy' in results['fertilizer']
+    assert results['yield']['action'] == 'skipped'
+    assert ml_models.generation == generation + 2
+    assert ml_models.retrain_incremental(grown)['crop']['action'] == 'skipped'
+    print(f"✅ Extended crop model (+{crop['added_trees']} trees, held-out accuracy "
+          f"{crop['appended_test_accuracy']:.3f}), rebuilt fertilizer, skipped yield")
+
+    print("🎉 All incremental retraining tests passed!")
+
+if __name__ == "__main__":
+    test_incremental_retrain()
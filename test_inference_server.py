@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the local inference service: batching, health and error responses
+"""
+
+import asyncio
+import json
+from data_generator import DataGenerator
+from ml_models import CropMLModels
+from inference_server import InferenceServer
+
+YIELD_ROW = {'state': 'Punjab', 'district': 'Ludhiana', 'season': 'Rabi', 'crop': 'Wheat',
+             'area': 120.0, 'production': 480.0}
+
+async def request(port, method, path, payload=None, raw_body=None):
+    """Send one HTTP request and return (status, JSON body)"""
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    body = raw_body if raw_body is not None else json.dumps(payload or {}).encode('utf-8')
+    writer.write((f"{method} {path} HTTP/1.1\r\nHost: localhost\r\nConnection: close\r\n"
+                  f"Content-Length: {len(body)}\r\n\r\n").encode('latin-1') + body)
+    await writer.drain()
+    response = await reader.read()
+    writer.close()
+    head, _, content = response.partition(b'\r\n\r\n')
+    return int(head.split()[1]), json.loads(content)
+
+async def exercise_server(ml_models):
+    # A wide latency window so concurrent requests land in one batch
+    server = InferenceServer(ml_models, port=0, max_batch_size=16, max_latency_ms=300, workers=1)
+    await server.start()
+    try:
+        status, health = await request(server.port, 'GET', '/health')
+        assert status == 200 and health['status'] == 'ok'
+        assert set(health['queue_depth']) == {'crop', 'fertilizer', 'yield'}
+        print("✅ Health endpoint reports queue depth per task")
+
+        bad_row = dict(YIELD_ROW, state='Atlantis')
+        rows = [YIELD_ROW, dict(YIELD_ROW, area=80.0), bad_row, dict(YIELD_ROW, season='Kharif')]
+        responses = await asyncio.gather(*(request(server.port, 'POST', '/predict/yield', row) for row in rows))
+        statuses = [status for status, _ in responses]
+        assert statuses == [200, 200, 400, 200], statuses
+        assert 'Atlantis' in responses[2][1]['error']
+        assert all(isinstance(result['prediction'], float) for status, result in responses if status == 200)
+        assert server.batchers['yield'].batches == 1 and server.batchers['yield'].rows == 4
+        print("✅ A rejected row in a shared batch fails only its own request")
+
+        status, result = await request(server.port, 'POST', '/predict/crop',
+                                       {'N': 90, 'P': 42, 'K': 43, 'temperature': 20.8, 'humidity': 82,
+                                        'ph': 6.5, 'rainfall': 202.9})
+        assert status == 200 and len(result['top_k']) >= 1
+        print(f"✅ Crop prediction: {result['prediction']} ({result['confidence']:.2f})")
+
+        assert (await request(server.port, 'POST', '/predict/yield', {'state': 'Punjab'}))[0] == 400
+        assert (await request(server.port, 'POST', '/predict/yield', raw_body=b'{not json'))[0] == 400
+        assert (await request(server.port, 'POST', '/predict/yield', dict(YIELD_ROW, area='lots')))[0] == 400
+        assert (await request(server.port, 'GET', '/predict/yield'))[0] == 405
+        assert (await request(server.port, 'GET', '/predict/unknown'))[0] == 404
+        print("✅ Missing fields, bad JSON and bad numbers give 400; wrong method 405; unknown path 404")
+    finally:
+        await server.stop()
+
+def test_inference_server():
+    """Test an in-process server on an ephemeral port"""
+    print("🌾 Testing Inference Server")
+    print("=" * 50)
+
+    ml_models = CropMLModels()
+    ml_models.train_all_models(DataGenerator().generate_all_data())
+    ml_models.set_unseen_category_policy('error')
+    asyncio.run(exercise_server(ml_models))
+
+    print("🎉 All inference server tests passed!")
+
+if __name__ == "__main__":
+    test_inference_server()
@@ -0,0 +1,58 @@
+#!/usr/bin/env python3
+"""
+Test script to verify saving, lazy loading and rollback of model versions
+"""
+
+import os
+import tempfile
+from data_generator import DataGenerator
+from ml_models import CropMLModels
+from model_registry import ModelRegistry
+
+def test_model_registry_round_trip():
+    """Test that saved models load lazily and can be rolled back"""
+    print("🌾 Testing Model Registry")
+    print("=" * 50)
+
+    data = DataGenerator().generate_all_data()
+    sample = data['crop_recommendation'].drop('label', axis=1).iloc[0].tolist()
+    fert_sample = data['fertilizer'].drop('fertilizer', axis=1).iloc[0].tolist()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        # Opening a registry creates nothing until the first save
+        root_dir = os.path.join(tmp, 'registry')
+        registry = ModelRegistry(root_dir)
+        assert registry.list_versions() == [] and registry.get_current_version() is None
+        assert registry.find_version(data) is None and registry.load_tuned_params() == {}
+        assert not os.path.exists(root_dir)
+
+        trained = CropMLModels()
+        trained.train_all_models(data)
+        first = trained.save_to_registry(registry)
+        assert os.path.isdir(root_dir)
+        second = trained.save_to_registry(registry, notes='second save')
+        print(f"✅ Saved versions: {registry.list_versions()}")
+        assert registry.get_current_version() == second
+
+        # Models load lazily on first prediction
+        loaded = CropMLModels()
+        loaded.attach_registry(registry)
+        assert loaded.models == {}
+        assert registry.find_version(data) == second
+
+        result = loaded.predict_crop(sample)
+        assert result == trained.predict_crop(sample)
+        assert list(loaded.models) == ['crop']
+
+        encoded = loaded.encode_categorical_inputs(fert_sample, 'fertilizer')
+        assert loaded.predict_fertilizer(encoded) == trained.predict_fertilizer(encoded)
+        print(f"✅ Lazy load served prediction: {result['prediction']}")
+
+        # Rollback to the previous version
+        assert loaded.rollback() == first
+        assert registry.get_current_version() == first
+        assert registry.find_version(data) == first
+        print(f"✅ Rolled back to {first}")
+
+if __name__ == "__main__":
+    test_model_registry_round_trip()
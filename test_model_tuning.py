@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Test script to verify hyperparameter tuning and that each task trains with its own tuned parameters
+"""
+
+import tempfile
+from data_generator import DataGenerator
+from ml_models import CropMLModels, ForestTuner
+from model_registry import ModelRegistry
+from cli import main as cli_main
+
+def test_model_tuning():
+    """Test ForestTuner, tune_models and load_tuned_params feeding _fit_forest per task"""
+    print("🌾 Testing Hyperparameter Tuning")
+    print("=" * 50)
+
+    data = DataGenerator().generate_all_data()
+
+    with tempfile.TemporaryDirectory() as root_dir:
+        registry = ModelRegistry(root_dir)
+
+        # Distinct parameters per task, so a task reading another task's entry is caught
+        for task, n_estimators in (('crop', 7), ('fertilizer', 9), ('yield', 11)):
+            registry.save_tuned_params(task, {'n_estimators': n_estimators, 'max_depth': n_estimators}, 0.9)
+        ml_models = CropMLModels()
+        assert set(ml_models.load_tuned_params(registry)) == {'crop', 'fertilizer', 'yield'}
+        ml_models.train_all_models(data)
+        for task, n_estimators in (('crop', 7), ('fertilizer', 9), ('yield', 11)):
+            model = ml_models.models[task]
+            assert (model.n_estimators, model.max_depth) == (n_estimators, n_estimators), task
+        print("✅ Each model trained with its own tuned parameters")
+
+        X, y = ml_models.prepare_training_data('fertilizer', data['fertilizer'])
+        result = ForestTuner('fertilizer', time_budget=5).search(X, y)
+        assert result['evaluated'] >= 1 and result['best_params'] in [entry['params'] for entry in result['history']]
+        assert result['best_score'] >= result['top_score'] - 0.01
+        print(f"✅ Successive halving evaluated {result['evaluated']} candidates in {result['rounds']} rounds")
+
+        # An explicit zero budget is respected rather than replaced by the default
+        assert ForestTuner('fertilizer', time_budget=0).time_budget == 0
+        for run in (lambda: ForestTuner('fertilizer', time_budget=0.0).search(X, y),
+                    lambda: CropMLModels().tune_models(data, tasks=['fertilizer'], time_budget=0)):
+            try:
+                run()
+                assert False, "a zero budget should evaluate nothing"
+            except ValueError as e:
+                assert 'Time budget too small' in str(e)
+        print("✅ Zero time budget evaluates no candidates")
+
+        results = ml_models.tune_models(data, registry=registry, time_budget=6)
+        stored = registry.load_tuned_params()
+        for task, result in results.items():
+            assert stored[task]['params'] == result['best_params']
+
+        retrained = CropMLModels()
+        retrained.load_tuned_params(registry)
+        retrained.train_all_models(data)
+        for task, result in results.items():
+            params = retrained.models[task].get_params()
+            assert all(params[name] == value for name, value in result['best_params'].items()), task
+        print("✅ tune_models results saved to the registry and used by the next training run")
+
+        assert cli_main(['tune', '--task', 'crop', '--budget', '2', '--registry', root_dir]) == 0
+        print("✅ cli.py tune command runs")
+
+    print("🎉 All tuning tests passed!")
+
+if __name__ == "__main__":
+    test_model_tuning()
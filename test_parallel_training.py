@@ -0,0 +1,67 @@
+#!/usr/bin/env python3
+"""
+Test script to verify parallel training matches sequential training and shares the cores
+"""
+
+import os
+import numpy as np
+from config import MODEL_DATASETS
+from data_generator import DataGenerator
+from ml_models import CropMLModels, TRAINERS
+
+def test_parallel_training():
+    """Test that process-pool training builds the same forests and never oversubscribes the cores"""
+    print("🌾 Testing Parallel Training")
+    print("=" * 50)
+
+    data = DataGenerator().generate_all_data()
+    sequential = CropMLModels()
+    sequential_results = sequential.train_all_models(data, parallel=False)
+    parallel = CropMLModels()
+    parallel_results = parallel.train_all_models_parallel(data)
+
+    for model_type in TRAINERS:
+        expected = sequential.models[model_type]
+        model = parallel.models[model_type]
+        assert model.get_params() == expected.get_params(), model_type
+        assert [tree.tree_.node_count for tree in model.estimators_] == \
+            [tree.tree_.node_count for tree in expected.estimators_], model_type
+        X, _ = sequential.prepare_training_data(model_type, data[MODEL_DATASETS[model_type]])
+        assert np.array_equal(model.predict(X), expected.predict(X)), model_type
+        assert parallel.fingerprints[model_type] == sequential.fingerprints[model_type]
+    assert parallel_results['crop']['test_accuracy'] == sequential_results['crop']['test_accuracy']
+    assert parallel_results['yield']['test_score'] == sequential_results['yield']['test_score']
+    print("✅ Parallel training builds the same forests as sequential training")
+
+    # Tuned forest parameters reach the worker processes
+    tuned = {'crop': {'n_estimators': 7, 'max_depth': 3},
+             'fertilizer': {'n_estimators': 9, 'max_depth': 4},
+             'yield': {'n_estimators': 11, 'max_depth': 5}}
+    tuned_models = CropMLModels()
+    tuned_models.tuned_params = tuned
+    tuned_models.train_all_models_parallel(data)
+    for model_type, params in tuned.items():
+        model_params = tuned_models.models[model_type].get_params()
+        assert {name: model_params[name] for name in params} == params, model_type
+    print("✅ Parallel training uses each task's tuned parameters")
+
+    # By default the cores are split across the models trained at once
+    ml_models = CropMLModels()
+    assert ml_models.model_config['n_jobs'] is None
+    assert ml_models.get_tree_jobs() == (os.cpu_count() or 1)
+    for cpu_count in (1, 2, 3, 4, 8, 16):
+        for workers in range(1, len(TRAINERS) + 1):
+            tree_jobs = ml_models.get_tree_jobs(workers, cpu_count)
+            assert tree_jobs >= 1
+            assert workers * tree_jobs <= max(cpu_count, workers), (cpu_count, workers, tree_jobs)
+    assert ml_models.get_tree_jobs(3, 8) == 2
+    assert ml_models.get_tree_jobs(3, 2) == 1
+
+    # An explicit n_jobs is still capped by each worker's share
+    ml_models.model_config = dict(ml_models.model_config, n_jobs=4)
+    assert ml_models.get_tree_jobs(1, 16) == 4
+    assert ml_models.get_tree_jobs(3, 6) == 2
+    print("✅ Forest threads split the cores across workers")
+
+if __name__ == "__main__":
+    test_parallel_training()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Test script to verify prediction caching and invalidation on retrain
+"""
+
+from data_generator import DataGenerator
+from ml_models import CropMLModels
+from prediction_engine import PredictionEngine
+from prediction_cache import PredictionCache
+
+def test_prediction_cache():
+    """Test cache hits, quantization, LRU bounds and generation invalidation"""
+    print("🌾 Testing Prediction Cache")
+    print("=" * 50)
+
+    data = DataGenerator().generate_all_data()
+    ml_models = CropMLModels()
+    ml_models.train_crop_model(data['crop_recommendation'])
+    engine = PredictionEngine(ml_models, PredictionCache(max_entries=2, quantize_decimals=0))
+
+    inputs = [90.0, 42.0, 43.0, 20.8, 82.0, 6.5, 202.9]
+    first = engine.predict_crop(inputs)
+    second = engine.predict_crop(inputs)
+    assert first == second
+    stats = engine.get_cache_stats()
+    assert (stats['hits'], stats['misses']) == (1, 1)
+    print(f"✅ Repeat request served from cache: {stats}")
+
+    # Quantized key hits, but the text still shows the request's own values
+    nearby = engine.predict_crop([90.2, 42.0, 43.0, 20.8, 82.0, 6.5, 202.9])
+    assert engine.get_cache_stats()['hits'] == 2
+    assert nearby['prediction'] == first['prediction']
+    print("✅ Quantized inputs share a cache entry")
+
+    # LRU bound
+    engine.predict_crop([10.0, 42.0, 43.0, 30.0, 82.0, 5.0, 50.0])
+    engine.predict_crop([120.0, 42.0, 43.0, 25.0, 82.0, 7.0, 80.0])
+    stats = engine.get_cache_stats()
+    assert stats['entries'] == 2 and stats['evictions'] == 1
+    print("✅ Least recently used entry evicted")
+
+    # Retraining bumps the generation and invalidates the cache
+    ml_models.train_crop_model(data['crop_recommendation'])
+    engine.predict_crop(inputs)
+    stats = engine.get_cache_stats()
+    assert stats['invalidations'] == 1 and stats['entries'] == 1
+    print(f"✅ Cache invalidated after retrain (generation {stats['generation']})")
+
+    # Padded categories are cleaned once, so the key and the encoder agree
+    ml_models.train_fertilizer_model(data['fertilizer'])
+    ml_models.set_unseen_category_policy('error')
+    numeric = {'temperature': 26.0, 'humidity': 52.0, 'moisture': 38.0,
+               'nitrogen': 37.0, 'phosphorous': 0.0, 'potassium': 0.0}
+    clean = engine.predict_fertilizer({'soil_type': 'Sandy', 'crop_type': 'Maize'}, numeric)
+    padded = engine.predict_fertilizer({'soil_type': ' Sandy ', 'crop_type': 'Maize '}, numeric)
+    assert clean['success'] and padded['success'], padded
+    assert padded == clean
+    engine.cache.clear()
+    padded_first = engine.predict_fertilizer({'soil_type': ' Sandy ', 'crop_type': 'Maize '}, numeric)
+    assert padded_first['success'] and padded_first['prediction'] == clean['prediction']
+    print("✅ Whitespace-padded categories hit the cache and encode like clean ones")
+
+if __name__ == "__main__":
+    test_prediction_cache()
@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the SQLite dataset store, its indexed queries and the prediction log
+"""
+
+import os
+import tempfile
+import pandas as pd
+from data_generator import DataGenerator
+from data_manager import DataManager
+from ml_models import CropMLModels
+from prediction_engine import PredictionEngine
+from cli import main as cli_main
+
+def test_sqlite_store():
+    """Test bulk loading, index use, filtered queries and prediction history"""
+    print("🌾 Testing SQLite Store")
+    print("=" * 50)
+
+    data = DataGenerator().generate_all_data()
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = DataManager()
+        manager.set_data(data)
+        expected = manager.query_data('yield', state='Punjab', season='Kharif', crop='Rice')
+
+        store = manager.enable_sql_store(os.path.join(tmp, 'agri.db'))
+        assert store.list_datasets() == sorted(data)
+        result = manager.query_data('yield', state='Punjab', season='Kharif', crop='Rice')
+        assert result.equals(expected)
+        assert 'USING INDEX' in store.explain('yield', state='Punjab', season='Kharif', crop='Rice')[0]
+        assert 'USING INDEX' in store.explain('crop_recommendation', label='rice')[0]
+        print(f"✅ Filtered query answered from an index ({len(result)} rows)")
+
+        means = store.aggregate('yield', 'yield', 'state')
+        assert abs(means['Punjab'] - data['yield'].loc[data['yield']['state'] == 'Punjab', 'yield'].mean()) < 1e-3
+        print("✅ Aggregates computed in SQLite")
+
+        assert manager.sync_sql_store() == {'written': [], 'skipped': []}
+        manager.append_data('yield', data['yield'].head(10))
+        assert len(store.query('yield', columns=['state'])) == 1010
+        print("✅ Only changed datasets are rewritten")
+
+        ml_models = CropMLModels()
+        ml_models.train_crop_model(data['crop_recommendation'])
+        engine = PredictionEngine(ml_models, prediction_log=store)
+        inputs = [90.0, 42.0, 43.0, 20.8, 82.0, 6.5, 202.9]
+        prediction = engine.predict_crop(inputs)['prediction']
+        engine.predict_crop(inputs)
+        history = store.prediction_history('crop')
+        assert len(history) == 2 and history['prediction'].tolist() == [prediction, prediction]
+        print("✅ Predictions logged, including cache hits")
+
+        for i in range(23):
+            store.log_prediction('yield' if i % 3 else 'crop', [i], i * 0.5, model_generation=None if i < 5 else 1)
+        pages = list(store.iter_predictions(chunk_rows=7))
+        ids = [id_ for page in pages for id_ in page['id']]
+        assert [len(page) for page in pages] == [7, 7, 7, 4] and ids == list(range(1, 26))
+        assert sum(len(page) for page in store.iter_predictions('crop', chunk_rows=3)) == store.count_predictions('crop')
+        assert [len(page) for page in store.iter_predictions(chunk_rows=7, after_id=20)] == [5]
+        assert store.count_predictions(after_id=20) == 5
+        print("✅ Paging by id yields every logged prediction once")
+
+        output = os.path.join(tmp, 'prediction_log.csv.gz')
+        db_path = os.path.join(tmp, 'agri.db')
+        assert cli_main(['export-predictions', '--db', db_path, '--output', output, '--chunk-rows', '10']) == 0
+        store.log_prediction('crop', [1], 'rice')
+        assert cli_main(['export-predictions', '--db', db_path, '--output', output, '--append']) == 0
+        exported = pd.read_csv(output)
+        assert exported['id'].tolist() == list(range(1, 27))
+        print("✅ cli.py export-predictions writes the log, then appends only the new predictions")
+        store.close()
+
+    print("🎉 All SQLite store tests passed!")
+
+if __name__ == "__main__":
+    test_sqlite_store()
@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Test script to verify the background task executor used by the GUI
+"""
+
+import os
+import time
+import tempfile
+from task_executor import TaskExecutor, watch_job
+from csv_ingest import CsvIngestJob
+from data_generator import DataGenerator
+
+class FakeRoot:
+    """Stands in for Tk: collects root.after callbacks so the test can run them"""
+
+    def __init__(self):
+        self.callbacks = []
+
+    def after(self, ms, callback):
+        self.callbacks.append(callback)
+
+    def run_until_idle(self, timeout=30):
+        deadline = time.time() + timeout
+        while self.callbacks and time.time() < deadline:
+            callback = self.callbacks.pop(0)
+            time.sleep(0.01)
+            callback()
+
+class FakeButton:
+    def __init__(self):
+        self.states = []
+
+    def config(self, state):
+        self.states.append(state)
+
+def slow_steps(context, steps):
+    for step in range(steps):
+        time.sleep(0.01)
+        context.report(f"step {step + 1}", (step + 1) / steps)
+        context.check_cancelled()
+    return steps
+
+def test_task_executor():
+    """Test progress delivery, results, errors, cancellation and disabled widgets"""
+    print("🌾 Testing Background Task Executor")
+    print("=" * 50)
+
+    root = FakeRoot()
+    executor = TaskExecutor(root, poll_ms=10)
+    button = FakeButton()
+    progress, results = [], []
+
+    task = executor.submit('train', slow_steps, 5, on_done=results.append,
+                           on_progress=lambda message, fraction: progress.append(fraction), widgets=[button])
+    assert executor.submit('train', slow_steps, 5) is None
+    assert button.states == ['disabled']
+    root.run_until_idle()
+    assert task.state == 'done' and results == [5]
+    assert progress == [0.2, 0.4, 0.6, 0.8, 1.0]
+    assert button.states == ['disabled', 'normal']
+    print("✅ Progress and result delivered through root.after, widgets re-enabled")
+
+    cancelled = []
+    task = executor.submit('train', slow_steps, 1000, on_done=results.append, on_cancel=lambda: cancelled.append(True))
+    executor.cancel('train')
+    root.run_until_idle()
+    assert task.state == 'cancelled' and cancelled == [True] and results == [5]
+    print("✅ Cancelled task stopped at its next checkpoint")
+
+    errors = []
+    executor.submit('broken', lambda context: 1 / 0, on_error=errors.append)
+    root.run_until_idle()
+    assert isinstance(errors[0], ZeroDivisionError)
+    print("✅ Errors delivered to the error callback")
+
+    executor.submit('process', sum, [1, 2, 3], use_process=True, on_done=results.append)
+    root.run_until_idle()
+    assert results == [5, 6]
+    print("✅ Process task result delivered")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'crops.csv')
+        crops = DataGenerator().generate_crop_data()
+        crops.to_csv(path, index=False)
+        finished, fractions = [], []
+        executor.submit('ingest', watch_job(CsvIngestJob(path, 'crop_recommendation', chunksize=200), poll_ms=5),
+                        on_done=finished.append, on_progress=lambda message, fraction: fractions.append(fraction),
+                        widgets=[button])
+        assert button.states[-1] == 'disabled'
+        root.run_until_idle()
+        job = finished[0]
+        assert job.error is None and len(job.result) == len(crops) and button.states[-1] == 'normal'
+        assert all(0.0 <= fraction <= 1.0 for fraction in fractions)
+
+        slow = CsvIngestJob(path, 'crop_recommendation', chunksize=10)
+        executor.submit('ingest', watch_job(slow, poll_ms=1), on_done=finished.append)
+        executor.cancel('ingest')
+        root.run_until_idle()
+        assert finished[-1] is slow and slow.cancelled and slow.result is None
+    print("✅ Ingest job run as a task, with widgets disabled for the whole load and cancel relayed")
+
+    late = FakeButton()
+    executor.hold([late])
+    assert late.states == []
+    executor.submit('train', slow_steps, 30)
+    executor.submit('export', slow_steps, 3)
+    executor.hold([late])
+    # Poll until the newer, shorter task is done while the older one still runs
+    while executor.is_running('export'):
+        root.callbacks.pop(0)()
+        time.sleep(0.01)
+    assert executor.is_running('train') and late.states == ['disabled']
+    root.run_until_idle()
+    assert late.states == ['disabled', 'normal']
+    print("✅ Widgets created mid-task held until every task finishes")
+
+    print("🎉 All task executor tests passed!")
+
+if __name__ == "__main__":
+    test_task_executor()
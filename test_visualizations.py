@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Test script to verify charts are redrawn only when their datasets change
+"""
+
+from visualizations import CropVisualizations
+
+class StandInFigure:
+    """Records calls the renderer makes on a matplotlib Figure"""
+
+    def __init__(self):
+        self.clears = 0
+
+    def clear(self):
+        self.clears += 1
+
+    def tight_layout(self):
+        pass
+
+class StandInWidget:
+    def pack(self, **kwargs):
+        self.packed = True
+
+    def pack_forget(self):
+        self.packed = False
+
+class StandInCanvas:
+    """Takes the place of FigureCanvasTkAgg, so no display or matplotlib is needed"""
+
+    def __init__(self):
+        self.figure = StandInFigure()
+        self.widget = StandInWidget()
+        self.draws = 0
+
+    def draw(self):
+        self.draws += 1
+
+    def get_tk_widget(self):
+        return self.widget
+
+def test_visualizations():
+    """Test version-keyed redraws, chart switching and retry after a failed draw"""
+    print("🌾 Testing Chart Rendering")
+    print("=" * 50)
+
+    viz = CropVisualizations(chart_frame=None)
+    viz.canvases = {'crop_distribution': StandInCanvas(), 'yield_trends': StandInCanvas()}
+    drawn = []
+
+    def draw(fig):
+        drawn.append(fig)
+
+    versions = {'crop_recommendation': 1, 'fertilizer': 1, 'yield': 1}
+    assert viz.render('crop_distribution', draw, (12, 5), versions)
+    assert viz.rendered['crop_distribution'] == (1, 1)
+    assert not viz.render('crop_distribution', draw, (12, 5), dict(versions))
+    assert len(drawn) == 1 and viz.canvases['crop_distribution'].draws == 1
+    print("✅ Unchanged dataset versions skip the draw")
+
+    # A dataset the chart does not read leaves it alone; one it reads redraws it
+    assert not viz.render('crop_distribution', draw, (12, 5), {**versions, 'yield': 2})
+    assert viz.render('crop_distribution', draw, (12, 5), {**versions, 'fertilizer': 2})
+    assert len(drawn) == 2 and viz.canvases['crop_distribution'].figure.clears == 2
+    assert viz.render('crop_distribution', draw, (12, 5))
+    print("✅ Version bump (or no versions) redraws")
+
+    # Switching charts hides the previous canvas
+    assert viz.render('yield_trends', draw, (10, 6), versions)
+    assert viz.current == 'yield_trends'
+    assert not viz.canvases['crop_distribution'].widget.packed
+    assert viz.canvases['yield_trends'].widget.packed
+    print("✅ Switching charts swaps the canvas shown")
+
+    def failing_draw(fig):
+        raise ValueError("bad data")
+
+    bumped = {**versions, 'yield': 2}
+    try:
+        viz.render('yield_trends', failing_draw, (10, 6), bumped)
+        assert False, "draw error should propagate"
+    except ValueError:
+        pass
+    assert 'yield_trends' not in viz.rendered
+    assert viz.render('yield_trends', draw, (10, 6), bumped)
+    assert viz.rendered['yield_trends'] == (2,)
+    print("✅ Failed draw stores no key and is retried")
+
+if __name__ == "__main__":
+    test_visualizations()
@@ -191,9 +191,9 @@ class UIComponents:
         except:
             pass  # Some widgets might not support state changes
     
-    def create_progress_bar(self, parent):
+    def create_progress_bar(self, parent, mode='indeterminate', maximum=100):
         """Create progress bar widget"""
-        progress = ttk.Progressbar(parent, mode='indeterminate')
+        progress = ttk.Progressbar(parent, mode=mode, maximum=maximum)
         return progress
     
     def create_separator(self, parent, orient='horizontal'):
@@ -1,44 +1,87 @@
 # visualizations.py - Data Visualization Components
 
-import matplotlib.pyplot as plt
-from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
-import seaborn as sns
 import numpy as np
-import pandas as pd
+
+# Datasets each chart is drawn from; their versions decide when a cached figure is stale
+CHART_DATASETS = {
+    'crop_distribution': ('crop_recommendation', 'fertilizer'),
+    'parameter_analysis': ('crop_recommendation',),
+    'yield_trends': ('yield',)
+}
+
+def _colormap(name):
+    """A matplotlib colormap (matplotlib is imported on the first chart, not at application startup)"""
+    from matplotlib import colormaps
+    return colormaps[name]
 
 class CropVisualizations:
+    """One persistent figure and Tk canvas per chart, redrawn only when its data changes"""
+    
     def __init__(self, chart_frame):
         self.chart_frame = chart_frame
+        self.canvases = {}  # chart name -> FigureCanvasTkAgg, created on the chart's first use
+        self.rendered = {}  # chart name -> dataset versions its figure was last drawn from
+        self.current = None
         
     def clear_chart(self):
-        """Clear previous charts"""
-        for widget in self.chart_frame.winfo_children():
-            widget.destroy()
+        """Hide the chart on display (its figure is kept for reuse)"""
+        if self.current is not None:
+            self.canvases[self.current].get_tk_widget().pack_forget()
+            self.current = None
     
-    def embed_chart(self, fig):
-        """Embed matplotlib figure in tkinter"""
-        canvas = FigureCanvasTkAgg(fig, self.chart_frame)
-        canvas.draw()
-        canvas.get_tk_widget().pack(fill='both', expand=True)
+    def get_canvas(self, chart, figsize):
+        """The chart's canvas, created once with a Figure kept out of pyplot's global registry"""
+        canvas = self.canvases.get(chart)
+        if canvas is None:
+            from matplotlib.figure import Figure
+            from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
+            canvas = FigureCanvasTkAgg(Figure(figsize=figsize, facecolor='white'), self.chart_frame)
+            self.canvases[chart] = canvas
+        return canvas
     
-    def show_crop_distribution(self, data):
+    def render(self, chart, draw, figsize, versions=None):
+        """Show a chart, calling draw(fig) only if its datasets changed since the last draw
+        
+        versions maps dataset names to their DataManager version; without it the chart is
+        always redrawn. Returns True if the figure was redrawn.
+        """
+        canvas = self.get_canvas(chart, figsize)
+        key = None if versions is None else tuple(versions.get(name) for name in CHART_DATASETS[chart])
+        redrawn = key is None or self.rendered.get(chart) != key
+        if redrawn:
+            # Forget the old key first, so a failed draw is retried next time
+            self.rendered.pop(chart, None)
+            canvas.figure.clear()
+            draw(canvas.figure)
+            canvas.figure.tight_layout()
+            canvas.draw()
+            self.rendered[chart] = key
+        
+        if self.current != chart:
+            self.clear_chart()
+            canvas.get_tk_widget().pack(fill='both', expand=True)
+            self.current = chart
+        return redrawn
+    
+    def show_crop_distribution(self, data, versions=None):
         """Show crop distribution chart"""
-        self.clear_chart()
-        
-        # Create figure
-        fig, (ax1, ax2) = plt.subplots(1, 2, figsize=(12, 5))
-        fig.patch.set_facecolor('white')
+        return self.render('crop_distribution', lambda fig: self.draw_crop_distribution(fig, data),
+                           (12, 5), versions)
+    
+    def draw_crop_distribution(self, fig, data):
+        """Draw the crop and fertilizer distributions onto fig"""
+        ax1, ax2 = fig.subplots(1, 2)
         
         # Crop distribution pie chart
-        crop_counts = data['crop_recommendation']['label'].value_counts()
-        colors = plt.cm.Set3(np.linspace(0, 1, len(crop_counts)))
+        crop_counts = data['crop_recommendation']['label'].value_counts().loc[lambda counts: counts > 0]
+        colors = _colormap('Set3')(np.linspace(0, 1, len(crop_counts)))
         
         ax1.pie(crop_counts.values, labels=crop_counts.index, autopct='%1.1f%%', 
                colors=colors, startangle=90)
         ax1.set_title('Crop Distribution', fontsize=14, fontweight='bold')
         
         # Fertilizer distribution bar chart
-        fert_counts = data['fertilizer']['fertilizer'].value_counts()
+        fert_counts = data['fertilizer']['fertilizer'].value_counts().loc[lambda counts: counts > 0]
         bars = ax2.bar(fert_counts.index, fert_counts.values, 
                       color=['#FF6B6B', '#4ECDC4', '#45B7D1', '#96CEB4'])
         ax2.set_title('Fertilizer Distribution', fontsize=14, fontweight='bold')
@@ -50,17 +93,15 @@ class CropVisualizations:
             height = bar.get_height()
             ax2.text(bar.get_x() + bar.get_width()/2., height,
                     f'{int(height)}', ha='center', va='bottom')
-        
-        plt.tight_layout()
-        self.embed_chart(fig)
     
-    def show_parameter_analysis(self, data):
+    def show_parameter_analysis(self, data, versions=None):
         """Show parameter correlation analysis"""
-        self.clear_chart()
-        
-        # Create figure
-        fig, ((ax1, ax2), (ax3, ax4)) = plt.subplots(2, 2, figsize=(12, 8))
-        fig.patch.set_facecolor('white')
+        return self.render('parameter_analysis', lambda fig: self.draw_parameter_analysis(fig, data),
+                           (12, 8), versions)
+    
+    def draw_parameter_analysis(self, fig, data):
+        """Draw the soil and weather parameter charts onto fig"""
+        (ax1, ax2), (ax3, ax4) = fig.subplots(2, 2)
         
         crop_data = data['crop_recommendation']
         
@@ -70,7 +111,7 @@ class CropVisualizations:
         ax1.set_xlabel('Temperature (°C)')
         ax1.set_ylabel('Humidity (%)')
         ax1.set_title('Temperature vs Humidity (colored by Rainfall)')
-        plt.colorbar(scatter, ax=ax1, label='Rainfall (mm)')
+        fig.colorbar(scatter, ax=ax1, label='Rainfall (mm)')
         
         # NPK levels comparison
         nutrients = ['N', 'P', 'K']
@@ -94,31 +135,29 @@ class CropVisualizations:
         ax3.legend()
         
         # Rainfall by crop type
-        crop_rainfall = crop_data.groupby('label')['rainfall'].mean().sort_values()
+        crop_rainfall = crop_data.groupby('label', observed=True)['rainfall'].mean().sort_values()
         bars = ax4.barh(crop_rainfall.index, crop_rainfall.values, 
-                       color=plt.cm.Set2(np.linspace(0, 1, len(crop_rainfall))))
+                       color=_colormap('Set2')(np.linspace(0, 1, len(crop_rainfall))))
         ax4.set_xlabel('Average Rainfall (mm)')
         ax4.set_title('Average Rainfall by Crop')
         
         # Add value labels
         for i, (bar, value) in enumerate(zip(bars, crop_rainfall.values)):
             ax4.text(value + 2, i, f'{value:.1f}', va='center')
-        
-        plt.tight_layout()
-        self.embed_chart(fig)
     
-    def show_yield_trends(self, data):
+    def show_yield_trends(self, data, versions=None):
         """Show yield trends analysis"""
-        self.clear_chart()
-        
-        # Create figure
-        fig, ((ax1, ax2, ax3), (ax4, ax5, ax6)) = plt.subplots(2, 3, figsize=(18, 10))
-        fig.patch.set_facecolor('white')
+        return self.render('yield_trends', lambda fig: self.draw_yield_trends(fig, data),
+                           (18, 10), versions)
+    
+    def draw_yield_trends(self, fig, data):
+        """Draw the yield comparisons onto fig"""
+        (ax1, ax2, ax3), (ax4, ax5, ax6) = fig.subplots(2, 3)
         
         yield_data = data['yield']
         
         # Yield by state
-        state_yield = yield_data.groupby('state')['yield'].mean().sort_values(ascending=False)
+        state_yield = yield_data.groupby('state', observed=True)['yield'].mean().sort_values(ascending=False)
         bars = ax1.bar(state_yield.index, state_yield.values, 
                       color='#FF6B6B', alpha=0.7)
         ax1.set_title('Average Yield by State')
@@ -131,14 +170,14 @@ class CropVisualizations:
                     f'{value:.2f}', ha='center', va='bottom')
         
         # Yield by district (top 10)
-        district_yield = yield_data.groupby('district')['yield'].mean().sort_values(ascending=False).head(10)
+        district_yield = yield_data.groupby('district', observed=True)['yield'].mean().sort_values(ascending=False).head(10)
         bars = ax2.barh(district_yield.index, district_yield.values, 
                       color='#4ECDC4', alpha=0.7)
         ax2.set_title('Top 10 Districts by Yield')
         ax2.set_xlabel('Yield (tons/hectare)')
         
         # Yield by crop
-        crop_yield = yield_data.groupby('crop')['yield'].mean().sort_values(ascending=False)
+        crop_yield = yield_data.groupby('crop', observed=True)['yield'].mean().sort_values(ascending=False)
         bars = ax3.bar(crop_yield.index, crop_yield.values, 
                       color='#4ECDC4', alpha=0.7)
         ax3.set_title('Average Yield by Crop')
@@ -151,7 +190,7 @@ class CropVisualizations:
                     f'{value:.2f}', ha='center', va='bottom')
         
         # Yield by season
-        season_yield = yield_data.groupby('season')['yield'].mean()
+        season_yield = yield_data.groupby('season', observed=True)['yield'].mean()
         colors = ['#45B7D1', '#96CEB4', '#FFEAA7']
         ax4.pie(season_yield.values, labels=season_yield.index, autopct='%1.1f%%',
                colors=colors, startangle=90)
@@ -163,38 +202,34 @@ class CropVisualizations:
         ax5.set_xlabel('Area (hectares)')
         ax5.set_ylabel('Production (tons)')
         ax5.set_title('Production vs Area (colored by Yield)')
-        plt.colorbar(scatter, ax=ax5, label='Yield (tons/hectare)')
+        fig.colorbar(scatter, ax=ax5, label='Yield (tons/hectare)')
         
         # Hide the 6th subplot
         ax6.set_visible(False)
-        
-        plt.tight_layout()
-        self.embed_chart(fig)
     
     def show_feature_importance(self, model, feature_names, model_name):
-        """Show feature importance for a given model"""
-        self.clear_chart()
-        
+        """Show feature importance for a given model (always redrawn: it follows the model, not the data)"""
         if hasattr(model, 'feature_importances_'):
-            fig, ax = plt.subplots(1, 1, figsize=(10, 6))
-            fig.patch.set_facecolor('white')
-            
-            importances = model.feature_importances_
-            indices = np.argsort(importances)[::-1]
-            
-            # Plot feature importances
-            bars = ax.bar(range(len(importances)), importances[indices],
-                         color='#3498db', alpha=0.7)
-            ax.set_title(f'Feature Importance - {model_name}', fontsize=14, fontweight='bold')
-            ax.set_ylabel('Importance')
-            ax.set_xlabel('Features')
-            ax.set_xticks(range(len(importances)))
-            ax.set_xticklabels([feature_names[i] for i in indices], rotation=45)
-            
-            # Add value labels
-            for bar, importance in zip(bars, importances[indices]):
-                ax.text(bar.get_x() + bar.get_width()/2., bar.get_height(),
-                       f'{importance:.3f}', ha='center', va='bottom')
-            
-            plt.tight_layout()
-            self.embed_chart(fig)
\ No newline at end of file
+            self.render('feature_importance',
+                        lambda fig: self.draw_feature_importance(fig, model, feature_names, model_name), (10, 6))
+    
+    def draw_feature_importance(self, fig, model, feature_names, model_name):
+        """Draw a model's feature importances onto fig"""
+        ax = fig.subplots(1, 1)
+        
+        importances = model.feature_importances_
+        indices = np.argsort(importances)[::-1]
+        
+        # Plot feature importances
+        bars = ax.bar(range(len(importances)), importances[indices],
+                     color='#3498db', alpha=0.7)
+        ax.set_title(f'Feature Importance - {model_name}', fontsize=14, fontweight='bold')
+        ax.set_ylabel('Importance')
+        ax.set_xlabel('Features')
+        ax.set_xticks(range(len(importances)))
+        ax.set_xticklabels([feature_names[i] for i in indices], rotation=45)
+        
+        # Add value labels
+        for bar, importance in zip(bars, importances[indices]):
+            ax.text(bar.get_x() + bar.get_width()/2., bar.get_height(),
+                   f'{importance:.3f}', ha='center', va='bottom')